@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+"""
+Benchmark the admin changelists on large tables: the stock ModelAdmin setup
+against the performance mode (keyset pages, estimated counts, indexed date
+drilldowns, input filters).
+
+Synthetic rows are created inside a transaction that is rolled back at the
+end, so the database is left untouched:
+
+    python benchmarks/admin_changelist.py --rows 1000000 --projects 5000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib import admin  # noqa: E402
+from django.contrib.auth.models import User  # noqa: E402
+from django.contrib.messages.storage.cookie import CookieStorage  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from django.db import connection, transaction  # noqa: E402
+from django.test import RequestFactory  # noqa: E402
+from django.test.utils import CaptureQueriesContext  # noqa: E402
+
+from portfolioapp.models import ServiceRequest, ProjectSkill  # noqa: E402
+
+
+class Rollback(Exception):
+    pass
+
+
+class StockServiceRequestAdmin(admin.ModelAdmin):
+    """The original configuration, kept for comparison"""
+    list_display = ['full_name', 'email', 'service_type', 'status', 'submitted_at']
+    list_filter = ['service_type', 'status', 'preferred_timeline', 'submitted_at']
+    search_fields = ['full_name', 'email', 'project_requirements']
+    list_editable = ['status']
+    date_hierarchy = 'submitted_at'
+
+
+class StockProjectSkillAdmin(admin.ModelAdmin):
+    list_display = ['project', 'skill']
+    list_filter = ['project', 'skill']
+    search_fields = ['project__name', 'skill__name']
+
+
+def measure(label, model_admin, user, params, repeat):
+    def render():
+        request = RequestFactory().get('/admin/', params)
+        request.user = user
+        request._messages = CookieStorage(request)
+        response = model_admin.changelist_view(request)
+        response.render()
+        assert response.status_code == 200, response.status_code
+
+    connection.queries_log.clear()
+    with CaptureQueriesContext(connection) as queries:
+        render()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        render()
+    elapsed = (time.perf_counter() - started) / repeat * 1000
+    print(f"{label:<44}{elapsed:>10.1f} ms{len(queries):>9} queries")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--projects', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    try:
+        with transaction.atomic():
+            call_command('seed_portfolio', service_requests=args.rows, projects=args.projects,
+                         skills=300, seed=1, stdout=open(os.devnull, 'w'))
+            user = User.objects.create_superuser('benchmark', 'benchmark@example.com', 'benchmark')
+            stock = StockServiceRequestAdmin(ServiceRequest, admin.site)
+            fast = admin.site._registry[ServiceRequest]
+            middle = ServiceRequest.objects.order_by('-submitted_at', '-pk').values_list('pk', flat=True)[args.rows // 2]
+            year = ServiceRequest.objects.order_by('-submitted_at').first().submitted_at.year
+
+            print(f"{ServiceRequest.objects.count()} service requests, "
+                  f"{ProjectSkill.objects.count()} project skills\n")
+            print(f"{'changelist':<44}{'time':>13}{'queries':>9}")
+            cases = [
+                ('first page', {}, {}),
+                ('middle of the list', {'p': args.rows // 200}, {'after': middle}),
+                ('status=pending', {'status__exact': 'pending'}, {'status__exact': 'pending'}),
+                (f"drilldown {year}", {'submitted_at__year': year}, {'submitted_at__year': year}),
+            ]
+            for name, stock_params, fast_params in cases:
+                measure(f"{name} (stock)", stock, user, stock_params, args.repeat)
+                measure(f"{name} (performance mode)", fast, user, fast_params, args.repeat)
+
+            measure('project skills (stock list_filter)',
+                    StockProjectSkillAdmin(ProjectSkill, admin.site), user, {}, args.repeat)
+            measure('project skills (input filters)', admin.site._registry[ProjectSkill], user, {}, args.repeat)
+            raise Rollback
+    except Rollback:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+"""
+Benchmark /api/skills/by_category/: the old per-skill serializer loop against
+the precomputed index (cold build and cached read).
+
+Synthetic skills and project links are created inside a transaction that is
+rolled back at the end, so the database is left untouched:
+
+    python benchmarks/by_category.py --skills 5000 --projects 2000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.core.cache import cache  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from django.db import connection, transaction  # noqa: E402
+from django.test.utils import CaptureQueriesContext  # noqa: E402
+
+from portfolioapp import indexes  # noqa: E402
+from portfolioapp.models import Skill  # noqa: E402
+from portfolioapp.serializers import SkillSerializer  # noqa: E402
+
+
+class Rollback(Exception):
+    pass
+
+
+def per_skill_loop():
+    """The original implementation, kept for comparison"""
+    categories = {}
+    for skill in Skill.objects.filter(is_active=True):
+        category = skill.get_category_display()
+        if category not in categories:
+            categories[category] = []
+        categories[category].append(SkillSerializer(skill).data)
+    return categories
+
+
+def measure(label, func, repeat):
+    with CaptureQueriesContext(connection) as queries:
+        func()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    elapsed = (time.perf_counter() - started) / repeat * 1000
+    print(f"{label:<32}{elapsed:>10.2f} ms{len(queries):>10} queries")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--skills', type=int, default=5000)
+    parser.add_argument('--projects', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    try:
+        with transaction.atomic():
+            call_command('seed_portfolio', skills=args.skills, projects=args.projects,
+                         seed=1, stdout=open(os.devnull, 'w'))
+            assert per_skill_loop() == indexes.build_skills_by_category()
+
+            print(f"{Skill.objects.count()} skills\n")
+            print(f"{'variant':<32}{'time':>13}{'queries':>10}")
+            measure('per-skill loop (old)', per_skill_loop, args.repeat)
+            measure('index build', indexes.build_skills_by_category, args.repeat)
+            measure('index build + project counts',
+                    lambda: indexes.build_skills_by_category(with_counts=True), args.repeat)
+            cache.delete(indexes.SKILLS_BY_CATEGORY_KEY)
+            indexes.skills_by_category()
+            measure('cached index read', indexes.skills_by_category, args.repeat * 100)
+            raise Rollback
+    except Rollback:
+        pass
+    finally:
+        cache.delete_many(list(indexes.INDEX_DEPENDENCIES))
+
+
+if __name__ == '__main__':
+    main()
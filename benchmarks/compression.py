@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+"""
+Benchmark response compression: CPU time against bytes saved per endpoint.
+
+Each public endpoint is rendered once in-process, then compressed with gzip
+and (when the ``brotli`` package is installed) brotli at several levels.
+Synthetic data is created inside a transaction that is rolled back at the
+end, so the database is left untouched:
+
+    python benchmarks/compression.py --projects 500 --repeat 20
+"""
+import argparse
+import gzip
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.core.management import call_command  # noqa: E402
+from django.db import transaction  # noqa: E402
+
+from portfolioapp.compression import brotli  # noqa: E402
+from portfolioapp.internal import internal_get  # noqa: E402
+from portfolioapp.models import Project  # noqa: E402
+
+
+class Rollback(Exception):
+    pass
+
+
+def variants():
+    yield 'gzip-1', lambda body: gzip.compress(body, compresslevel=1, mtime=0)
+    yield 'gzip-6', lambda body: gzip.compress(body, compresslevel=6, mtime=0)
+    yield 'gzip-9', lambda body: gzip.compress(body, compresslevel=9, mtime=0)
+    if brotli:
+        yield 'br-4', lambda body: brotli.compress(body, quality=4)
+        yield 'br-5', lambda body: brotli.compress(body, quality=5)
+        yield 'br-11', lambda body: brotli.compress(body, quality=11)
+
+
+def endpoints():
+    project = Project.objects.filter(status='published').order_by('pk').first()
+    return [
+        '/api/projects/',
+        f"/api/projects/{project.pk}/",
+        '/api/projects/featured/',
+        '/api/skills/',
+        '/api/skills/by_category/',
+        '/api/testimonials/',
+        '/api/social-links/',
+        '/api/about-me/info/',
+        '/api/bundle/',
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--projects', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    try:
+        with transaction.atomic():
+            call_command('seed_portfolio', projects=args.projects, skills=200, testimonials=args.projects,
+                         social_links=8, about_me=True, seed=1, stdout=open(os.devnull, 'w'))
+            print(f"brotli: {'installed' if brotli else 'not installed (pip install brotli)'}\n")
+            print(f"{'endpoint':<28}{'variant':<9}{'raw':>9}{'sent':>9}{'saved':>8}{'ms':>9}{'us/KB saved':>13}")
+            for path in endpoints():
+                body = internal_get(path).content
+                for name, func in variants():
+                    started = time.perf_counter()
+                    for _ in range(args.repeat):
+                        compressed = func(body)
+                    elapsed = (time.perf_counter() - started) / args.repeat
+                    saved = len(body) - len(compressed)
+                    per_kb = elapsed * 1e6 / (saved / 1024) if saved > 0 else float('inf')
+                    print(f"{path:<28}{name:<9}{len(body):>9}{len(compressed):>9}"
+                          f"{saved / len(body):>8.0%}{elapsed * 1000:>9.3f}{per_kb:>13.1f}")
+            raise Rollback
+    except Rollback:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+"""
+Benchmark the submissions dashboard: daily rollups against GROUP BY over the raw tables.
+
+Each dashboard query (per day by dimension, funnel) is answered both ways and
+checked for equal results; the cost of maintaining the rollups on insert and
+status change is measured too. Synthetic rows are created inside a
+transaction that is rolled back at the end, so the database is left untouched:
+
+    python benchmarks/dashboard.py --rows 1000000 --days 365
+"""
+import argparse
+import datetime
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.core.management import call_command  # noqa: E402
+from django.db import transaction  # noqa: E402
+from django.db.models import Count  # noqa: E402
+from django.db.models.functions import TruncDate  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from portfolioapp import rollups, workflow  # noqa: E402
+from portfolioapp.models import ServiceRequest  # noqa: E402
+
+
+class Rollback(Exception):
+    pass
+
+
+def raw_daily_counts(by, start, end):
+    lower, upper = rollups._day_bounds(start, end)
+    rows = (
+        ServiceRequest.objects.filter(submitted_at__gte=lower, submitted_at__lt=upper)
+        .annotate(day=TruncDate('submitted_at', tzinfo=timezone.get_current_timezone()))
+        .values_list('day', by).annotate(total=Count('pk')).order_by('day', by)
+    )
+    return {(day, value): total for day, value, total in rows}
+
+
+def rollup_daily_counts(by, start, end):
+    data = rollups.daily_counts(ServiceRequest, by, start, end)
+    return {
+        (datetime.date.fromisoformat(day['day']), value): count
+        for day in data['days'] for value, count in day['counts'].items()
+    }
+
+
+def raw_funnel(start, end):
+    lower, upper = rollups._day_bounds(start, end)
+    by_status = dict(
+        ServiceRequest.objects.filter(submitted_at__gte=lower, submitted_at__lt=upper)
+        .values_list('status').annotate(total=Count('pk')).order_by()
+    )
+    return [sum(by_status.get(status, 0) for status in statuses) for _, statuses in rollups.FUNNEL]
+
+
+def rollup_funnel(start, end):
+    return [stage['count'] for stage in rollups.funnel(start, end)['stages']]
+
+
+def timed(func, repeat):
+    result = func()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return result, (time.perf_counter() - started) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--writes', type=int, default=500)
+    args = parser.parse_args()
+
+    try:
+        with transaction.atomic():
+            call_command('seed_portfolio', service_requests=args.rows, days=args.days,
+                         seed=1, stdout=open(os.devnull, 'w'))
+            end = timezone.localdate()
+            print(f"{ServiceRequest.objects.count()} service requests over {args.days} days\n")
+            print(f"{'query':<40}{'raw GROUP BY':>14}{'rollups':>12}")
+            for days in (30, args.days):
+                start = end - datetime.timedelta(days=days - 1)
+                for by in rollups.dimensions(ServiceRequest):
+                    raw, raw_ms = timed(lambda: raw_daily_counts(by, start, end), args.repeat)
+                    rolled, rolled_ms = timed(lambda: rollup_daily_counts(by, start, end), args.repeat)
+                    assert raw == rolled, f"results differ for {by} over {days} days"
+                    print(f"{f'{days} days by {by}':<40}{raw_ms:>11.1f} ms{rolled_ms:>9.1f} ms")
+                raw, raw_ms = timed(lambda: raw_funnel(start, end), args.repeat)
+                rolled, rolled_ms = timed(lambda: rollup_funnel(start, end), args.repeat)
+                assert raw == rolled, f"funnel differs over {days} days"
+                print(f"{f'{days} days funnel':<40}{raw_ms:>11.1f} ms{rolled_ms:>9.1f} ms")
+
+            started = time.perf_counter()
+            created = [
+                ServiceRequest.objects.create(
+                    service_type='web', full_name='Benchmark', email='benchmark@example.com',
+                    project_requirements='Benchmark', agree_to_terms=True,
+                )
+                for _ in range(args.writes)
+            ]
+            per_insert = (time.perf_counter() - started) / args.writes * 1000
+            started = time.perf_counter()
+            workflow.transition(ServiceRequest.objects.filter(pk__in=[row.pk for row in created]), 'reviewed')
+            bulk = (time.perf_counter() - started) * 1000
+            print(f"\ninsert with rollup upkeep: {per_insert:.2f} ms/row; "
+                  f"bulk status change of {args.writes} rows: {bulk:.1f} ms")
+            assert rollups.find_drift(ServiceRequest, end, end) == 0
+            raise Rollback
+    except Rollback:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+"""
+Benchmark image metadata extraction: time per uploaded image and placeholder size.
+
+Synthetic photos (noise over gradients, so they compress like real ones) are
+encoded in memory at each size and described the way an upload is; nothing
+touches storage or the database:
+
+    python benchmarks/image_meta.py --sizes 1200x800 4000x3000 --images 20
+"""
+import argparse
+import io
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from PIL import Image  # noqa: E402
+
+from portfolioapp import imagemeta  # noqa: E402
+
+
+def photo(rng, width, height, fmt):
+    gradient = Image.linear_gradient('L').resize((width, height))
+    noise = Image.effect_noise((width, height), 40)
+    image = Image.merge('RGB', (gradient, noise, gradient.rotate(rng.choice((90, 180)))))
+    buffer = io.BytesIO()
+    image.save(buffer, fmt, **({'quality': 85} if fmt == 'JPEG' else {}))
+    return buffer.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', nargs='+', default=['400x300', '1200x800', '4000x3000'])
+    parser.add_argument('--formats', nargs='+', default=['JPEG', 'PNG'])
+    parser.add_argument('--images', type=int, default=10, help='Images per size and format')
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    # Load Pillow's plugins outside the timings
+    imagemeta.describe(io.BytesIO(photo(rng, 64, 64, 'JPEG')))
+    for size in args.sizes:
+        width, height = (int(value) for value in size.split('x'))
+        for fmt in args.formats:
+            encoded = [photo(rng, width, height, fmt) for _ in range(args.images)]
+            started = time.perf_counter()
+            metas = [imagemeta.describe(io.BytesIO(data)) for data in encoded]
+            elapsed = time.perf_counter() - started
+            placeholder = sum(len(meta['placeholder']) for meta in metas) // len(metas)
+            print(
+                f"{size:>10} {fmt:<5} {sum(map(len, encoded)) // len(encoded) // 1024:>6} KB: "
+                f"{elapsed / len(encoded) * 1000:7.1f} ms per image, placeholder {placeholder} chars"
+            )
+
+
+if __name__ == '__main__':
+    main()
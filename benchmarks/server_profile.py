@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+"""
+Compare startup time and throughput of the development server and gunicorn.
+
+Each server is started in turn, timed until it answers its first request, then
+hammered with concurrent GET requests. Run from the project root against a
+migrated (and ideally seeded) database:
+
+    python benchmarks/server_profile.py --requests 2000 --concurrency 16
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SERVERS = {
+    'runserver': [sys.executable, 'manage.py', 'runserver', '--noreload', '127.0.0.1:{port}'],
+    'gunicorn': [sys.executable, '-m', 'gunicorn', '-c', 'config/gunicorn_conf.py',
+                 '--bind', '127.0.0.1:{port}', '--access-logfile', '/dev/null',
+                 'config.wsgi:application'],
+}
+
+
+def fetch(url):
+    try:
+        with urllib.request.urlopen(url, timeout=30) as response:
+            response.read()
+            return response.status
+    except urllib.error.HTTPError as error:
+        # urlopen raises on 4xx / 5xx; count them as errors, not crashes
+        error.read()
+        return error.code
+
+
+def wait_until_ready(url, timeout=60):
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        try:
+            if fetch(url) == 200:
+                return time.perf_counter() - started
+        except (urllib.error.URLError, ConnectionError):
+            pass
+        time.sleep(0.05)
+    raise RuntimeError(f"Server did not answer {url} within {timeout}s")
+
+
+def run_load(url, requests, concurrency):
+    started = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        statuses = list(pool.map(lambda _: fetch(url), range(requests)))
+    elapsed = time.perf_counter() - started
+    errors = sum(1 for status in statuses if status != 200)
+    return requests / elapsed, errors
+
+
+def profile(name, port, path, requests, concurrency):
+    command = [part.format(port=port) for part in SERVERS[name]]
+    env = dict(os.environ, DEBUG='False', ALLOWED_HOSTS='127.0.0.1,localhost')
+    process = subprocess.Popen(command, cwd=ROOT, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{port}{path}"
+    try:
+        startup = wait_until_ready(url)
+        throughput, errors = run_load(url, requests, concurrency)
+    finally:
+        process.terminate()
+        process.wait()
+    return startup, throughput, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--path', default='/api/projects/')
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--servers', nargs='+', default=list(SERVERS), choices=list(SERVERS))
+    args = parser.parse_args()
+
+    print(f"{'server':<12}{'startup (s)':>14}{'req/s':>12}{'errors':>9}")
+    for name in args.servers:
+        startup, throughput, errors = profile(
+            name, args.port, args.path, args.requests, args.concurrency
+        )
+        print(f"{name:<12}{startup:>14.2f}{throughput:>12.1f}{errors:>9}")
+
+
+if __name__ == '__main__':
+    main()
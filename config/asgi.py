@@ -2,6 +2,11 @@
 ASGI config for config project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Under it the live submissions feed (``GET /api/live/``) waits on the event
+loop instead of holding a worker thread per stream:
+
+    GUNICORN_WORKER_CLASS=uvicorn.workers.UvicornWorker \
+        gunicorn -c config/gunicorn_conf.py config.asgi:application
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
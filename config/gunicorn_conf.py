@@ -0,0 +1,70 @@
+"""
+Gunicorn configuration for production.
+
+Usage:
+    gunicorn -c config/gunicorn_conf.py config.wsgi:application
+
+Every value can be overridden from the environment so the same file works on
+small and large hosts without edits.
+"""
+
+import multiprocessing
+import os
+
+
+def _env_int(name, default):
+    return int(os.environ.get(name, default))
+
+
+CPU_COUNT = multiprocessing.cpu_count()
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+
+# The app is mostly I/O bound (database, SMTP), so threads are cheap
+# concurrency. Small hosts get fewer processes with more threads each; larger
+# hosts follow the usual (2 x cores) + 1 rule.
+workers = _env_int('WEB_CONCURRENCY', 2 if CPU_COUNT == 1 else CPU_COUNT * 2 + 1)
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+threads = _env_int('GUNICORN_THREADS', 4 if CPU_COUNT == 1 else 2)
+
+# Import Django once in the master and fork workers from it: faster boots and
+# copy-on-write sharing of the imported code.
+preload_app = True
+
+# Recycle workers periodically to cap memory growth; jitter avoids restarting
+# every worker at the same moment.
+max_requests = _env_int('GUNICORN_MAX_REQUESTS', 1000)
+max_requests_jitter = _env_int('GUNICORN_MAX_REQUESTS_JITTER', 100)
+
+timeout = _env_int('GUNICORN_TIMEOUT', 30)
+graceful_timeout = _env_int('GUNICORN_GRACEFUL_TIMEOUT', 30)
+# Behind the platform proxy a short keepalive frees worker threads quickly
+keepalive = _env_int('GUNICORN_KEEPALIVE', 5)
+
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-')
+errorlog = '-'
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
+
+
+def on_starting(server):
+    # Cache invalidations are versions stored in the cache; a per-process
+    # LocMemCache would leave every other worker serving stale data.
+    from django.conf import settings
+    if settings.LOCAL_CACHE and server.cfg.workers > 1:
+        raise RuntimeError(
+            f"CACHE_BACKEND {settings.CACHES['default']['BACKEND']} is private to each of the "
+            f"{server.cfg.workers} workers; use a shared backend or WEB_CONCURRENCY=1."
+        )
+
+
+def post_fork(server, worker):
+    # With preload_app the master may have opened database connections while
+    # importing the app; never share them with the forked workers.
+    from django.db import connections
+    connections.close_all()
+
+
+def post_worker_init(worker):
+    # Warm the caches in the background; /readyz stays 503 until it is done
+    from portfolioapp import warmup
+    warmup.start_background()
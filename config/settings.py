@@ -48,6 +48,9 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'portfolioapp.middleware.CompressionMiddleware',
+    'portfolioapp.middleware.ResponseCacheMiddleware',
+    'portfolioapp.middleware.HotCacheMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -150,6 +153,148 @@ STATICFILES_DIRS = [
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Cache
+# Cached data is invalidated by bumping versions stored in the cache, so every
+# gunicorn worker and management command must share one backend. The default
+# file cache is shared by all processes on the host; use Redis
+# (django.core.cache.backends.redis.RedisCache) across hosts.
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.filebased.FileBasedCache'),
+        'LOCATION': config('CACHE_LOCATION', default=str(BASE_DIR / 'cache')),
+    }
+}
+if 'redis' not in CACHES['default']['BACKEND']:
+    # Local-memory, file and database caches cull a third of their keys past
+    # 300 entries by default, which a cache warm-up alone exceeds
+    CACHES['default']['OPTIONS'] = {'MAX_ENTRIES': config('CACHE_MAX_ENTRIES', default=10000, cast=int)}
+
+# A per-process LocMemCache never sees invalidations made by another process.
+# It is refused by config/gunicorn_conf.py with more than one worker, and every
+# cached value defaults to LOCAL_CACHE_TTL seconds so a management command's
+# edits still reach a running server that quickly.
+LOCAL_CACHE = 'locmem' in CACHES['default']['BACKEND'].lower()
+LOCAL_CACHE_TTL = config('LOCAL_CACHE_TTL', default=10, cast=int)
+
+
+def _cache_timeout(name, default):
+    return config(name, default=LOCAL_CACHE_TTL if LOCAL_CACHE else default, cast=int)
+
+
+# Seconds a worker keeps its in-memory AboutMe / social links (portfolioapp/hotcache.py)
+# before reloading them even if their shared version has not changed
+HOT_CACHE_TTL = _cache_timeout('HOT_CACHE_TTL', 300)
+
+# Seconds a precomputed homepage bundle section may live in the cache; sections
+# are also re-rendered in the shared cache whenever their content changes
+BUNDLE_CACHE_TIMEOUT = _cache_timeout('BUNDLE_CACHE_TIMEOUT', 3600)
+
+# Upper bound on the lifetime of precomputed read indexes (skills by category,
+# related projects); they are also invalidated in the shared cache whenever
+# their source models change
+INDEX_CACHE_TIMEOUT = _cache_timeout('INDEX_CACHE_TIMEOUT', 3600)
+
+# Seconds a worker keeps its in-memory autocomplete index before rebuilding it
+# even if the shared ``search`` version has not moved
+SEARCH_INDEX_MAX_AGE = _cache_timeout('SEARCH_INDEX_MAX_AGE', 3600)
+
+# Number of neighbours kept per project for /api/projects/{id}/related/
+RELATED_PROJECTS_LIMIT = config('RELATED_PROJECTS_LIMIT', default=6, cast=int)
+
+# Seconds a rendered public GET response stays in the response cache
+# (0 disables it); any content change invalidates all entries immediately
+RESPONSE_CACHE_TIMEOUT = _cache_timeout('RESPONSE_CACHE_TIMEOUT', 300)
+
+# Cache stampede protection (see portfolioapp/coalesce.py): seconds a worker
+# may hold the recompute lease for a key, seconds an expired entry may still
+# be served while it is refreshed, and the XFetch early-expiry factor
+# (0 disables early refreshes)
+CACHE_LEASE_TIMEOUT = config('CACHE_LEASE_TIMEOUT', default=10, cast=int)
+CACHE_STALE_TIMEOUT = config('CACHE_STALE_TIMEOUT', default=60, cast=int)
+CACHE_EARLY_EXPIRY_BETA = config('CACHE_EARLY_EXPIRY_BETA', default=1.0, cast=float)
+
+# Cache warm-up (manage.py warm_caches and the gunicorn post_worker_init hook):
+# warm on worker boot, pages of each list route and detail routes per group
+WARMUP_ON_BOOT = config('WARMUP_ON_BOOT', default=True, cast=bool)
+WARMUP_PAGES = config('WARMUP_PAGES', default=1, cast=int)
+WARMUP_DETAIL_LIMIT = config('WARMUP_DETAIL_LIMIT', default=50, cast=int)
+
+# Response compression: smallest body worth compressing (bytes) and the
+# gzip / brotli levels used (brotli needs the ``Brotli`` package from requirements.txt)
+COMPRESSION_MIN_SIZE = config('COMPRESSION_MIN_SIZE', default=1024, cast=int)
+COMPRESSION_GZIP_LEVEL = config('COMPRESSION_GZIP_LEVEL', default=6, cast=int)
+COMPRESSION_BROTLI_QUALITY = config('COMPRESSION_BROTLI_QUALITY', default=5, cast=int)
+
+# Rows fetched per database round trip by the streaming submission exports
+EXPORT_CHUNK_SIZE = config('EXPORT_CHUNK_SIZE', default=2000, cast=int)
+
+# Admin changelists count exactly up to this many rows and show a database
+# estimate beyond (service requests and contact messages)
+ADMIN_EXACT_COUNT_LIMIT = config('ADMIN_EXACT_COUNT_LIMIT', default=10000, cast=int)
+
+# Rows moved per UPDATE by the bulk status actions and /api/workflow/
+WORKFLOW_BATCH_SIZE = config('WORKFLOW_BATCH_SIZE', default=1000, cast=int)
+
+# Closed submissions (completed / cancelled service requests, replied contact
+# messages) older than this many days are moved to gzipped NDJSON files under
+# ARCHIVE_ROOT by `manage.py archive_submissions`
+SUBMISSION_RETENTION_DAYS = config('SUBMISSION_RETENTION_DAYS', default=365, cast=int)
+ARCHIVE_ROOT = config('ARCHIVE_ROOT', default=str(BASE_DIR / 'archive'))
+# Submissions per archive file and transaction
+ARCHIVE_BATCH_SIZE = config('ARCHIVE_BATCH_SIZE', default=5000, cast=int)
+
+# Spam filtering of the contact and service request forms (portfolioapp/spam.py)
+SPAM_FILTER_ENABLED = config('SPAM_FILTER_ENABLED', default=True, cast=bool)
+# Hidden form field that must stay empty
+SPAM_HONEYPOT_FIELD = config('SPAM_HONEYPOT_FIELD', default='website')
+# Field carrying the token from GET /api/forms/token/; forms sent back sooner
+# than SPAM_MIN_FILL_SECONDS after it was issued are rejected
+SPAM_FORM_TOKEN_FIELD = config('SPAM_FORM_TOKEN_FIELD', default='form_token')
+SPAM_MIN_FILL_SECONDS = config('SPAM_MIN_FILL_SECONDS', default=3, cast=float)
+SPAM_REQUIRE_FORM_TOKEN = config('SPAM_REQUIRE_FORM_TOKEN', default=False, cast=bool)
+# Identical submissions within this many seconds are dropped (per process)
+SPAM_DUPLICATE_WINDOW = config('SPAM_DUPLICATE_WINDOW', default=3600, cast=int)
+SPAM_FINGERPRINT_CACHE_SIZE = config('SPAM_FINGERPRINT_CACHE_SIZE', default=10000, cast=int)
+SPAM_MAX_LINKS = config('SPAM_MAX_LINKS', default=3, cast=int)
+# Classifier written by `manage.py train_spam_filter`, and the spam
+# probability from which it rejects a submission
+SPAM_MODEL_PATH = config('SPAM_MODEL_PATH', default=str(BASE_DIR / 'spam_model.json'))
+SPAM_THRESHOLD = config('SPAM_THRESHOLD', default=0.95, cast=float)
+
+# Live admin feed (GET /api/live/): seconds between keepalive comments on idle
+# streams and between polls of the shared event log. Under WSGI each stream
+# holds a worker thread, so a process serves at most LIVE_FEED_MAX_STREAMS at
+# once and ends each after LIVE_FEED_MAX_AGE seconds (the browser reconnects).
+LIVE_FEED_HEARTBEAT = config('LIVE_FEED_HEARTBEAT', default=15, cast=int)
+LIVE_FEED_POLL_INTERVAL = config('LIVE_FEED_POLL_INTERVAL', default=1.0, cast=float)
+LIVE_FEED_MAX_STREAMS = config('LIVE_FEED_MAX_STREAMS', default=1, cast=int)
+LIVE_FEED_MAX_AGE = config('LIVE_FEED_MAX_AGE', default=300, cast=int)
+
+# Longest side in pixels of the blurred placeholder images returned with
+# project and testimonial images (portfolioapp/imagemeta.py)
+IMAGE_PLACEHOLDER_SIZE = config('IMAGE_PLACEHOLDER_SIZE', default=16, cast=int)
+
+# Limits for POST /api/batch/
+BATCH_MAX_REQUESTS = config('BATCH_MAX_REQUESTS', default=20, cast=int)
+BATCH_MAX_COST = config('BATCH_MAX_COST', default=40, cast=int)
+
+# Public base URL of the API, used when rendering responses outside of a
+# real request (snapshots, batching, cache warming)
+PUBLIC_API_URL = config('PUBLIC_API_URL', default=f"https://{ALLOWED_HOSTS[0]}")
+
+# Behind the TLS-terminating proxy requests reach gunicorn over plain http.
+# Trusting the proxy's X-Forwarded-Proto makes request.scheme https, so absolute
+# URLs and response cache keys match those rendered for PUBLIC_API_URL by the
+# warm-up. Set PROXY_SSL_HEADER= (empty) when clients can reach gunicorn directly.
+PROXY_SSL_HEADER = config('PROXY_SSL_HEADER', default='HTTP_X_FORWARDED_PROTO')
+if PROXY_SSL_HEADER:
+    SECURE_PROXY_SSL_HEADER = (PROXY_SSL_HEADER, 'https')
+
+# Static JSON snapshots of the public API (manage.py export_api_snapshot)
+API_SNAPSHOT_ROOT = config('API_SNAPSHOT_ROOT', default=str(BASE_DIR / 'snapshot'))
+# Re-render affected snapshot files whenever public content is saved
+API_SNAPSHOT_AUTO = config('API_SNAPSHOT_AUTO', default=False, cast=bool)
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -0,0 +1,57 @@
+"""
+API-only settings for the public worker pool.
+
+Public traffic only hits the JSON read endpoints and the form submissions, so
+these workers leave out the admin, sessions, messages and the browsable API.
+That trims boot time and memory per worker. Run the admin from a separate
+pool that uses ``config.settings``.
+
+Usage:
+    DJANGO_SETTINGS_MODULE=config.settings_api \\
+        gunicorn -c config/gunicorn_conf.py config.wsgi:application
+"""
+
+from .settings import *  # noqa: F401,F403
+from .settings import INSTALLED_APPS, MIDDLEWARE, REST_FRAMEWORK, TEMPLATES
+
+INSTALLED_APPS = [
+    app for app in INSTALLED_APPS
+    if app not in (
+        'django.contrib.admin',
+        'django.contrib.sessions',
+        'django.contrib.messages',
+        'django.contrib.staticfiles',
+    )
+]
+
+MIDDLEWARE = [
+    middleware for middleware in MIDDLEWARE
+    if middleware not in (
+        'django.contrib.sessions.middleware.SessionMiddleware',
+        'django.middleware.csrf.CsrfViewMiddleware',
+        'django.contrib.auth.middleware.AuthenticationMiddleware',
+        'django.contrib.messages.middleware.MessageMiddleware',
+    )
+]
+
+ROOT_URLCONF = 'config.urls_api'
+
+TEMPLATES = [
+    {
+        **TEMPLATES[0],
+        'OPTIONS': {
+            'context_processors': [
+                'django.template.context_processors.request',
+            ],
+        },
+    },
+]
+
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    'DEFAULT_RENDERER_CLASSES': [
+        'rest_framework.renderers.JSONRenderer',
+    ],
+    # Anonymous public traffic only; no session or basic auth lookups
+    'DEFAULT_AUTHENTICATION_CLASSES': [],
+}
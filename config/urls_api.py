@@ -0,0 +1,6 @@
+"""URL configuration for the API-only worker pool (see config/settings_api.py)"""
+from django.urls import path, include
+
+urlpatterns = [
+    path('', include('portfolioapp.urls')),
+]
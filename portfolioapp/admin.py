@@ -1,19 +1,202 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.contrib.admin.helpers import ACTION_CHECKBOX_NAME
+from django.core.exceptions import PermissionDenied
+from django.shortcuts import redirect
+from django.template.response import TemplateResponse
+from django.urls import path, reverse
+
+from . import archive, exports, hotcache, reorder, rollups, workflow
+from .changelists import LargeTableAdminMixin, RelatedInputFilter
 from .models import (
     ServiceRequest, ContactMessage, Project, Skill, ProjectSkill,
-    Testimonial, SocialLink, AboutMe
+    Testimonial, SocialLink, AboutMe, ArchiveBatch, ArchivedSubmission
 )
 
 
+# Rows shown on the live feed page
+LIVE_FEED_ROWS = 50
+
+
+class ExportActionsMixin:
+    """
+    Stream the selected rows as CSV or NDJSON. With "select all" the action
+    receives the whole filtered changelist (status, service type, date
+    filters, search), however many rows it holds.
+    """
+    actions = ['export_csv', 'export_csv_gzip', 'export_ndjson']
+
+    @admin.action(description='Export selected as CSV', permissions=['view'])
+    def export_csv(self, request, queryset):
+        return exports.streaming_response(queryset, 'csv')
+
+    @admin.action(description='Export selected as CSV (gzip)', permissions=['view'])
+    def export_csv_gzip(self, request, queryset):
+        return exports.streaming_response(queryset, 'csv', compress=True)
+
+    @admin.action(description='Export selected as NDJSON', permissions=['view'])
+    def export_ndjson(self, request, queryset):
+        return exports.streaming_response(queryset, 'ndjson')
+
+
+def status_action(target, label):
+    """
+    Admin action moving the selected rows to ``target`` with one UPDATE per
+    batch; rows whose status does not allow the move are skipped.
+    """
+    @admin.action(description=f'Mark selected as {label}', permissions=['change'])
+    def action(model_admin, request, queryset):
+        try:
+            updated = workflow.transition(queryset, target)
+        except workflow.WorkflowError as e:
+            model_admin.message_user(request, str(e), messages.ERROR)
+            return
+        message = f"{updated} marked as {label}."
+        selected = len(request.POST.getlist(ACTION_CHECKBOX_NAME))
+        if selected > updated and request.POST.get('select_across') != '1':
+            message += f" {selected - updated} skipped: their status does not allow it."
+        model_admin.message_user(request, message, messages.SUCCESS)
+
+    action.__name__ = f'mark_{target}'
+    return action
+
+
+class StatusWorkflowMixin:
+    """Bulk "Mark selected as ..." actions for every target in workflow.TRANSITIONS"""
+
+    def get_actions(self, request):
+        actions = super().get_actions(request)
+        if not self.has_change_permission(request):
+            return actions
+        choices = dict(self.model._meta.get_field('status').choices)
+        for target in workflow.TRANSITIONS[self.model]:
+            func = status_action(target, choices[target].lower())
+            actions[func.__name__] = (func, func.__name__, func.short_description)
+        return actions
+
+
+class SpamLabelMixin:
+    """Label submissions for the spam filter; retrain with manage.py train_spam_filter"""
+
+    def get_actions(self, request):
+        actions = super().get_actions(request)
+        if not self.has_change_permission(request):
+            return actions
+        for func in (self.label_spam, self.label_ham):
+            name = func.__name__
+            actions[name] = (func.__func__, name, func.short_description)
+        return actions
+
+    @admin.action(description='Label selected as spam', permissions=['change'])
+    def label_spam(self, request, queryset):
+        updated = queryset.update(spam_label='spam')
+        self.message_user(request, f"{updated} labelled as spam.", messages.SUCCESS)
+
+    @admin.action(description='Label selected as not spam', permissions=['change'])
+    def label_ham(self, request, queryset):
+        updated = queryset.update(spam_label='ham')
+        self.message_user(request, f"{updated} labelled as not spam.", messages.SUCCESS)
+
+
 @admin.register(ServiceRequest)
-class ServiceRequestAdmin(admin.ModelAdmin):
+class ServiceRequestAdmin(LargeTableAdminMixin, StatusWorkflowMixin, SpamLabelMixin, ExportActionsMixin,
+                          admin.ModelAdmin):
     list_display = ['full_name', 'email', 'service_type', 'status', 'submitted_at']
-    list_filter = ['service_type', 'status', 'preferred_timeline', 'submitted_at']
+    list_filter = ['service_type', 'status', 'preferred_timeline', 'spam_label', 'submitted_at']
     search_fields = ['full_name', 'email', 'project_requirements']
     readonly_fields = ['submitted_at', 'updated_at']
     list_editable = ['status']
     date_hierarchy = 'submitted_at'
 
+    def get_urls(self):
+        return [
+            path('dashboard/', self.admin_site.admin_view(self.dashboard_view),
+                 name='portfolioapp_servicerequest_dashboard'),
+            path('live/', self.admin_site.admin_view(self.live_view),
+                 name='portfolioapp_servicerequest_live'),
+        ] + super().get_urls()
+
+    def live_view(self, request):
+        """The latest submissions, kept current by the /api/live/ event stream"""
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+        recent = []
+        for model, summary in ((ServiceRequest, 'service_type'), (ContactMessage, 'subject')):
+            statuses = dict(model.STATUS_CHOICES)
+            rows = model.objects.only('full_name', 'email', 'status', 'submitted_at', summary)
+            for obj in rows.order_by('-submitted_at')[:LIVE_FEED_ROWS]:
+                recent.append({
+                    'model': model._meta.model_name,
+                    'kind': model._meta.verbose_name,
+                    'id': obj.pk,
+                    'full_name': obj.full_name,
+                    'email': obj.email,
+                    'summary': obj.get_service_type_display() if model is ServiceRequest else obj.subject,
+                    'status_label': statuses.get(obj.status, obj.status),
+                    'submitted_at': obj.submitted_at,
+                })
+        recent.sort(key=lambda item: item['submitted_at'], reverse=True)
+        admin_root = reverse('admin:app_list', kwargs={'app_label': self.opts.app_label})
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.opts,
+            'title': 'Live feed',
+            'recent': recent[:LIVE_FEED_ROWS],
+            'admin_root': admin_root,
+            'live_config': {
+                'url': reverse('live-feed'),
+                'admin_root': admin_root,
+                'limit': LIVE_FEED_ROWS,
+                'kinds': {model._meta.model_name: str(model._meta.verbose_name)
+                          for model in (ServiceRequest, ContactMessage)},
+                'statuses': {model._meta.model_name: dict(model.STATUS_CHOICES)
+                             for model in (ServiceRequest, ContactMessage)},
+                'labels': {'connected': 'Live.', 'reconnecting': 'Reconnecting…'},
+            },
+        }
+        return TemplateResponse(request, 'admin/portfolioapp/live.html', context)
+
+    def dashboard_view(self, request):
+        """Submissions per day, breakdowns and funnel, read from the daily rollups"""
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+        by = request.GET.get('by', 'status')
+        if by not in rollups.dimensions(ServiceRequest):
+            by = 'status'
+        try:
+            start, end = rollups.date_range(request.GET)
+        except rollups.RollupError as e:
+            self.message_user(request, str(e), messages.ERROR)
+            start, end = rollups.date_range({})
+
+        requests_by_day = rollups.daily_counts(ServiceRequest, by, start, end)
+        field = ServiceRequest._meta.get_field(by)
+        columns = field.choices + ([('', 'Not given')] if field.blank else [])
+        messages_by_day = rollups.daily_counts(ContactMessage, 'status', start, end)
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.opts,
+            'title': 'Submissions dashboard',
+            'start': start,
+            'end': end,
+            'by': by,
+            'dimensions': [(field, ServiceRequest._meta.get_field(field).verbose_name)
+                           for field in rollups.dimensions(ServiceRequest)],
+            'columns': columns,
+            'rows': [
+                (day['day'], day['total'], [day['counts'].get(value, 0) for value, _ in columns])
+                for day in reversed(requests_by_day['days'])
+            ],
+            'totals': [requests_by_day['totals'].get(value, 0) for value, _ in columns],
+            'total': sum(requests_by_day['totals'].values()),
+            'funnel': rollups.funnel(start, end),
+            'message_columns': ContactMessage.STATUS_CHOICES,
+            'message_rows': [
+                (day['day'], day['total'], [day['counts'].get(value, 0) for value, _ in ContactMessage.STATUS_CHOICES])
+                for day in reversed(messages_by_day['days'])
+            ],
+        }
+        return TemplateResponse(request, 'admin/portfolioapp/dashboard.html', context)
+
     fieldsets = (
         ('Client Information', {
             'fields': ('full_name', 'email')
@@ -22,7 +205,7 @@ class ServiceRequestAdmin(admin.ModelAdmin):
             'fields': ('service_type', 'project_requirements', 'preferred_timeline', 'budget_range')
         }),
         ('Status', {
-            'fields': ('status', 'agree_to_terms')
+            'fields': ('status', 'agree_to_terms', 'spam_label')
         }),
         ('Timestamps', {
             'fields': ('submitted_at', 'updated_at'),
@@ -32,9 +215,10 @@ class ServiceRequestAdmin(admin.ModelAdmin):
 
 
 @admin.register(ContactMessage)
-class ContactMessageAdmin(admin.ModelAdmin):
+class ContactMessageAdmin(LargeTableAdminMixin, StatusWorkflowMixin, SpamLabelMixin, ExportActionsMixin,
+                          admin.ModelAdmin):
     list_display = ['full_name', 'email', 'subject', 'status', 'submitted_at']
-    list_filter = ['status', 'submitted_at']
+    list_filter = ['status', 'spam_label', 'submitted_at']
     search_fields = ['full_name', 'email', 'subject', 'message']
     readonly_fields = ['submitted_at', 'updated_at']
     list_editable = ['status']
@@ -48,7 +232,7 @@ class ContactMessageAdmin(admin.ModelAdmin):
             'fields': ('subject', 'message')
         }),
         ('Status', {
-            'fields': ('status',)
+            'fields': ('status', 'spam_label')
         }),
         ('Timestamps', {
             'fields': ('submitted_at', 'updated_at'),
@@ -57,6 +241,46 @@ class ContactMessageAdmin(admin.ModelAdmin):
     )
 
 
+class ReorderAdminMixin:
+    """
+    A "Reorder" page where rows are dragged into place and the whole order is
+    saved at once (one UPDATE, caches invalidated once).
+    """
+    change_list_template = 'admin/portfolioapp/change_list_reorder.html'
+
+    def get_urls(self):
+        name = f"{self.opts.app_label}_{self.opts.model_name}_reorder"
+        return [
+            path('reorder/', self.admin_site.admin_view(self.reorder_view), name=name),
+        ] + super().get_urls()
+
+    def changelist_view(self, request, extra_context=None):
+        extra_context = {'can_reorder': self.has_change_permission(request), **(extra_context or {})}
+        return super().changelist_view(request, extra_context)
+
+    def reorder_view(self, request):
+        if not self.has_change_permission(request):
+            raise PermissionDenied
+        changelist_url = reverse(f"admin:{self.opts.app_label}_{self.opts.model_name}_changelist")
+        if request.method == 'POST':
+            try:
+                changed = reorder.apply_order(self.model, [int(pk) for pk in request.POST.getlist('ids')])
+            except ValueError as e:
+                self.message_user(request, str(e), messages.ERROR)
+                return redirect(request.path)
+            self.message_user(request, f"New order saved ({changed} changed).", messages.SUCCESS)
+            return redirect(changelist_url)
+
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.opts,
+            'title': f"Reorder {self.opts.verbose_name_plural}",
+            'objects': self.model.objects.all(),
+            'changelist_url': changelist_url,
+        }
+        return TemplateResponse(request, 'admin/portfolioapp/reorder.html', context)
+
+
 class ProjectSkillInline(admin.TabularInline):
     model = ProjectSkill
     extra = 1
@@ -64,12 +288,12 @@ class ProjectSkillInline(admin.TabularInline):
 
 
 @admin.register(Project)
-class ProjectAdmin(admin.ModelAdmin):
+class ProjectAdmin(ReorderAdminMixin, admin.ModelAdmin):
     list_display = ['name', 'status', 'is_featured', 'order', 'created_at']
     list_filter = ['status', 'is_featured', 'created_at']
     search_fields = ['name', 'description']
     list_editable = ['status', 'is_featured', 'order']
-    readonly_fields = ['created_at', 'updated_at']
+    readonly_fields = ['skill_names', 'active_testimonial_count', 'average_rating', 'created_at', 'updated_at']
     date_hierarchy = 'created_at'
     inlines = [ProjectSkillInline]
 
@@ -86,6 +310,10 @@ class ProjectAdmin(admin.ModelAdmin):
         ('Display Settings', {
             'fields': ('status', 'order', 'is_featured')
         }),
+        ('Aggregates', {
+            'fields': ('skill_names', 'active_testimonial_count', 'average_rating'),
+            'classes': ('collapse',)
+        }),
         ('Timestamps', {
             'fields': ('created_at', 'updated_at'),
             'classes': ('collapse',)
@@ -94,7 +322,7 @@ class ProjectAdmin(admin.ModelAdmin):
 
 
 @admin.register(Skill)
-class SkillAdmin(admin.ModelAdmin):
+class SkillAdmin(ReorderAdminMixin, admin.ModelAdmin):
     list_display = ['name', 'category', 'proficiency', 'order', 'is_active']
     list_filter = ['category', 'is_active']
     search_fields = ['name']
@@ -102,10 +330,23 @@ class SkillAdmin(admin.ModelAdmin):
     ordering = ['order', 'name']
 
 
+class ProjectInputFilter(RelatedInputFilter):
+    title = 'project'
+    parameter_name = 'project'
+    field_name = 'project'
+
+
+class SkillInputFilter(RelatedInputFilter):
+    title = 'skill'
+    parameter_name = 'skill'
+    field_name = 'skill'
+
+
 @admin.register(ProjectSkill)
 class ProjectSkillAdmin(admin.ModelAdmin):
     list_display = ['project', 'skill']
-    list_filter = ['project', 'skill']
+    list_filter = [ProjectInputFilter, SkillInputFilter]
+    list_select_related = ['project', 'skill']
     search_fields = ['project__name', 'skill__name']
     autocomplete_fields = ['project', 'skill']
 
@@ -138,7 +379,7 @@ class TestimonialAdmin(admin.ModelAdmin):
 
 
 @admin.register(SocialLink)
-class SocialLinkAdmin(admin.ModelAdmin):
+class SocialLinkAdmin(ReorderAdminMixin, admin.ModelAdmin):
     list_display = ['platform', 'url', 'order', 'is_active']
     list_filter = ['platform', 'is_active']
     list_editable = ['order', 'is_active']
@@ -167,8 +408,43 @@ class AboutMeAdmin(admin.ModelAdmin):
 
     def has_add_permission(self, request):
         # Allow adding only if no instance exists
-        return not AboutMe.objects.exists()
+        return not hotcache.about_me_exists()
 
     def has_delete_permission(self, request, obj=None):
         # Prevent deletion
         return False
+
+
+class ReadOnlyAdminMixin:
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(ArchivedSubmission)
+class ArchivedSubmissionAdmin(ReadOnlyAdminMixin, admin.ModelAdmin):
+    """Search archived submissions without reading the archive files"""
+    list_display = ['full_name', 'email', 'kind', 'summary', 'status', 'submitted_at', 'original_id', 'batch']
+    list_filter = ['kind', 'status']
+    search_fields = ['=original_id', 'email', 'full_name', 'summary']
+    list_select_related = ['batch']
+    date_hierarchy = 'submitted_at'
+    actions = ['restore']
+
+    @admin.action(description='Restore selected to the live tables', permissions=['view'])
+    def restore(self, request, queryset):
+        if not request.user.is_superuser:
+            raise PermissionDenied
+        restored = archive.restore(queryset)
+        self.message_user(request, f"{restored} submissions restored.", messages.SUCCESS)
+
+
+@admin.register(ArchiveBatch)
+class ArchiveBatchAdmin(ReadOnlyAdminMixin, admin.ModelAdmin):
+    list_display = ['path', 'kind', 'row_count', 'size', 'first_submitted_at', 'last_submitted_at', 'created_at']
+    list_filter = ['kind']
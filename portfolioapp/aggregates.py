@@ -0,0 +1,69 @@
+"""
+Denormalized per-project aggregates.
+
+``Project.skill_names``, ``Project.active_testimonial_count`` and
+``Project.average_rating`` let the list and detail endpoints read a single
+table. Signal receivers refresh only the affected projects whenever a
+ProjectSkill, Skill or Testimonial changes; ``manage.py
+rebuild_project_aggregates`` recomputes everything and reports drift.
+"""
+from django.db.models import Avg, Count
+
+from .models import Project, ProjectSkill, Testimonial
+
+AGGREGATE_FIELDS = ('skill_names', 'active_testimonial_count', 'average_rating')
+
+
+def compute_aggregates(project_ids):
+    """Return {project_id: {field: value}} computed from the source tables"""
+    project_ids = list(project_ids)
+    result = {
+        pk: {'skill_names': [], 'active_testimonial_count': 0, 'average_rating': None}
+        for pk in project_ids
+    }
+    names = (
+        ProjectSkill.objects
+        .filter(project_id__in=project_ids)
+        .order_by('pk')
+        .values_list('project_id', 'skill__name')
+    )
+    for project_id, name in names:
+        result[project_id]['skill_names'].append(name)
+
+    ratings = (
+        Testimonial.objects
+        .filter(project_id__in=project_ids, is_active=True)
+        .values('project_id')
+        .annotate(total=Count('pk'), average=Avg('rating'))
+        .order_by()
+    )
+    for row in ratings:
+        result[row['project_id']]['active_testimonial_count'] = row['total']
+        result[row['project_id']]['average_rating'] = round(row['average'], 2)
+    return result
+
+
+def refresh_projects(project_ids):
+    """Recompute and store the aggregates of the given projects"""
+    project_ids = {pk for pk in project_ids if pk is not None}
+    if not project_ids:
+        return 0
+    projects = list(Project.objects.filter(pk__in=project_ids).only('pk', *AGGREGATE_FIELDS))
+    computed = compute_aggregates(project.pk for project in projects)
+    for project in projects:
+        for field, value in computed[project.pk].items():
+            setattr(project, field, value)
+    # bulk_update skips save() and signals, and leaves updated_at alone
+    Project.objects.bulk_update(projects, AGGREGATE_FIELDS)
+    return len(projects)
+
+
+def find_drift(projects):
+    """Yield (project, field, stored, expected) for stale aggregate values"""
+    projects = list(projects)
+    computed = compute_aggregates(project.pk for project in projects)
+    for project in projects:
+        for field, expected in computed[project.pk].items():
+            stored = getattr(project, field)
+            if stored != expected:
+                yield project, field, stored, expected
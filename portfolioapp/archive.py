@@ -0,0 +1,225 @@
+"""
+Retention for form submissions.
+
+Closed submissions (completed or cancelled service requests, replied contact
+messages) submitted more than ``SUBMISSION_RETENTION_DAYS`` days ago are moved
+out of the live tables in batches of ``ARCHIVE_BATCH_SIZE``:
+
+1. the batch is written to
+   ``ARCHIVE_ROOT/<kind>/<year>/<kind>-<first id>-<last id>-<random>.ndjson.gz``
+   with the export encoder, to a temporary name linked into place when
+   complete (never over an existing file);
+2. one transaction records the file (``ArchiveBatch``), adds a searchable
+   ``ArchivedSubmission`` index row per submission and deletes the originals.
+
+A failure between the two steps leaves at worst an unreferenced file; the
+rows stay live. Archived submissions keep counting in the daily rollups: the
+deletes run with the rollup receivers paused and ``rollups.compute`` adds the
+index rows. ``restore`` puts rows back with their original ids and timestamps.
+"""
+import datetime
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import uuid
+from collections import defaultdict
+from pathlib import Path
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, DateTimeField, Value, When
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from . import exports, signals
+from .models import ServiceRequest, ContactMessage, ArchiveBatch, ArchivedSubmission
+
+CLOSED_STATUSES = {
+    ServiceRequest: ('completed', 'cancelled'),
+    ContactMessage: ('replied',),
+}
+
+# ArchivedSubmission.kind -> model
+MODELS = {model._meta.model_name: model for model in CLOSED_STATUSES}
+
+# Rows re-inserted per statement by restore
+RESTORE_CHUNK_SIZE = 1000
+
+
+def root():
+    return Path(settings.ARCHIVE_ROOT)
+
+
+def cutoff(days=None):
+    days = settings.SUBMISSION_RETENTION_DAYS if days is None else days
+    return timezone.now() - datetime.timedelta(days=days)
+
+
+def candidates(model, before):
+    # Served by the (status, submitted_at) index
+    return model.objects.filter(status__in=CLOSED_STATUSES[model], submitted_at__lt=before)
+
+
+def _index_entry(model, batch, row):
+    entry = ArchivedSubmission(
+        kind=model._meta.model_name,
+        original_id=row['id'],
+        batch=batch,
+        submitted_at=row['submitted_at'],
+        status=row['status'],
+        full_name=row['full_name'],
+        email=row['email'],
+    )
+    if model is ServiceRequest:
+        entry.summary = dict(ServiceRequest.SERVICE_TYPES).get(row['service_type'], row['service_type'])
+        entry.service_type = row['service_type']
+        entry.budget_range = row['budget_range']
+        entry.preferred_timeline = row['preferred_timeline']
+    else:
+        entry.summary = row['subject'][:255]
+    return entry
+
+
+def _write_file(model, pks, first_submitted_at):
+    kind = model._meta.model_name
+    # The same id range can be archived again after a restore; the random
+    # suffix keeps every batch in its own file
+    name = f"{kind}-{pks[0]}-{pks[-1]}-{uuid.uuid4().hex[:12]}.ndjson.gz"
+    relative = Path(kind) / f"{first_submitted_at:%Y}" / name
+    target = root() / relative
+    target.parent.mkdir(parents=True, exist_ok=True)
+
+    digest = hashlib.sha256()
+    size = 0
+    fd, temp_path = tempfile.mkstemp(dir=target.parent, prefix='.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as handle:
+            for chunk in exports.export_chunks(model.objects.filter(pk__in=pks), 'ndjson', compress=True):
+                handle.write(chunk)
+                digest.update(chunk)
+                size += len(chunk)
+            handle.flush()
+            os.fsync(handle.fileno())
+        # Unlike os.replace, link fails rather than overwrite an existing archive
+        os.link(temp_path, target)
+    finally:
+        os.unlink(temp_path)
+    return str(relative), size, digest.hexdigest()
+
+
+def archive_batch(model, pks):
+    """Move the given closed submissions to one archive file; return the number moved"""
+    pks = sorted(pks)
+    fields = [field for field in exports.EXPORT_FIELDS[model] if field not in ('project_requirements', 'message')]
+    first = model.objects.filter(pk__in=pks).order_by('submitted_at').values_list('submitted_at', flat=True).first()
+    if first is None:
+        return 0
+    path, size, sha256 = _write_file(model, pks, timezone.localtime(first))
+
+    with transaction.atomic():
+        # Rows reopened since the file was written stay live
+        rows = list(
+            model.objects.select_for_update()
+            .filter(pk__in=pks, status__in=CLOSED_STATUSES[model])
+            .order_by('pk').values(*fields)
+        )
+        if not rows:
+            os.unlink(root() / path)
+            return 0
+        batch = ArchiveBatch.objects.create(
+            kind=model._meta.model_name,
+            path=path,
+            row_count=len(rows),
+            size=size,
+            sha256=sha256,
+            first_submitted_at=min(row['submitted_at'] for row in rows),
+            last_submitted_at=max(row['submitted_at'] for row in rows),
+        )
+        ArchivedSubmission.objects.bulk_create([_index_entry(model, batch, row) for row in rows])
+        with signals.rollups_paused():
+            model.objects.filter(pk__in=[row['id'] for row in rows]).delete()
+    return len(rows)
+
+
+def archive(model, before, batch_size=None, limit=None):
+    """
+    Archive closed submissions of ``model`` submitted before ``before``.
+    Yield the number of rows moved per batch.
+    """
+    batch_size = batch_size or settings.ARCHIVE_BATCH_SIZE
+    queryset = candidates(model, before).order_by('pk').values_list('pk', flat=True)
+    last_pk = 0
+    moved = 0
+    while limit is None or moved < limit:
+        size = batch_size if limit is None else min(batch_size, limit - moved)
+        pks = list(queryset.filter(pk__gt=last_pk)[:size])
+        if not pks:
+            return
+        last_pk = pks[-1]
+        count = archive_batch(model, pks)
+        moved += count
+        yield count
+
+
+def read_batch(batch):
+    """Yield the rows of a batch file as dicts, with datetimes parsed"""
+    model = MODELS[batch.kind]
+    datetime_fields = {
+        field.name for field in model._meta.concrete_fields if isinstance(field, DateTimeField)
+    }
+    with gzip.open(root() / batch.path, 'rt', encoding='utf-8') as handle:
+        for line in handle:
+            row = json.loads(line)
+            for name in datetime_fields & row.keys():
+                if row[name]:
+                    row[name] = parse_datetime(row[name])
+            yield row
+
+
+def _reinsert(model, rows):
+    instances = [model(**row) for row in rows]
+    model.objects.bulk_create(instances)
+    # bulk_create stamps auto_now / auto_now_add fields; put the archived values back
+    pks = [row['id'] for row in rows]
+    model.objects.filter(pk__in=pks).update(**{
+        name: Case(*[When(pk=row['id'], then=Value(row[name])) for row in rows], output_field=DateTimeField())
+        for name in ('submitted_at', 'updated_at')
+    })
+
+
+def restore(entries):
+    """
+    Put the archived submissions behind ``entries`` (an ArchivedSubmission
+    queryset) back into the live tables. Files and batches left without index
+    rows are removed. Return the number of rows restored.
+    """
+    wanted = defaultdict(set)
+    for batch_id, original_id in entries.values_list('batch_id', 'original_id'):
+        wanted[batch_id].add(original_id)
+
+    restored = 0
+    for batch in ArchiveBatch.objects.filter(pk__in=wanted):
+        model = MODELS[batch.kind]
+        ids = wanted[batch.pk]
+        with transaction.atomic():
+            chunk = []
+            for row in read_batch(batch):
+                if row['id'] not in ids:
+                    continue
+                chunk.append(row)
+                if len(chunk) == RESTORE_CHUNK_SIZE:
+                    _reinsert(model, chunk)
+                    restored += len(chunk)
+                    chunk = []
+            if chunk:
+                _reinsert(model, chunk)
+                restored += len(chunk)
+            # Restored rows were never taken out of the rollups; drop their index rows
+            batch.entries.filter(original_id__in=ids).delete()
+            if not batch.entries.exists():
+                batch.delete()
+                path = root() / batch.path
+                transaction.on_commit(lambda path=path: path.unlink(missing_ok=True))
+    return restored
@@ -0,0 +1,90 @@
+"""
+Batched GET sub-requests against the public API routes.
+
+Sub-requests are resolved and run in-process on the current thread (one
+database connection, no HTTP round trips) and go through the same response
+cache as regular requests. The combined response embeds each body as raw
+JSON bytes, so nothing is parsed and serialized a second time.
+"""
+import json
+from urllib.parse import parse_qsl, urlsplit
+
+from django.conf import settings
+from django.urls import Resolver404, resolve
+
+from . import cache as response_cache
+from .internal import build_get_request, dispatch
+
+# Cost of a route by URL name suffix; list routes page through the database
+ROUTE_COSTS = {
+    'api-root': 1,
+    'list': 3,
+    'detail': 1,
+}
+DEFAULT_ROUTE_COST = 2
+
+# Only the read-only router routes may be batched
+ALLOWED_PREFIXES = ('project-', 'skill-', 'testimonial-', 'social-link-', 'about-me-')
+
+
+class BatchError(ValueError):
+    pass
+
+
+def parse_items(items):
+    """Normalise the request body into a list of (path, params) tuples"""
+    if not isinstance(items, list) or not items:
+        raise BatchError('"requests" must be a non-empty list')
+    if len(items) > settings.BATCH_MAX_REQUESTS:
+        raise BatchError(f"At most {settings.BATCH_MAX_REQUESTS} requests per batch")
+
+    parsed = []
+    for item in items:
+        if isinstance(item, str):
+            item = {'url': item}
+        if not isinstance(item, dict):
+            raise BatchError('Each request must be a URL string or an object')
+        method = item.get('method', 'GET')
+        if not isinstance(method, str) or method.upper() != 'GET':
+            raise BatchError('Only GET sub-requests are supported')
+        url = item.get('url') or item.get('path') or ''
+        if not isinstance(url, str):
+            raise BatchError('"url" / "path" must be a string')
+        parts = urlsplit(url)
+        params = dict(parse_qsl(parts.query))
+        extra = item.get('params') or {}
+        if not isinstance(extra, dict):
+            raise BatchError('"params" must be an object')
+        params.update({key: str(value) for key, value in extra.items()})
+        parsed.append((parts.path, params))
+    return parsed
+
+
+def route_cost(path):
+    try:
+        match = resolve(path)
+    except Resolver404:
+        raise BatchError(f"Unknown route: {path}")
+    name = match.url_name or ''
+    if name != 'api-root' and not name.startswith(ALLOWED_PREFIXES):
+        raise BatchError(f"Route cannot be batched: {path}")
+    return ROUTE_COSTS.get(name.rsplit('-', 1)[-1], DEFAULT_ROUTE_COST)
+
+
+def run_batch(items):
+    """Validate and run the sub-requests; return the combined JSON bytes"""
+    parsed = parse_items(items)
+    total = sum(route_cost(path) for path, _ in parsed)
+    if total > settings.BATCH_MAX_COST:
+        raise BatchError(f"Batch cost {total} exceeds the limit of {settings.BATCH_MAX_COST}")
+
+    parts = []
+    for path, params in parsed:
+        sub_request = build_get_request(path, params)
+        response, _ = response_cache.cached_response(sub_request, lambda: dispatch(sub_request))
+        body = response.content or b'null'
+        if not response.get('Content-Type', '').startswith('application/json'):
+            body = json.dumps(body.decode(errors='replace')).encode()
+        head = json.dumps({'path': path, 'params': params, 'status': response.status_code})
+        parts.append(head[:-1].encode() + b',"body":' + body + b'}')
+    return b'{"responses":[' + b','.join(parts) + b']}'
@@ -0,0 +1,63 @@
+"""
+Homepage bundle: every first-load section in a single response.
+
+Each section is the rendered body of an existing public endpoint, stored
+pre-serialized in the cache. Serving a bundle is one ``get_many`` and a byte
+join; sections are re-rendered after commit whenever one of their models
+changes (see ``signals.py``).
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .internal import internal_get
+from .models import Project, Skill, ProjectSkill, Testimonial, SocialLink, AboutMe
+
+
+# Section name -> (source route, models whose changes invalidate it)
+SECTIONS = {
+    'projects': ('/api/projects/', (Project, ProjectSkill, Skill)),
+    'featured_projects': ('/api/projects/featured/', (Project, ProjectSkill, Skill, Testimonial)),
+    'skills': ('/api/skills/by_category/', (Skill,)),
+    'featured_testimonials': ('/api/testimonials/featured/', (Testimonial, Project)),
+    'social_links': ('/api/social-links/', (SocialLink,)),
+    'about_me': ('/api/about-me/info/', (AboutMe,)),
+}
+
+
+def section_key(name):
+    return f"bundle:section:{name}"
+
+
+def sections_for_model(model):
+    return [name for name, (_, models) in SECTIONS.items() if model in models]
+
+
+def build_section(name):
+    """Render one section and store its bytes and ETag in the cache"""
+    path, _ = SECTIONS[name]
+    response = internal_get(path)
+    body = response.content if response.status_code == 200 else b'null'
+    entry = (body, hashlib.md5(body).hexdigest())
+    cache.set(section_key(name), entry, settings.BUNDLE_CACHE_TIMEOUT)
+    return entry
+
+
+def refresh_sections(names):
+    for name in names:
+        build_section(name)
+
+
+def get_bundle(names):
+    """Return (body bytes, etag) for the requested sections, in the given order"""
+    keys = [section_key(name) for name in names]
+    cached = cache.get_many(keys)
+    parts = []
+    etags = []
+    for name, key in zip(names, keys):
+        body, etag = cached.get(key) or build_section(name)
+        parts.append(b'"' + name.encode() + b'":' + body)
+        etags.append(etag)
+    digest = hashlib.md5(':'.join(etags).encode()).hexdigest()
+    return b'{' + b','.join(parts) + b'}', f'"{digest}"'
@@ -0,0 +1,132 @@
+"""
+Shared version counters and the response cache for the public read endpoints.
+
+Rendered GET responses are stored under a key derived from the scheme, host,
+path and sorted query string. Every entry records the content version it was
+rendered from; saving any public model bumps that version after commit (see
+``signals.py``), which invalidates all entries at once. A lookup is a single
+``get_many`` for the version and the entry; misses are coalesced so a content
+change or an expiry re-renders each response once.
+"""
+import hashlib
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+
+from . import coalesce, compression
+
+# Routes that are never stored here (they have their own caching, are writes
+# or are staff-only)
+UNCACHED_PATHS = (
+    '/api/bundle/', '/api/batch/', '/api/autocomplete/',
+    '/api/service-request/', '/api/contact-message/', '/api/forms/', '/api/live/',
+    '/api/dashboard/',
+)
+
+
+def version_key(name):
+    return f"portfolio:version:{name}"
+
+
+def get_version(name):
+    """Shared version counter, used to invalidate derived data across workers"""
+    key = version_key(name)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, 1, None)
+        version = cache.get(key, 1)
+    return version
+
+
+def bump_version(name):
+    key = version_key(name)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        cache.set(key, 2, None)
+        return 2
+
+
+CONTENT_VERSION_KEY = version_key('content')
+
+
+def get_content_version():
+    return get_version('content')
+
+
+def bump_content_version():
+    return bump_version('content')
+
+
+def is_cacheable(request):
+    if request.method not in ('GET', 'HEAD') or not settings.RESPONSE_CACHE_TIMEOUT:
+        return False
+    path = request.path_info
+    if not path.startswith('/api/') or path.startswith(UNCACHED_PATHS):
+        return False
+    # This runs before authentication: a response rendered for a logged-in
+    # user must never be replayed to anyone else
+    if settings.SESSION_COOKIE_NAME in request.COOKIES or 'HTTP_AUTHORIZATION' in request.META:
+        return False
+    # The browsable API renders per-user HTML; only cache JSON
+    return 'text/html' not in request.META.get('HTTP_ACCEPT', '')
+
+
+def response_key(request):
+    query = urlencode(sorted(request.GET.lists()), doseq=True)
+    raw = f"{request.scheme}://{request.get_host()}{request.path_info}?{query}"
+    return 'response:' + hashlib.md5(raw.encode()).hexdigest()
+
+
+def build_response(entry):
+    response = HttpResponse(entry['body'], content_type=entry['content_type'])
+    response['ETag'] = entry['etag']
+    response.precompressed = entry.get('encoded')
+    return response
+
+
+def entry_for(response):
+    """The cache entry for a successful JSON response, or None"""
+    if response.status_code != 200 or response.streaming:
+        return None
+    content_type = response.get('Content-Type', '')
+    if not content_type.startswith('application/json'):
+        return None
+    body = response.content
+    etag = '"%s"' % hashlib.md5(body).hexdigest()
+    response['ETag'] = etag
+    # Compressed once here, then served to every client that accepts them
+    response.precompressed = compression.encode_all(body)
+    return {'body': body, 'content_type': content_type, 'etag': etag, 'encoded': response.precompressed}
+
+
+def cached_response(request, render):
+    """
+    Return (response, cache state) for ``request``, calling ``render()`` on a
+    miss. Concurrent misses for the same key are coalesced and stale entries
+    are served while one request re-renders (see ``coalesce.py``). The entry
+    and the content version are read with a single ``get_many``.
+    """
+    key = response_key(request)
+    found = cache.get_many([CONTENT_VERSION_KEY, key])
+    version = found.get(CONTENT_VERSION_KEY)
+    if version is None:
+        version = get_content_version()
+
+    rendered = {}
+
+    def compute():
+        rendered['response'] = render()
+        return entry_for(rendered['response'])
+
+    entry, state = coalesce.get_or_compute(
+        key, compute, settings.RESPONSE_CACHE_TIMEOUT, version=version, entry=found.get(key)
+    )
+    if 'response' in rendered:
+        return rendered['response'], state
+    if entry is None:
+        # Another request rendered an uncacheable response; render our own
+        return render(), coalesce.MISS
+    return build_response(entry), state
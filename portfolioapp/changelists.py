@@ -0,0 +1,248 @@
+"""
+Admin changelists that stay fast on very large tables.
+
+* ``estimated_count``: exact counts up to ``ADMIN_EXACT_COUNT_LIMIT`` rows
+  (a bounded ``COUNT`` over a ``LIMIT`` subquery), planner estimates beyond.
+* ``KeysetChangeList``: "newer / older" pages that seek on
+  (``keyset_field``, pk) instead of ``OFFSET``, so page 50,000 costs the same
+  as page 1. Custom column orderings fall back to numbered pages.
+* ``IndexedDateQuerySet``: the date hierarchy probes each year / month / day
+  with an indexed ``EXISTS`` instead of a ``DISTINCT`` over every row.
+* ``RelatedInputFilter``: a text filter with admin autocomplete suggestions in
+  place of sidebar lists that render every related object.
+"""
+import datetime
+import json
+
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.admin.views.main import ORDER_VAR, ChangeList
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Max, Min, QuerySet
+from django.utils import timezone
+from django.utils.functional import cached_property
+
+AFTER_VAR = 'after'
+BEFORE_VAR = 'before'
+
+# More periods than this and the date hierarchy uses the regular query
+MAX_DATE_PROBES = 400
+
+
+def planner_estimate(queryset):
+    """Row estimate without scanning the table, or None if the backend has none"""
+    connection = connections[queryset.db]
+    queryset = queryset.order_by()
+    if connection.vendor == 'postgresql':
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN (FORMAT JSON) ' + sql, params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows'])
+    if not queryset.query.where:
+        # Primary-key span: two index seeks, exact unless rows were deleted
+        span = queryset.aggregate(low=Min('pk'), high=Max('pk'))
+        return span['high'] - span['low'] + 1 if span['high'] is not None else 0
+    return None
+
+
+def estimated_count(queryset):
+    """Return (count, exact): exact up to ADMIN_EXACT_COUNT_LIMIT, estimated beyond"""
+    limit = settings.ADMIN_EXACT_COUNT_LIMIT
+    bounded = queryset.order_by()[:limit + 1].count()
+    if bounded <= limit:
+        return bounded, True
+    return max(planner_estimate(queryset) or 0, limit + 1), False
+
+
+class EstimatedCountPaginator(Paginator):
+    @cached_property
+    def count(self):
+        count, self.exact = estimated_count(self.object_list)
+        return count
+
+
+def _period_end(start, kind):
+    if kind == 'year':
+        return start.replace(year=start.year + 1)
+    if kind == 'month':
+        return start.replace(year=start.year + 1, month=1) if start.month == 12 else start.replace(month=start.month + 1)
+    return start + datetime.timedelta(days=1)
+
+
+class IndexedDateQuerySet(QuerySet):
+    """Answer the admin date hierarchy with one indexed EXISTS per period"""
+
+    def datetimes(self, field_name, kind, order='ASC', tzinfo=None):
+        if kind not in ('year', 'month', 'day'):
+            return super().datetimes(field_name, kind, order, tzinfo)
+        bounds = self.aggregate(first=Min(field_name), last=Max(field_name))
+        if bounds['first'] is None:
+            return []
+        tz = tzinfo or timezone.get_current_timezone()
+        first = timezone.localtime(bounds['first'], tz)
+        last = timezone.localtime(bounds['last'], tz)
+
+        if kind == 'year':
+            start = datetime.datetime(first.year, 1, 1)
+            periods = last.year - first.year + 1
+        elif kind == 'month':
+            start = datetime.datetime(first.year, first.month, 1)
+            periods = (last.year - first.year) * 12 + last.month - first.month + 1
+        else:
+            start = datetime.datetime(first.year, first.month, first.day)
+            periods = (last.date() - first.date()).days + 1
+        if periods > MAX_DATE_PROBES:
+            return super().datetimes(field_name, kind, order, tzinfo)
+
+        found = []
+        for _ in range(periods):
+            end = _period_end(start, kind)
+            lower, upper = timezone.make_aware(start, tz), timezone.make_aware(end, tz)
+            if self.filter(**{f"{field_name}__gte": lower, f"{field_name}__lt": upper}).exists():
+                found.append(lower)
+            start = end
+        return found if order == 'ASC' else found[::-1]
+
+
+class KeysetChangeList(ChangeList):
+    """
+    Changelist paged by (keyset_field, pk) cursors: ``?after=<pk>`` shows the
+    rows older than that row, ``?before=<pk>`` the newer ones. Counts come
+    from ``estimated_count``.
+    """
+
+    def __init__(self, request, *args, **kwargs):
+        self.cursor = None
+        for var in (AFTER_VAR, BEFORE_VAR):
+            if request.GET.get(var, '').isdigit():
+                self.cursor = (var, int(request.GET[var]))
+        super().__init__(request, *args, **kwargs)
+
+    def get_filters_params(self, params=None):
+        params = super().get_filters_params(params)
+        params.pop(AFTER_VAR, None)
+        params.pop(BEFORE_VAR, None)
+        return params
+
+    def get_query_string(self, new_params=None, remove=None):
+        # Filter, search and ordering links always start from the first page
+        return super().get_query_string(new_params, [AFTER_VAR, BEFORE_VAR, *(remove or [])])
+
+    @property
+    def keyset_field(self):
+        return getattr(self.model_admin, 'keyset_field', None)
+
+    def use_keyset(self):
+        return bool(self.keyset_field) and ORDER_VAR not in self.params and not self.show_all
+
+    def get_results(self, request):
+        if not self.use_keyset():
+            self.keyset = False
+            super().get_results(request)
+            self.result_count_exact = getattr(self.paginator, 'exact', True)
+            return
+
+        self.keyset = True
+        self.result_count, self.result_count_exact = estimated_count(self.queryset)
+        self.full_result_count = None
+        self.show_full_result_count = False
+        self.show_admin_actions = True
+        self.can_show_all = False
+        self.multi_page = self.result_count > self.list_per_page
+        self.paginator = self.model_admin.get_paginator(request, self.queryset, self.list_per_page)
+        # The pagination tag asks the paginator for a page range; don't count twice
+        self.paginator.count = self.result_count
+
+        field = self.keyset_field
+        rows = self.queryset
+        direction = None
+        if self.cursor:
+            direction, pk = self.cursor
+            anchor = self.root_queryset.filter(pk=pk).values_list(field, flat=True).first()
+            if anchor is None:
+                direction = None
+            elif direction == AFTER_VAR:
+                rows = rows.filter(**{f"{field}__lte": anchor}).exclude(**{field: anchor, 'pk__gte': pk})
+            else:
+                rows = rows.filter(**{f"{field}__gte": anchor}).exclude(**{field: anchor, 'pk__lte': pk})
+                rows = rows.reverse()
+
+        keys = list(rows.values_list('pk', flat=True)[:self.list_per_page + 1])
+        more = len(keys) > self.list_per_page
+        keys = keys[:self.list_per_page]
+        if direction == BEFORE_VAR:
+            keys.reverse()
+
+        self.result_list = self.queryset.filter(pk__in=keys)
+        has_newer = direction == AFTER_VAR or (direction == BEFORE_VAR and more)
+        has_older = direction == BEFORE_VAR or more
+        self.first_url = self.get_query_string() if has_newer else None
+        self.newer_url = self.get_query_string({BEFORE_VAR: keys[0]}) if has_newer and keys else None
+        self.older_url = self.get_query_string({AFTER_VAR: keys[-1]}) if has_older and keys else None
+
+
+class LargeTableAdminMixin:
+    """
+    Performance mode for changelists over big tables: keyset pages on
+    ``keyset_field``, estimated counts, indexed date drilldowns and no
+    second full-table count.
+    """
+    keyset_field = 'submitted_at'
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_changelist(self, request, **kwargs):
+        return KeysetChangeList
+
+    def get_ordering(self, request):
+        # Must match the keyset: newest first, pk as the tie-breaker
+        return [f"-{self.keyset_field}", '-pk']
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        return IndexedDateQuerySet(self.model, query=queryset.query, using=queryset.db)
+
+
+class RelatedInputFilter(admin.SimpleListFilter):
+    """
+    Filter a foreign key by id or name prefix typed into a box, with
+    suggestions from the admin autocomplete endpoint, instead of listing
+    every related object in the sidebar.
+    """
+    template = 'admin/portfolioapp/input_filter.html'
+    field_name = None
+    name_field = 'name'
+
+    def lookups(self, request, model_admin):
+        return ()
+
+    def has_output(self):
+        return True
+
+    def queryset(self, request, queryset):
+        value = (self.value() or '').strip()
+        if not value:
+            return queryset
+        if value.isdigit():
+            return queryset.filter(**{f"{self.field_name}_id": int(value)})
+        return queryset.filter(**{f"{self.field_name}__{self.name_field}__istartswith": value})
+
+    def choices(self, changelist):
+        # One pseudo-choice carrying what the input form needs
+        yield {
+            'value': self.value() or '',
+            'query_parts': [
+                (key, value)
+                for key, values in changelist.filter_params.items()
+                if key not in (self.parameter_name, AFTER_VAR, BEFORE_VAR)
+                for value in values
+            ],
+            'clear_url': changelist.get_query_string(remove=[self.parameter_name]),
+            'app_label': changelist.opts.app_label,
+            'model_name': changelist.opts.model_name,
+            'field_name': self.field_name,
+        }
@@ -0,0 +1,200 @@
+"""
+Cache stampede protection for expensive reads.
+
+``get_or_compute`` wraps a cached value in an envelope recording the version it
+was computed from, how long the computation took and when it expires, and
+layers four defences against many requests recomputing the same key at once:
+
+* single flight: within a worker, one thread computes a key and concurrent
+  callers wait for its result;
+* leases: across workers, the thread that wins ``cache.add`` on the lease key
+  recomputes; the others serve the previous value or wait for the new one;
+* stale-while-revalidate: entries outlive their expiry by
+  ``CACHE_STALE_TIMEOUT`` seconds and are served while a refresh is running;
+* probabilistic early expiry (XFetch): each read recomputes slightly before
+  expiry with a probability that grows as expiry approaches and with the cost
+  of the computation, so refreshes spread out instead of coinciding.
+"""
+import math
+import random
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+HIT = 'hit'
+MISS = 'miss'
+STALE = 'stale'
+COALESCED = 'coalesced'
+
+_MISSING = object()
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Run one call per key at a time; concurrent callers share its result"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def running(self, key):
+        return key in self._calls
+
+    def do(self, key, func):
+        """Return (result, leader) where ``leader`` is True for the caller that ran ``func``"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, False
+
+        try:
+            call.result = func()
+            return call.result, True
+        except Exception as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+_flight = SingleFlight()
+
+
+def lease_key(key):
+    return f"lease:{key}"
+
+
+def acquire_lease(key):
+    """Return a token if this caller may recompute ``key``, else None"""
+    token = uuid.uuid4().hex
+    if cache.add(lease_key(key), token, settings.CACHE_LEASE_TIMEOUT):
+        return token
+    return None
+
+
+def release_lease(key, token):
+    if cache.get(lease_key(key)) == token:
+        cache.delete(lease_key(key))
+
+
+def is_envelope(entry):
+    return isinstance(entry, dict) and 'stale_until' in entry
+
+
+def is_fresh(entry, version=None, now=None):
+    """True while ``entry`` matches ``version`` and has not (probabilistically) expired"""
+    if not is_envelope(entry) or entry['version'] != version:
+        return False
+    now = now or time.time()
+    # XFetch: -log(u) is exponentially distributed, so an entry that took
+    # ``delta`` seconds to compute is refreshed on average delta * beta early.
+    early = entry['delta'] * settings.CACHE_EARLY_EXPIRY_BETA * -math.log(1.0 - random.random())
+    return now + early < entry['expires']
+
+
+def is_servable(entry, now=None):
+    """True while a possibly stale ``entry`` may still be served during a refresh"""
+    return is_envelope(entry) and (now or time.time()) < entry['stale_until']
+
+
+def envelope(value, timeout, version=None, delta=0.0):
+    now = time.time()
+    return {
+        'value': value,
+        'version': version,
+        'delta': delta,
+        'expires': now + timeout,
+        'stale_until': now + timeout + settings.CACHE_STALE_TIMEOUT,
+    }
+
+
+def store(key, value, timeout, version=None, delta=0.0):
+    cache.set(key, envelope(value, timeout, version, delta), timeout + settings.CACHE_STALE_TIMEOUT)
+
+
+def store_many(values, timeout, version=None):
+    """Store precomputed {key: value} entries in one round trip"""
+    cache.set_many(
+        {key: envelope(value, timeout, version) for key, value in values.items()},
+        timeout + settings.CACHE_STALE_TIMEOUT,
+    )
+
+
+def _wait_for(key, version):
+    """Poll for the entry another worker is computing; None if it never shows up"""
+    deadline = time.monotonic() + settings.CACHE_LEASE_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(0.025)
+        entry = cache.get(key)
+        if is_envelope(entry) and entry['version'] == version and time.time() < entry['expires']:
+            return entry
+        if cache.get(lease_key(key)) is None:
+            break
+    return None
+
+
+def _revalidate(key, compute, timeout, version, stale):
+    token = acquire_lease(key)
+    if token is None:
+        if stale is not None:
+            return stale['value'], STALE
+        entry = _wait_for(key, version)
+        if entry is not None:
+            return entry['value'], COALESCED
+        # The lease holder died or is too slow; compute without the lease
+
+    try:
+        started = time.perf_counter()
+        value = compute()
+        if value is not None:
+            store(key, value, timeout, version, time.perf_counter() - started)
+        return value, MISS
+    finally:
+        if token is not None:
+            release_lease(key, token)
+
+
+def get_or_compute(key, compute, timeout, version=None, entry=_MISSING):
+    """
+    Return (value, state) for ``key``, recomputing it with ``compute()`` at most
+    once at a time. ``state`` is one of HIT, MISS, STALE or COALESCED.
+
+    ``version`` tags the entry; a different version counts as expired (and may
+    still be served stale during the refresh). Pass ``entry`` when the caller
+    already read the key. ``compute`` may return None for a value that must not
+    be cached; callers then receive None and compute their own.
+    """
+    if entry is _MISSING:
+        entry = cache.get(key)
+    now = time.time()
+    if is_fresh(entry, version, now):
+        return entry['value'], HIT
+
+    stale = entry if is_servable(entry, now) else None
+    if stale is not None and _flight.running(key):
+        return stale['value'], STALE
+
+    (value, state), leader = _flight.do(
+        key, lambda: _revalidate(key, compute, timeout, version, stale)
+    )
+    if not leader and state == MISS:
+        state = COALESCED
+    return value, state
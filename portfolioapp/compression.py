@@ -0,0 +1,132 @@
+"""
+Negotiated brotli/gzip compression for API responses.
+
+``CompressionMiddleware`` picks the best encoding the client accepts
+(``Accept-Encoding`` q-values, brotli preferred on ties when the ``brotli``
+package from requirements.txt is installed) and compresses JSON, NDJSON and CSV bodies of
+at least ``COMPRESSION_MIN_SIZE`` bytes. Bodies are compressed only once:
+response-cache entries carry their encoded variants (see ``cache.py``), and
+other responses with an ETag (the homepage bundle) go through a small
+per-process LRU keyed by ETag and encoding. HTML is left alone so pages
+carrying CSRF tokens are not exposed to BREACH-style attacks.
+"""
+import gzip
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_sequence
+
+try:
+    import brotli
+except ImportError:  # gzip only where Brotli is not installed
+    brotli = None
+
+COMPRESSIBLE_TYPES = ('application/json', 'application/x-ndjson', 'text/csv')
+
+# Compressed bodies of ETagged responses outside the response cache
+LRU_SIZE = 256
+
+_lru = OrderedDict()
+_lru_lock = threading.Lock()
+
+
+def available():
+    """Supported encodings, most preferred first"""
+    return ('br', 'gzip') if brotli else ('gzip',)
+
+
+def negotiate(accept_encoding, encodings=None):
+    """Return the best encoding allowed by an Accept-Encoding header, or None"""
+    accepted = {}
+    for part in accept_encoding.split(','):
+        name, _, params = part.partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip().replace(' ', '')
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in encodings or available():
+        quality = accepted.get(encoding, accepted.get('*', 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(body, encoding):
+    if encoding == 'br':
+        return brotli.compress(body, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=settings.COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+def encode_all(body):
+    """{encoding: compressed body} for every supported encoding, or {} for small bodies"""
+    if len(body) < settings.COMPRESSION_MIN_SIZE:
+        return {}
+    return {encoding: compress(body, encoding) for encoding in available()}
+
+
+def is_compressible(response):
+    content_type = response.get('Content-Type', '').split(';')[0].strip()
+    return content_type in COMPRESSIBLE_TYPES and not response.has_header('Content-Encoding')
+
+
+def _encoded_body(response, encoding):
+    variants = getattr(response, 'precompressed', None)
+    if variants and encoding in variants:
+        return variants[encoding]
+
+    etag = response.get('ETag')
+    if not etag:
+        return compress(response.content, encoding)
+    key = (etag, encoding)
+    with _lru_lock:
+        if key in _lru:
+            _lru.move_to_end(key)
+            return _lru[key]
+    body = compress(response.content, encoding)
+    with _lru_lock:
+        _lru[key] = body
+        while len(_lru) > LRU_SIZE:
+            _lru.popitem(last=False)
+    return body
+
+
+def compress_response(request, response):
+    if not is_compressible(response):
+        return response
+    patch_vary_headers(response, ('Accept-Encoding',))
+    accept_encoding = request.META.get('HTTP_ACCEPT_ENCODING', '')
+
+    if response.streaming:
+        # Streams are compressed on the fly; only gzip has a stdlib streamer
+        if negotiate(accept_encoding, ('gzip',)) is None:
+            return response
+        response.streaming_content = compress_sequence(response.streaming_content)
+        del response['Content-Length']
+        response['Content-Encoding'] = 'gzip'
+        return response
+
+    if len(response.content) < settings.COMPRESSION_MIN_SIZE:
+        return response
+    encoding = negotiate(accept_encoding)
+    if encoding is None:
+        return response
+
+    response.content = _encoded_body(response, encoding)
+    response['Content-Length'] = str(len(response.content))
+    response['Content-Encoding'] = encoding
+    # Same weakening as Django's GZipMiddleware: the bytes differ per encoding
+    etag = response.get('ETag')
+    if etag and etag.startswith('"'):
+        response['ETag'] = 'W/' + etag
+    return response
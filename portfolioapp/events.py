@@ -0,0 +1,166 @@
+"""
+Event log behind the live admin feed (``GET /api/live/``).
+
+Signal receivers ``publish`` new submissions and status changes once their
+transaction commits. Events are appended to a log in the shared cache under
+consecutive ids (``cache.incr``), so a stream served by any worker sees rows
+saved by every worker and management command. Streams poll the log every
+``LIVE_FEED_POLL_INTERVAL`` seconds: ``stream`` holds a thread (WSGI),
+``astream`` waits on the event loop (ASGI).
+
+Events stay in the log for ``EVENT_TIMEOUT`` seconds, and the last
+``HISTORY_SIZE`` are replayed to a client reconnecting with
+``Last-Event-ID``, so it misses nothing in between.
+"""
+import asyncio
+import json
+import threading
+import time
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+
+LAST_ID_KEY = 'live:last'
+# Id before the first event of the current log; nothing is missing below it
+START_ID_KEY = 'live:start'
+EVENT_TIMEOUT = 3600
+# Events replayed after a reconnect, and read per poll at most
+HISTORY_SIZE = 200
+# Seconds an id may stay missing before streams skip it: its publisher has
+# taken the id but not stored the event yet, or the entry was evicted
+GAP_TIMEOUT = 5
+
+
+def event_key(event_id):
+    return f"live:event:{event_id}"
+
+
+def _next_id():
+    for _ in range(2):
+        # Ids start from the time in ms so they keep growing if the log is lost
+        start = int(time.time() * 1000)
+        if cache.add(LAST_ID_KEY, start, None):
+            cache.set(START_ID_KEY, start, None)
+        try:
+            event_id = cache.incr(LAST_ID_KEY)
+        except ValueError:
+            # Evicted between add and incr
+            continue
+        # incr re-stores the counter with the default timeout on some backends
+        cache.touch(LAST_ID_KEY, None)
+        return event_id
+    raise RuntimeError('Could not allocate a live feed event id')
+
+
+def publish(kind, data):
+    """Append an event to the shared log (safe from any thread or process)"""
+    event_id = _next_id()
+    cache.set(event_key(event_id), (kind, json.dumps(data, cls=DjangoJSONEncoder)), EVENT_TIMEOUT)
+    return event_id
+
+
+class Reader:
+    """Reads the log forward from ``last_event_id`` (or from now)"""
+
+    def __init__(self, last_event_id=None):
+        self.last_event_id = last_event_id
+        self.cursor = None
+        self.gap_since = None
+
+    def read(self):
+        """Return the (id, kind, data) events published since the previous call"""
+        found = cache.get_many([LAST_ID_KEY, START_ID_KEY])
+        latest = found.get(LAST_ID_KEY, 0)
+        if self.cursor is None:
+            self.cursor = latest if self.last_event_id is None else min(self.last_event_id, latest)
+        elif latest < self.cursor:
+            # The log was cleared and restarted below the cursor
+            self.cursor = latest
+        self.cursor = max(self.cursor, latest - HISTORY_SIZE, found.get(START_ID_KEY, 0))
+
+        ids = range(self.cursor + 1, min(latest, self.cursor + HISTORY_SIZE) + 1)
+        found = cache.get_many([event_key(event_id) for event_id in ids])
+        now = time.monotonic()
+        skip_missing = self.gap_since is not None and now - self.gap_since >= GAP_TIMEOUT
+        events = []
+        for event_id in ids:
+            entry = found.get(event_key(event_id))
+            if entry is None and not skip_missing:
+                # Wait for a publisher that is still storing the event
+                self.gap_since = self.gap_since or now
+                return events
+            if entry is not None:
+                events.append((event_id, *entry))
+            self.cursor = event_id
+        self.gap_since = None
+        return events
+
+
+def format_event(event):
+    event_id, kind, data = event
+    return f"id: {event_id}\nevent: {kind}\ndata: {data}\n\n"
+
+
+class Feed:
+    """The chunks of one ``text/event-stream`` body, produced poll by poll"""
+
+    def __init__(self, last_event_id=None, heartbeat=15, max_age=None):
+        self.reader = Reader(last_event_id)
+        self.heartbeat = heartbeat
+        self.started = self.idle_since = time.monotonic()
+        self.max_age = max_age
+
+    def expired(self):
+        return self.max_age is not None and time.monotonic() - self.started >= self.max_age
+
+    def poll(self):
+        """The new events, or a keepalive comment once idle for ``heartbeat`` seconds"""
+        chunks = [format_event(event) for event in self.reader.read()]
+        now = time.monotonic()
+        if not chunks and now - self.idle_since >= self.heartbeat:
+            # Keeps proxies from closing the connection and notices gone clients
+            chunks.append(': keepalive\n\n')
+        if chunks:
+            self.idle_since = now
+        return chunks
+
+
+# Streams open in this process under WSGI, each holding a worker thread
+_threads = {'open': 0}
+_threads_lock = threading.Lock()
+
+
+def stream(last_event_id=None, heartbeat=15, retry=3000, poll_interval=1.0, max_age=None, max_streams=None):
+    """
+    Blocking ``text/event-stream`` body for WSGI. Beyond ``max_streams`` open
+    streams in this process the client is told to retry later; after
+    ``max_age`` seconds the stream ends and the browser reconnects.
+    """
+    with _threads_lock:
+        busy = max_streams is not None and _threads['open'] >= max_streams
+        if not busy:
+            _threads['open'] += 1
+    if busy:
+        yield f"retry: {retry * 10}\n\n"
+        return
+    try:
+        feed = Feed(last_event_id, heartbeat, max_age)
+        yield f"retry: {retry}\n\n"
+        while not feed.expired():
+            yield from feed.poll()
+            time.sleep(poll_interval)
+    finally:
+        with _threads_lock:
+            _threads['open'] -= 1
+
+
+async def astream(last_event_id=None, heartbeat=15, retry=3000, poll_interval=1.0):
+    """``text/event-stream`` body for ASGI; cache reads run in the thread pool"""
+    feed = Feed(last_event_id, heartbeat)
+    poll = sync_to_async(feed.poll, thread_sensitive=False)
+    yield f"retry: {retry}\n\n"
+    while True:
+        for chunk in await poll():
+            yield chunk
+        await asyncio.sleep(poll_interval)
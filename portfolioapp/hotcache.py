@@ -0,0 +1,106 @@
+"""
+Process-local cache for the AboutMe singleton and small reference tables.
+
+Each worker keeps the loaded objects in memory next to the shared version
+they were read at. ``HotCacheMiddleware`` reads every version with one
+``get_many`` at the start of a request, so the lookups made while handling it
+are plain dictionary reads; saves bump the shared version after commit (see
+``signals.py``) and every worker reloads on its next request. Code running
+outside a request (management commands, shells) checks the version on each
+lookup instead.
+
+The versions only reach other workers through a shared cache backend (the
+default file cache, Redis). Entries are also reloaded once they are
+``HOT_CACHE_TTL`` seconds old, which bounds how stale a worker can be when the
+cache is local memory.
+
+Cached objects are shared between threads; treat them as read-only.
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .cache import bump_version, get_version, version_key
+from .models import AboutMe, SocialLink
+
+
+def _load_about_me():
+    return AboutMe.objects.first()
+
+
+def _load_social_links():
+    return list(SocialLink.objects.filter(is_active=True).order_by('order', 'platform'))
+
+
+LOADERS = {
+    'about_me': _load_about_me,
+    'social_links': _load_social_links,
+}
+
+# Models whose changes invalidate each entry
+DEPENDENCIES = {
+    'about_me': AboutMe,
+    'social_links': SocialLink,
+}
+
+_entries = {}
+_local = threading.local()
+
+
+def version_name(name):
+    return f"hot:{name}"
+
+
+def names_for_model(model):
+    return [name for name, dependency in DEPENDENCIES.items() if dependency is model]
+
+
+def sync():
+    """Read every shared version in one round trip for the current request"""
+    keys = {version_key(version_name(name)): name for name in LOADERS}
+    found = cache.get_many(list(keys))
+    _local.versions = {
+        name: found[key] if key in found else get_version(version_name(name))
+        for key, name in keys.items()
+    }
+
+
+def release():
+    _local.versions = None
+
+
+def _current_version(name):
+    versions = getattr(_local, 'versions', None)
+    if versions is None:
+        return get_version(version_name(name))
+    return versions[name]
+
+
+def get(name):
+    version = _current_version(name)
+    now = time.monotonic()
+    entry = _entries.get(name)
+    if entry is not None and entry[0] == version and now < entry[2]:
+        return entry[1]
+    # Read the version before loading: a concurrent change leaves the entry
+    # tagged with the older version and it is reloaded on the next request.
+    value = LOADERS[name]()
+    _entries[name] = (version, value, now + settings.HOT_CACHE_TTL)
+    return value
+
+
+def invalidate(names):
+    """Bump the shared versions and drop this worker's copies right away"""
+    for name in names:
+        version = bump_version(version_name(name))
+        _entries.pop(name, None)
+        versions = getattr(_local, 'versions', None)
+        if versions is not None:
+            versions[name] = version
+
+
+def about_me_exists():
+    """Memory read when a row is cached; only a missing row is confirmed in the DB"""
+    return get('about_me') is not None or AboutMe.objects.exists()
@@ -0,0 +1,158 @@
+"""
+Image metadata stored next to the uploaded images, so the API can tell the
+frontend an image's size, dominant colour and a blurred placeholder without
+anyone opening the file at request time.
+
+Each image field ``<name>`` has a JSON column ``<name>_meta``::
+
+    {"width": 1600, "height": 900, "color": "#3a5f8c",
+     "placeholder": "data:image/webp;base64,..."}
+
+or null when there is no image or it cannot be read. It is computed when an
+image is uploaded (pre_save, see signals.py) and by ``manage.py
+backfill_image_meta`` for existing rows.
+
+Pillow is imported on first use: JSON-only workers never load it.
+"""
+import base64
+import io
+import logging
+from collections import Counter
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+
+from .models import Project, Testimonial
+
+logger = logging.getLogger(__name__)
+
+IMAGE_FIELDS = {
+    Project: ('image', 'thumbnail'),
+    Testimonial: ('client_image',),
+}
+
+# EXIF orientations that swap width and height once applied
+ROTATED_ORIENTATIONS = (5, 6, 7, 8)
+EXIF_ORIENTATION = 0x0112
+
+
+def meta_field(name):
+    return f"{name}_meta"
+
+
+def _placeholder(small):
+    """Data URI of the tiny image (WebP when Pillow has it, else PNG)"""
+    from PIL import features
+
+    buffer = io.BytesIO()
+    if features.check('webp'):
+        small.save(buffer, 'WEBP', quality=40, method=6)
+        mime = 'image/webp'
+    else:
+        small.save(buffer, 'PNG', optimize=True)
+        mime = 'image/png'
+    return f"data:{mime};base64,{base64.b64encode(buffer.getvalue()).decode('ascii')}"
+
+
+def _dominant_color(small):
+    """Average of the most common colour bucket (4 bits per channel), ignoring transparent pixels"""
+    if small.mode == 'RGBA':
+        pixels = [pixel[:3] for pixel in small.getdata() if pixel[3] >= 128]
+    else:
+        pixels = list(small.getdata())
+    if not pixels:
+        return None
+    buckets = Counter((r >> 4, g >> 4, b >> 4) for r, g, b in pixels)
+    bucket = buckets.most_common(1)[0][0]
+    members = [pixel for pixel in pixels if (pixel[0] >> 4, pixel[1] >> 4, pixel[2] >> 4) == bucket]
+    return '#' + ''.join(f"{sum(channel) // len(members):02x}" for channel in zip(*members))
+
+
+def describe(file):
+    """Metadata of an open image file, or None if it is not a readable image"""
+    from PIL import Image
+
+    size = settings.IMAGE_PLACEHOLDER_SIZE
+    try:
+        with Image.open(file) as image:
+            width, height = image.size
+            orientation = image.getexif().get(EXIF_ORIENTATION, 1)
+            transparent = image.mode in ('RGBA', 'LA', 'PA') or 'transparency' in image.info
+            mode = 'RGBA' if transparent else 'RGB'
+            if image.mode in ('1', 'P', 'PA'):
+                # Palette images resize with nearest neighbour only
+                image = image.convert(mode)
+            # thumbnail() decodes JPEGs at a reduced scale, so this stays cheap
+            image.thumbnail((size, size))
+            small = image.convert(mode)
+    except (OSError, ValueError, SyntaxError, Image.DecompressionBombError):
+        return None
+
+    # Browsers display images upright, so report the upright size
+    if orientation in ROTATED_ORIENTATIONS:
+        width, height = height, width
+    small = _transpose(small, orientation)
+    return {
+        'width': width,
+        'height': height,
+        'color': _dominant_color(small),
+        'placeholder': _placeholder(small),
+    }
+
+
+def _transpose(image, orientation):
+    from PIL import Image
+
+    method = {
+        2: Image.Transpose.FLIP_LEFT_RIGHT,
+        3: Image.Transpose.ROTATE_180,
+        4: Image.Transpose.FLIP_TOP_BOTTOM,
+        5: Image.Transpose.TRANSPOSE,
+        6: Image.Transpose.ROTATE_270,
+        7: Image.Transpose.TRANSVERSE,
+        8: Image.Transpose.ROTATE_90,
+    }.get(orientation)
+    return image.transpose(method) if method is not None else image
+
+
+def describe_stored(name, storage=default_storage):
+    """Metadata of a file already in storage; None if it is missing or unreadable"""
+    try:
+        with storage.open(name, 'rb') as handle:
+            return describe(handle)
+    except OSError:
+        return None
+
+
+def describe_field(field_file):
+    """Metadata for the current value of an image field"""
+    if not field_file:
+        return None
+    if not field_file._committed:
+        # A fresh upload, still in memory or a temporary file
+        field_file.seek(0)
+        meta = describe(field_file)
+        field_file.seek(0)
+        return meta
+    return describe_stored(field_file.name, field_file.storage)
+
+
+def update_instance(instance):
+    """
+    Refresh the metadata of the instance's new or cleared images. Images
+    already described are left alone. Return the meta fields changed.
+    """
+    changed = []
+    for name in IMAGE_FIELDS[type(instance)]:
+        field_file = getattr(instance, name)
+        current = getattr(instance, meta_field(name))
+        if field_file and field_file._committed and current is not None:
+            continue
+        if not field_file and current is None:
+            continue
+        meta = describe_field(field_file)
+        if field_file and meta is None:
+            logger.warning('Could not read image %s for %s metadata', field_file.name, meta_field(name))
+        setattr(instance, meta_field(name), meta)
+        changed.append(meta_field(name))
+    return changed
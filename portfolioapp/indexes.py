@@ -0,0 +1,76 @@
+"""
+Precomputed read indexes kept in the shared cache.
+
+Skills by category: active skills are loaded in one ordered query, serialized
+in bulk and grouped in a single pass. Each index carries a version counter
+bumped after commit when a Skill changes (the project-count variant also
+depends on projects and their skills; see ``signals.py``). Until the refresh
+finishes the previous version is served (see ``coalesce.py``).
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+
+from . import coalesce
+from .cache import get_version, version_key
+from .models import Project, ProjectSkill, Skill
+
+SKILLS_BY_CATEGORY_KEY = 'index:skills-by-category'
+SKILLS_BY_CATEGORY_COUNTS_KEY = 'index:skills-by-category:counts'
+
+# Models whose changes invalidate each index key
+INDEX_DEPENDENCIES = {
+    SKILLS_BY_CATEGORY_KEY: (Skill,),
+    SKILLS_BY_CATEGORY_COUNTS_KEY: (Skill, ProjectSkill, Project),
+}
+
+
+def keys_for_model(model):
+    return [key for key, models in INDEX_DEPENDENCIES.items() if model in models]
+
+
+def category_project_counts():
+    """Distinct published projects per skill category, from one aggregate query"""
+    rows = (
+        ProjectSkill.objects
+        .filter(skill__is_active=True, project__status='published')
+        .values('skill__category')
+        .annotate(projects=Count('project', distinct=True))
+        .order_by()
+    )
+    return {row['skill__category']: row['projects'] for row in rows}
+
+
+def build_skills_by_category(with_counts=False):
+    from .serializers import SkillSerializer
+
+    skills = Skill.objects.filter(is_active=True).order_by('order', 'name')
+    data = SkillSerializer(skills, many=True).data
+
+    # Categories keep the order in which they first appear
+    groups = {}
+    for item in data:
+        groups.setdefault(item['category_display'], []).append(item)
+
+    if not with_counts:
+        return groups
+    counts = category_project_counts()
+    labels = dict(Skill.CATEGORY_CHOICES)
+    codes = {label: code for code, label in labels.items()}
+    return {
+        label: {'skills': items, 'project_count': counts.get(codes.get(label), 0)}
+        for label, items in groups.items()
+    }
+
+
+def skills_by_category(with_counts=False):
+    key = SKILLS_BY_CATEGORY_COUNTS_KEY if with_counts else SKILLS_BY_CATEGORY_KEY
+    found = cache.get_many([version_key(key), key])
+    version = found.get(version_key(key))
+    if version is None:
+        version = get_version(key)
+    groups, _ = coalesce.get_or_compute(
+        key, lambda: build_skills_by_category(with_counts), settings.INDEX_CACHE_TIMEOUT,
+        version=version, entry=found.get(key),
+    )
+    return groups
@@ -0,0 +1,49 @@
+"""
+Dispatch GET requests to the API views in-process, without going over HTTP.
+
+Used to pre-render public endpoints (snapshots, warm-up) and to serve batched
+sub-requests. Requests are built for ``settings.PUBLIC_API_URL`` so absolute
+URLs (pagination links, media files) match what real clients see.
+"""
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.http import Http404, JsonResponse
+from django.urls import Resolver404, resolve
+
+
+def public_origin():
+    """Return (is_secure, host) for the configured public API URL"""
+    parts = urlsplit(settings.PUBLIC_API_URL)
+    return parts.scheme == 'https', parts.netloc
+
+
+def build_get_request(path, params=None, meta=None):
+    # django.test pulls in the test client; keep it out of worker boot
+    from django.test import RequestFactory
+
+    secure, host = public_origin()
+    extra = {'HTTP_HOST': host, 'HTTP_ACCEPT': 'application/json'}
+    extra.update(meta or {})
+    return RequestFactory().get(path, data=params or {}, secure=secure, **extra)
+
+
+def internal_get(path, params=None, meta=None):
+    """Run the view for ``path`` and return its rendered response"""
+    return dispatch(build_get_request(path, params, meta))
+
+
+def dispatch(request):
+    """Resolve and run ``request`` without middleware; return the rendered response"""
+    try:
+        match = resolve(request.path_info)
+    except Resolver404:
+        return JsonResponse({'detail': 'Not found.'}, status=404)
+    request.resolver_match = match
+    try:
+        response = match.func(request, *match.args, **match.kwargs)
+    except Http404:
+        return JsonResponse({'detail': 'Not found.'}, status=404)
+    if hasattr(response, 'render') and callable(response.render):
+        response.render()
+    return response
@@ -0,0 +1,60 @@
+"""
+Move closed submissions past the retention period to gzipped NDJSON archive files.
+
+Run it periodically (e.g. nightly from cron). Archived rows stay searchable
+in the admin (Archived Submissions) and can be put back with
+restore_submissions.
+
+Examples:
+    python manage.py archive_submissions --dry-run
+    python manage.py archive_submissions
+    python manage.py archive_submissions --model contact-messages --days 90 --limit 50000
+"""
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from portfolioapp import archive
+from portfolioapp.models import ServiceRequest, ContactMessage
+
+MODELS = {
+    'service-requests': ServiceRequest,
+    'contact-messages': ContactMessage,
+}
+
+
+class Command(BaseCommand):
+    help = 'Archive closed submissions older than SUBMISSION_RETENTION_DAYS'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--model', choices=MODELS, action='append',
+                            help='Only this table (repeatable, default: both)')
+        parser.add_argument('--days', type=int, default=None,
+                            help='Retention in days (default: SUBMISSION_RETENTION_DAYS)')
+        parser.add_argument('--batch-size', type=int, default=None,
+                            help='Rows per archive file (default: ARCHIVE_BATCH_SIZE)')
+        parser.add_argument('--limit', type=int, default=None, help='Archive at most this many rows per table')
+        parser.add_argument('--dry-run', action='store_true', help='Only count what would be archived')
+
+    def handle(self, *args, **options):
+        days = settings.SUBMISSION_RETENTION_DAYS if options['days'] is None else options['days']
+        if days < 1:
+            raise CommandError('The retention must be at least 1 day')
+        before = archive.cutoff(days)
+
+        for name in options['model'] or MODELS:
+            model = MODELS[name]
+            if options['dry_run']:
+                count = archive.candidates(model, before).count()
+                self.stdout.write(f"{name}: {count} closed rows submitted before {before:%Y-%m-%d}")
+                continue
+            started = time.perf_counter()
+            moved = files = 0
+            for count in archive.archive(model, before, options['batch_size'], options['limit']):
+                moved += count
+                files += 1 if count else 0
+            elapsed = time.perf_counter() - started
+            self.stdout.write(self.style.SUCCESS(
+                f"{name}: archived {moved} rows to {files} files in {elapsed:.2f}s"
+            ))
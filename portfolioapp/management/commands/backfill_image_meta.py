@@ -0,0 +1,89 @@
+"""
+Compute the image metadata (size, dominant colour, placeholder) of project and
+testimonial images uploaded before it existed, or set outside of save()
+(bulk imports, direct updates). New uploads are described automatically.
+
+Examples:
+    python manage.py backfill_image_meta
+    python manage.py backfill_image_meta --all      # recompute every image
+"""
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Q
+
+from portfolioapp import imagemeta, signals
+
+
+class Command(BaseCommand):
+    help = 'Store width, height, colour and placeholder for existing images'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true',
+                            help='Recompute images that already have metadata')
+        parser.add_argument('--batch-size', type=int, default=200, help='Rows per transaction')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1')
+        started = time.perf_counter()
+        changed_models = set()
+        for model, names in imagemeta.IMAGE_FIELDS.items():
+            described, unreadable = self.backfill(model, names, options['all'], options['batch_size'])
+            if described or unreadable:
+                changed_models.add(model)
+            self.stdout.write(
+                f"{model._meta.verbose_name_plural}: {described} images described, {unreadable} missing or unreadable"
+            )
+
+        if changed_models:
+            with transaction.atomic():
+                for model in changed_models:
+                    signals.schedule_content_refresh(model)
+            if settings.API_SNAPSHOT_AUTO:
+                from portfolioapp import snapshots
+                snapshots.export_all()
+        self.stdout.write(self.style.SUCCESS(f"Done in {time.perf_counter() - started:.2f}s"))
+
+    def backfill(self, model, names, recompute, batch_size):
+        meta_fields = [imagemeta.meta_field(name) for name in names]
+        pending = Q()
+        for name, meta in zip(names, meta_fields):
+            condition = Q(**{f"{name}__gt": ''})
+            if not recompute:
+                condition &= Q(**{f"{meta}__isnull": True})
+            pending |= condition
+        queryset = model.objects.filter(pending).only('pk', *names, *meta_fields).order_by('pk')
+
+        described = unreadable = 0
+        last_pk = 0
+        while True:
+            batch = list(queryset.filter(pk__gt=last_pk)[:batch_size])
+            if not batch:
+                break
+            last_pk = batch[-1].pk
+            updates = []
+            for obj in batch:
+                changed = False
+                for name, meta_name in zip(names, meta_fields):
+                    field_file = getattr(obj, name)
+                    if not field_file or (getattr(obj, meta_name) is not None and not recompute):
+                        continue
+                    meta = imagemeta.describe_stored(field_file.name, field_file.storage)
+                    if meta is None:
+                        unreadable += 1
+                        self.stderr.write(f"  {model.__name__} {obj.pk} {name}: cannot read {field_file.name}")
+                    else:
+                        described += 1
+                    if meta != getattr(obj, meta_name):
+                        setattr(obj, meta_name, meta)
+                        changed = True
+                if changed:
+                    updates.append(obj)
+            if updates:
+                # bulk_update skips save() and signals, and leaves updated_at alone
+                with transaction.atomic():
+                    model.objects.bulk_update(updates, meta_fields)
+        return described, unreadable
@@ -0,0 +1,40 @@
+"""
+Pre-render the public API into static, precompressed JSON files.
+
+Examples:
+    python manage.py export_api_snapshot
+    python manage.py export_api_snapshot --output /var/www/api-snapshot
+    python manage.py export_api_snapshot --group projects --group skills
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from portfolioapp import snapshots
+
+
+class Command(BaseCommand):
+    help = 'Export every public GET endpoint as static precompressed JSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default=None,
+                            help='Target directory (default: settings.API_SNAPSHOT_ROOT)')
+        parser.add_argument('--group', action='append', choices=snapshots.GROUPS,
+                            help='Only re-render these route groups (repeatable)')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        if options['group']:
+            writer = snapshots.SnapshotWriter(options['output'])
+            for group in options['group']:
+                writer.render_group(group)
+            writer.save_manifest()
+        else:
+            writer = snapshots.export_all(options['output'])
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Snapshot written to {writer.root}: {len(writer.entries)} routes, "
+            f"{writer.written} files updated, {writer.unchanged} unchanged "
+            f"in {elapsed:.2f}s"
+        ))
@@ -0,0 +1,43 @@
+"""
+Export the portfolio content (skills, projects, testimonials, social links,
+about me) and its uploaded files to one zip archive for import_content.
+
+Examples:
+    python manage.py export_content content.zip
+    python manage.py export_content skills.zip --group skills --no-media
+"""
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from portfolioapp import transfer
+
+
+class Command(BaseCommand):
+    help = 'Export portfolio content and media to an archive'
+
+    def add_arguments(self, parser):
+        parser.add_argument('output', help='Archive path to write')
+        parser.add_argument('--group', choices=transfer.GROUP_NAMES, action='append',
+                            help='Only this group (repeatable, default: all)')
+        parser.add_argument('--no-media', action='store_true', help='Leave the uploaded files out')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        try:
+            manifest = transfer.export(options['output'], options['group'], media=not options['no_media'])
+        except transfer.TransferError as e:
+            if os.path.exists(options['output']):
+                os.remove(options['output'])
+            raise CommandError(str(e))
+        elapsed = time.perf_counter() - started
+
+        for name, count in manifest['counts'].items():
+            self.stdout.write(f"{name}: {count} rows")
+        for name in manifest['missing_media']:
+            self.stderr.write(f"Missing media file, not included: {name}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Exported {sum(manifest['counts'].values())} rows and {len(manifest['media'])} media files "
+            f"to {options['output']} in {elapsed:.2f}s"
+        ))
@@ -0,0 +1,60 @@
+"""
+Import an archive written by export_content.
+
+Rows are matched on their natural key (skill and project name, testimonial
+client name and creation time, social link platform and URL): new rows are created,
+changed ones updated, nothing is deleted. Media files already in storage are
+kept. Running the same import twice changes nothing the second time.
+
+Examples:
+    python manage.py import_content content.zip
+    python manage.py import_content content.zip --group projects --group project-skills
+"""
+import time
+import zipfile
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from portfolioapp import transfer
+
+
+class Command(BaseCommand):
+    help = 'Import portfolio content and media from an export_content archive'
+
+    def add_arguments(self, parser):
+        parser.add_argument('archive', help='Archive written by export_content')
+        parser.add_argument('--group', choices=transfer.GROUP_NAMES, action='append',
+                            help='Only this group (repeatable, default: all in the archive)')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows per transaction')
+        parser.add_argument('--no-media', action='store_true', help='Skip the uploaded files')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1')
+        importer = transfer.Importer(options['archive'], options['batch_size'], media=not options['no_media'])
+        started = time.perf_counter()
+        try:
+            stats = importer.run(options['group'])
+        except transfer.TransferError as e:
+            raise CommandError(str(e))
+        except zipfile.BadZipFile:
+            raise CommandError(f"Not a zip archive: {options['archive']}")
+        except FileNotFoundError:
+            raise CommandError(f"No such archive: {options['archive']}")
+        elapsed = time.perf_counter() - started
+
+        for name, counts in stats.items():
+            self.stdout.write(
+                f"{name}: {counts['created']} created, {counts['updated']} updated, "
+                f"{counts['unchanged']} unchanged"
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {sum(sum(counts.values()) for counts in stats.values())} rows "
+            f"and {importer.media_written} media files in {elapsed:.2f}s"
+        ))
+        if settings.LOCAL_CACHE:
+            self.stderr.write(self.style.WARNING(
+                'The cache is private to this process, so running servers keep their cached '
+                f"content for up to {settings.LOCAL_CACHE_TTL}s; restart them to serve the import now."
+            ))
@@ -0,0 +1,97 @@
+"""
+Measure worker cold-start cost with ``python -X importtime``.
+
+Boots Django in a fresh interpreter exactly like a worker does (settings,
+app registry, URLconf), then reports the slowest imports, the total import
+time per top-level package and the peak RSS of the child process.
+
+Examples:
+    python manage.py profile_imports
+    python manage.py profile_imports --settings config.settings_api --budget 400
+"""
+import os
+import re
+import resource
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+BOOT_SCRIPT = (
+    'import django; django.setup(); '
+    'from django.urls import get_resolver; get_resolver().url_patterns'
+)
+
+IMPORT_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)$')
+
+# Heavy optional pieces that public JSON workers should not load at boot
+WATCHED_MODULES = (
+    'PIL', 'smtplib', 'ssl', 'django.contrib.admin', 'django.contrib.sessions',
+    'django.contrib.messages', 'django_filters', 'rest_framework.renderers',
+)
+
+
+def parse_importtime(output):
+    """Return (module, self_us, cumulative_us, depth) tuples from -X importtime output"""
+    rows = []
+    for line in output.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append((module, int(self_us), int(cumulative_us), len(indent) // 2))
+    return rows
+
+
+class Command(BaseCommand):
+    help = 'Profile import time and memory of a cold worker boot'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=20,
+                            help='Number of slowest imports to list (default: 20)')
+        parser.add_argument('--budget', type=float, default=None,
+                            help='Fail if total import time exceeds this many milliseconds')
+
+    def handle(self, *args, **options):
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=settings.SETTINGS_MODULE)
+        before = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', BOOT_SCRIPT],
+            env=env, capture_output=True, text=True,
+        )
+        if result.returncode != 0:
+            raise CommandError(f"Worker boot failed:\n{result.stderr[-2000:]}")
+        peak_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+
+        rows = parse_importtime(result.stderr)
+        top_level = [row for row in rows if row[3] == 0]
+        total_ms = sum(row[2] for row in top_level) / 1000
+
+        packages = defaultdict(int)
+        for module, self_us, _, _ in rows:
+            packages[module.split('.')[0]] += self_us
+
+        self.stdout.write(f"Settings: {settings.SETTINGS_MODULE}")
+        self.stdout.write(f"Modules imported: {len(rows)}")
+        self.stdout.write(f"Total import time: {total_ms:.1f} ms")
+        if peak_rss > before:
+            # ru_maxrss is reported in kilobytes on Linux
+            self.stdout.write(f"Peak RSS: {peak_rss / 1024:.1f} MB")
+
+        self.stdout.write("\nSlowest imports (cumulative):")
+        for module, _, cumulative_us, _ in sorted(top_level, key=lambda r: -r[2])[:options['top']]:
+            self.stdout.write(f"  {cumulative_us / 1000:>8.1f} ms  {module}")
+
+        self.stdout.write("\nBy package (self time):")
+        for package, self_us in sorted(packages.items(), key=lambda i: -i[1])[:options['top']]:
+            self.stdout.write(f"  {self_us / 1000:>8.1f} ms  {package}")
+
+        imported = {row[0] for row in rows}
+        loaded = [name for name in WATCHED_MODULES if name in imported]
+        self.stdout.write(f"\nHeavy optional modules loaded at boot: {', '.join(loaded) or 'none'}")
+
+        budget = options['budget']
+        if budget is not None and total_ms > budget:
+            raise CommandError(f"Import time {total_ms:.1f} ms exceeds budget of {budget:.1f} ms")
@@ -0,0 +1,59 @@
+"""
+Recompute the denormalized Project aggregates and report drift.
+
+Examples:
+    python manage.py rebuild_project_aggregates --check
+    python manage.py rebuild_project_aggregates
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from portfolioapp import aggregates
+from portfolioapp.models import Project
+
+
+class Command(BaseCommand):
+    help = 'Rebuild skill_names, active_testimonial_count and average_rating on projects'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true',
+                            help='Only report drift; exit with an error if any is found')
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--show', type=int, default=20,
+                            help='Number of drifted values to print (default: 20)')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        queryset = Project.objects.only('pk', *aggregates.AGGREGATE_FIELDS).order_by('pk')
+        checked = drifted = shown = 0
+        drifted_projects = set()
+
+        last_pk = 0
+        while True:
+            batch = list(queryset.filter(pk__gt=last_pk)[:batch_size])
+            if not batch:
+                break
+            last_pk = batch[-1].pk
+            checked += len(batch)
+
+            stale = set()
+            for project, field, stored, expected in aggregates.find_drift(batch):
+                drifted += 1
+                stale.add(project.pk)
+                if shown < options['show']:
+                    shown += 1
+                    self.stdout.write(f"  project {project.pk} {field}: stored={stored!r} expected={expected!r}")
+            drifted_projects |= stale
+
+            if stale and not options['check']:
+                with transaction.atomic():
+                    aggregates.refresh_projects(stale)
+
+        summary = (f"Checked {checked} projects: {drifted} stale values "
+                   f"on {len(drifted_projects)} projects")
+        if options['check']:
+            if drifted:
+                raise CommandError(summary)
+            self.stdout.write(self.style.SUCCESS(summary))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"{summary}, all rebuilt"))
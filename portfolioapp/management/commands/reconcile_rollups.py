@@ -0,0 +1,62 @@
+"""
+Recompute the daily submission rollups from the raw tables and fix drift.
+
+Run it periodically (e.g. nightly from cron) for the recent days, and with
+--all after bulk imports or manual SQL.
+
+Examples:
+    python manage.py reconcile_rollups                # the last 7 days
+    python manage.py reconcile_rollups --days 90 --check
+    python manage.py reconcile_rollups --all
+"""
+import datetime
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from portfolioapp import rollups
+from portfolioapp.models import ServiceRequest, ContactMessage
+
+MODELS = {
+    'service-requests': ServiceRequest,
+    'contact-messages': ContactMessage,
+}
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the daily submission rollups used by the admin dashboard'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--model', choices=MODELS, action='append',
+                            help='Only this table (repeatable, default: both)')
+        parser.add_argument('--days', type=int, default=7,
+                            help='Reconcile submissions from the last N days (default: 7)')
+        parser.add_argument('--all', action='store_true', help='Reconcile every day')
+        parser.add_argument('--check', action='store_true',
+                            help='Only report drift; exit with an error if any is found')
+
+    def handle(self, *args, **options):
+        if options['days'] < 1:
+            raise CommandError('--days must be at least 1')
+        start = None
+        if not options['all']:
+            start = timezone.localdate() - datetime.timedelta(days=options['days'] - 1)
+
+        drifted = 0
+        for name in options['model'] or MODELS:
+            model = MODELS[name]
+            started = time.perf_counter()
+            if options['check']:
+                wrong = rollups.find_drift(model, start)
+            else:
+                wrong = rollups.reconcile(model, start)
+            drifted += wrong
+            elapsed = time.perf_counter() - started
+            self.stdout.write(f"{name}: {wrong} rollup counts {'stale' if options['check'] else 'fixed'} "
+                              f"({elapsed:.2f}s)")
+
+        scope = 'all days' if options['all'] else f"the last {options['days']} days"
+        if options['check'] and drifted:
+            raise CommandError(f"Rollups for {scope} have drifted ({drifted} rows)")
+        self.stdout.write(self.style.SUCCESS(f"Rollups for {scope} are up to date"))
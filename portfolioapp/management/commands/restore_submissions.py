@@ -0,0 +1,63 @@
+"""
+Put archived submissions back into the live tables.
+
+Examples:
+    python manage.py restore_submissions --email client@example.com
+    python manage.py restore_submissions service-requests --id 1042 --id 1043
+    python manage.py restore_submissions --batch 12
+    python manage.py restore_submissions contact-messages --since 2024-01-01 --until 2024-01-31
+"""
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from portfolioapp import archive
+from portfolioapp.models import ServiceRequest, ContactMessage, ArchivedSubmission
+
+MODELS = {
+    'service-requests': ServiceRequest,
+    'contact-messages': ContactMessage,
+}
+
+
+def _day_start(value):
+    day = parse_date(value)
+    if day is None:
+        raise CommandError(f"Invalid date: {value} (expected YYYY-MM-DD)")
+    return timezone.make_aware(datetime.datetime.combine(day, datetime.time.min))
+
+
+class Command(BaseCommand):
+    help = 'Restore archived service requests or contact messages'
+
+    def add_arguments(self, parser):
+        parser.add_argument('model', nargs='?', choices=MODELS)
+        parser.add_argument('--id', type=int, action='append', help='Original id (repeatable, needs a model)')
+        parser.add_argument('--email', help='Every archived submission from this address')
+        parser.add_argument('--batch', type=int, help='Every submission of this archive batch')
+        parser.add_argument('--since', help='Submitted on or after this date (YYYY-MM-DD)')
+        parser.add_argument('--until', help='Submitted on or before this date (YYYY-MM-DD)')
+
+    def handle(self, *args, **options):
+        if not any(options[name] for name in ('model', 'id', 'email', 'batch', 'since', 'until')):
+            raise CommandError('Select what to restore (a model, --id, --email, --batch, --since or --until)')
+        entries = ArchivedSubmission.objects.all()
+        if options['model']:
+            entries = entries.filter(kind=MODELS[options['model']]._meta.model_name)
+        if options['id']:
+            if not options['model']:
+                raise CommandError('--id needs a model (service-requests or contact-messages)')
+            entries = entries.filter(original_id__in=options['id'])
+        if options['email']:
+            entries = entries.filter(email__iexact=options['email'])
+        if options['batch']:
+            entries = entries.filter(batch_id=options['batch'])
+        if options['since']:
+            entries = entries.filter(submitted_at__gte=_day_start(options['since']))
+        if options['until']:
+            entries = entries.filter(submitted_at__lt=_day_start(options['until']) + datetime.timedelta(days=1))
+
+        restored = archive.restore(entries)
+        self.stdout.write(self.style.SUCCESS(f"Restored {restored} submissions"))
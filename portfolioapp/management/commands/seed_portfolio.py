@@ -0,0 +1,391 @@
+"""
+Generate synthetic portfolio data for load testing and benchmarks.
+
+Submissions (service requests and contact messages) are generated in chunks
+of ``--batch-size`` rows, each chunk in its own transaction, so memory stays
+constant no matter how many rows are requested. Every chunk draws from its own
+RNG derived from ``--seed``, which keeps the output identical whether the
+chunks run in one process or are spread across ``--workers`` processes.
+
+Examples:
+    python manage.py seed_portfolio --skills 500 --projects 2000 --seed 42
+    python manage.py seed_portfolio --service-requests 5000000 --workers 4
+"""
+import multiprocessing
+import random
+import time
+from datetime import datetime, time as dt_time, timedelta
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+from django.utils import timezone
+
+from portfolioapp import aggregates, rollups
+from portfolioapp.transfer import explicit_timestamps
+from portfolioapp.models import (
+    ServiceRequest, ContactMessage, Project, Skill, ProjectSkill,
+    Testimonial, SocialLink, AboutMe
+)
+
+
+WORDS = (
+    'api', 'app', 'build', 'cloud', 'dashboard', 'data', 'design', 'deploy',
+    'engine', 'fast', 'flow', 'graph', 'hub', 'layer', 'mobile', 'modern',
+    'native', 'open', 'platform', 'portal', 'pulse', 'query', 'react', 'scale',
+    'secure', 'service', 'smart', 'stack', 'stream', 'studio', 'sync', 'web',
+)
+
+FIRST_NAMES = (
+    'Amina', 'Baraka', 'Chen', 'Diego', 'Elif', 'Fatma', 'Grace', 'Hassan',
+    'Ines', 'Juma', 'Kofi', 'Lina', 'Mateo', 'Neema', 'Omar', 'Priya',
+)
+
+LAST_NAMES = (
+    'Abdallah', 'Banda', 'Costa', 'Dube', 'Evans', 'Fischer', 'Garcia',
+    'Haji', 'Ito', 'Juma', 'Kim', 'Lopez', 'Mwita', 'Novak', 'Okafor', 'Patel',
+)
+
+SKILL_NAMES = (
+    'Python', 'Django', 'React', 'TypeScript', 'PostgreSQL', 'Docker',
+    'Kubernetes', 'Flutter', 'Swift', 'Kotlin', 'Figma', 'Redis', 'GraphQL',
+    'Node.js', 'Tailwind', 'AWS', 'Linux', 'Go', 'Rust', 'Vue',
+)
+
+
+def _choices(field_choices):
+    return [value for value, _ in field_choices]
+
+
+def _sentence(rng, words=12):
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize() + '.'
+
+
+def _person(rng):
+    first = rng.choice(FIRST_NAMES)
+    last = rng.choice(LAST_NAMES)
+    email = f"{first}.{last}{rng.randint(1, 99999)}@example.com".lower()
+    return f"{first} {last}", email
+
+
+def _timestamp(rng, end, days):
+    return end - timedelta(seconds=rng.randint(0, days * 86400))
+
+
+def _chunk_rng(seed, label, index):
+    # String seeds are hashed deterministically (independent of PYTHONHASHSEED)
+    return random.Random(f"{seed}:{label}:{index}")
+
+
+def generate_service_requests(rng, count, end, days):
+    service_types = _choices(ServiceRequest.SERVICE_TYPES)
+    timelines = _choices(ServiceRequest.TIMELINE_CHOICES)
+    budgets = _choices(ServiceRequest.BUDGET_CHOICES)
+    statuses = _choices(ServiceRequest.STATUS_CHOICES)
+    for _ in range(count):
+        full_name, email = _person(rng)
+        submitted_at = _timestamp(rng, end, days)
+        yield ServiceRequest(
+            service_type=rng.choice(service_types),
+            full_name=full_name,
+            email=email,
+            project_requirements=_sentence(rng, rng.randint(20, 80)),
+            preferred_timeline=rng.choice(timelines),
+            budget_range=rng.choice(budgets),
+            agree_to_terms=True,
+            status=rng.choices(statuses, weights=[50, 20, 15, 10, 5])[0],
+            submitted_at=submitted_at,
+            updated_at=submitted_at,
+        )
+
+
+def generate_contact_messages(rng, count, end, days):
+    statuses = _choices(ContactMessage.STATUS_CHOICES)
+    for _ in range(count):
+        full_name, email = _person(rng)
+        submitted_at = _timestamp(rng, end, days)
+        yield ContactMessage(
+            full_name=full_name,
+            email=email,
+            subject=_sentence(rng, rng.randint(3, 8)),
+            message=_sentence(rng, rng.randint(20, 120)),
+            status=rng.choices(statuses, weights=[60, 25, 15])[0],
+            submitted_at=submitted_at,
+            updated_at=submitted_at,
+        )
+
+
+# Models whose rows are generated in independent, parallelisable chunks
+CHUNKED_GENERATORS = {
+    'portfolioapp.ServiceRequest': generate_service_requests,
+    'portfolioapp.ContactMessage': generate_contact_messages,
+}
+
+
+def insert_chunk(task):
+    """Generate and insert one chunk; runs in the parent or a worker process"""
+    label, index, count, seed, end, days = task
+    model = apps.get_model(label)
+    rng = _chunk_rng(seed, label, index)
+    rows = CHUNKED_GENERATORS[label](rng, count, end, days)
+    with explicit_timestamps(model), transaction.atomic():
+        model.objects.bulk_create(rows, batch_size=count)
+    return count
+
+
+def _worker_init():
+    # Forked workers must not share the parent's database connection
+    connections.close_all()
+
+
+class Command(BaseCommand):
+    help = 'Generate deterministic synthetic portfolio data for load testing'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--service-requests', type=int, default=0)
+        parser.add_argument('--contact-messages', type=int, default=0)
+        parser.add_argument('--projects', type=int, default=0)
+        parser.add_argument('--skills', type=int, default=0)
+        parser.add_argument('--skills-per-project', type=int, default=5)
+        parser.add_argument('--testimonials', type=int, default=0)
+        parser.add_argument('--social-links', type=int, default=0)
+        parser.add_argument('--about-me', action='store_true',
+                            help='Create the AboutMe singleton if it does not exist')
+        parser.add_argument('--batch-size', type=int, default=5000,
+                            help='Rows per bulk_create/transaction (default: 5000)')
+        parser.add_argument('--workers', type=int, default=1,
+                            help='Processes used for submission chunks (default: 1)')
+        parser.add_argument('--seed', type=int, default=None,
+                            help='RNG seed; the same seed and --end-date give the same data')
+        parser.add_argument('--days', type=int, default=365,
+                            help='Spread submission timestamps over this many days')
+        parser.add_argument('--end-date', default=None,
+                            help='Latest submission date, YYYY-MM-DD (default: today)')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('--batch-size must be at least 1')
+        if options['workers'] < 1:
+            raise CommandError('--workers must be at least 1')
+
+        seed = options['seed']
+        if seed is None:
+            seed = random.SystemRandom().randint(0, 2 ** 31)
+        self.stdout.write(f"Seed: {seed}")
+
+        end = self._end_of_day(options['end_date'])
+        rng = random.Random(seed)
+
+        if options['about_me']:
+            self._seed_about_me()
+        if options['skills']:
+            self._seed_skills(rng, options['skills'], batch_size)
+        if options['projects']:
+            self._seed_projects(rng, options['projects'], options['skills_per_project'], end, batch_size)
+        if options['testimonials']:
+            self._seed_testimonials(rng, options['testimonials'], end, batch_size)
+        if options['social_links']:
+            self._seed_social_links(options['social_links'])
+        if options['projects'] or options['testimonials']:
+            self._refresh_aggregates(batch_size)
+
+        for label, key in (
+            ('portfolioapp.ServiceRequest', 'service_requests'),
+            ('portfolioapp.ContactMessage', 'contact_messages'),
+        ):
+            if options[key]:
+                self._seed_chunked(label, options[key], seed, end, options['days'],
+                                   batch_size, options['workers'])
+                self._refresh_rollups(apps.get_model(label))
+
+    def _end_of_day(self, value):
+        if value is None:
+            day = timezone.localdate()
+        else:
+            try:
+                day = datetime.strptime(value, '%Y-%m-%d').date()
+            except ValueError:
+                raise CommandError('--end-date must be formatted as YYYY-MM-DD')
+        return timezone.make_aware(datetime.combine(day, dt_time.max.replace(microsecond=0)))
+
+    def _report(self, label, count, started):
+        elapsed = time.perf_counter() - started
+        rate = count / elapsed if elapsed else 0
+        self.stdout.write(self.style.SUCCESS(
+            f"{label}: {count} rows in {elapsed:.2f}s ({rate:,.0f} rows/s)"
+        ))
+
+    def _seed_chunked(self, label, total, seed, end, days, batch_size, workers):
+        started = time.perf_counter()
+        tasks = (
+            (label, index, min(batch_size, total - offset), seed, end, days)
+            for index, offset in enumerate(range(0, total, batch_size))
+        )
+        inserted = 0
+        if workers == 1:
+            for task in tasks:
+                inserted += insert_chunk(task)
+        else:
+            connections.close_all()
+            context = multiprocessing.get_context('fork')
+            with context.Pool(workers, initializer=_worker_init) as pool:
+                for count in pool.imap_unordered(insert_chunk, tasks):
+                    inserted += count
+        self._report(label.split('.')[-1], inserted, started)
+
+    def _seed_about_me(self):
+        # AboutMe is a singleton; never create a second row
+        if AboutMe.objects.exists():
+            self.stdout.write('AboutMe: already exists, skipped')
+            return
+        AboutMe.objects.create(
+            bio='Synthetic profile generated by seed_portfolio.',
+            detailed_bio='Generated for load testing.',
+            years_of_experience=5,
+            email='seed@example.com',
+            location='Dar es Salaam',
+        )
+        self.stdout.write(self.style.SUCCESS('AboutMe: created'))
+
+    def _seed_skills(self, rng, count, batch_size):
+        started = time.perf_counter()
+        categories = _choices(Skill.CATEGORY_CHOICES)
+        existing = set(Skill.objects.values_list('name', flat=True))
+
+        def skills():
+            created = 0
+            serial = 0
+            while created < count:
+                base = SKILL_NAMES[serial % len(SKILL_NAMES)]
+                round_no = serial // len(SKILL_NAMES)
+                name = base if round_no == 0 else f"{base} {round_no + 1}"
+                serial += 1
+                # Skill.name is unique: skip names that are already taken
+                if name in existing:
+                    continue
+                created += 1
+                yield Skill(
+                    name=name,
+                    category=rng.choice(categories),
+                    proficiency=rng.randint(30, 100),
+                    icon='',
+                    order=serial,
+                )
+
+        inserted = self._bulk_insert(Skill, skills(), batch_size)
+        self._report('Skill', inserted, started)
+
+    def _seed_projects(self, rng, count, skills_per_project, end, batch_size):
+        started = time.perf_counter()
+        statuses = _choices(Project.STATUS_CHOICES)
+        last_pk = Project.objects.order_by('-pk').values_list('pk', flat=True).first() or 0
+
+        def projects():
+            for i in range(count):
+                created_at = _timestamp(rng, end, 3 * 365)
+                yield Project(
+                    name=f"{rng.choice(WORDS).capitalize()} {rng.choice(WORDS).capitalize()} {i + 1}",
+                    description=_sentence(rng, 20),
+                    detailed_description=_sentence(rng, rng.randint(80, 300)),
+                    code_link=f"https://github.com/example/project-{i + 1}",
+                    demo_link=f"https://project-{i + 1}.example.com",
+                    status=rng.choices(statuses, weights=[10, 80, 10])[0],
+                    order=i,
+                    is_featured=rng.random() < 0.1,
+                    created_at=created_at,
+                    updated_at=created_at,
+                )
+
+        with explicit_timestamps(Project):
+            inserted = self._bulk_insert(Project, projects(), batch_size)
+        self._report('Project', inserted, started)
+
+        skill_ids = list(Skill.objects.order_by('pk').values_list('pk', flat=True))
+        if not skill_ids or skills_per_project < 1:
+            return
+        started = time.perf_counter()
+        per_project = min(skills_per_project, len(skill_ids))
+        project_ids = list(
+            Project.objects.filter(pk__gt=last_pk).order_by('pk').values_list('pk', flat=True)
+        )
+
+        def project_skills():
+            for project_id in project_ids:
+                # sample() never repeats a skill, honouring unique_together
+                for skill_id in rng.sample(skill_ids, per_project):
+                    yield ProjectSkill(project_id=project_id, skill_id=skill_id)
+
+        inserted = self._bulk_insert(ProjectSkill, project_skills(), batch_size)
+        self._report('ProjectSkill', inserted, started)
+
+    def _seed_testimonials(self, rng, count, end, batch_size):
+        started = time.perf_counter()
+        project_ids = list(Project.objects.order_by('pk').values_list('pk', flat=True))
+
+        def testimonials():
+            for _ in range(count):
+                full_name, _email = _person(rng)
+                created_at = _timestamp(rng, end, 3 * 365)
+                yield Testimonial(
+                    client_name=full_name,
+                    client_position=rng.choice(('CTO', 'Founder', 'Product Manager', 'Engineer')),
+                    client_company=f"{rng.choice(WORDS).capitalize()} {rng.choice(('Labs', 'Ltd', 'Inc'))}",
+                    testimonial=_sentence(rng, rng.randint(15, 60)),
+                    rating=rng.choices([3, 4, 5], weights=[10, 30, 60])[0],
+                    project_id=rng.choice(project_ids) if project_ids and rng.random() < 0.8 else None,
+                    is_featured=rng.random() < 0.2,
+                    is_active=rng.random() < 0.95,
+                    created_at=created_at,
+                )
+
+        with explicit_timestamps(Testimonial):
+            inserted = self._bulk_insert(Testimonial, testimonials(), batch_size)
+        self._report('Testimonial', inserted, started)
+
+    def _seed_social_links(self, count):
+        started = time.perf_counter()
+        platforms = _choices(SocialLink.PLATFORM_CHOICES)
+        links = (
+            SocialLink(
+                platform=platforms[i % len(platforms)],
+                url=f"https://example.com/social/{i + 1}",
+                order=i,
+            )
+            for i in range(count)
+        )
+        inserted = self._bulk_insert(SocialLink, links, count)
+        self._report('SocialLink', inserted, started)
+
+    def _refresh_aggregates(self, batch_size):
+        # bulk_create skips the signals that maintain the project aggregates
+        started = time.perf_counter()
+        project_ids = list(Project.objects.order_by('pk').values_list('pk', flat=True))
+        for offset in range(0, len(project_ids), batch_size):
+            with transaction.atomic():
+                aggregates.refresh_projects(project_ids[offset:offset + batch_size])
+        self._report('Project aggregates', len(project_ids), started)
+
+    def _refresh_rollups(self, model):
+        # Likewise for the daily submission rollups
+        started = time.perf_counter()
+        rollups.reconcile(model)
+        self._report(f"{model.__name__} rollups", model.objects.count(), started)
+
+    def _bulk_insert(self, model, rows, batch_size):
+        """Consume a row generator in fixed-size, individually committed batches"""
+        inserted = 0
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= batch_size:
+                inserted += self._flush(model, batch)
+                batch = []
+        if batch:
+            inserted += self._flush(model, batch)
+        return inserted
+
+    def _flush(self, model, batch):
+        with transaction.atomic():
+            model.objects.bulk_create(batch, batch_size=len(batch))
+        return len(batch)
@@ -0,0 +1,76 @@
+"""
+Train the spam filter's classifier from the submissions labelled in the admin
+("Label selected as spam" / "not spam") and write it to SPAM_MODEL_PATH.
+Running workers pick the new model up within a minute.
+
+Examples:
+    python manage.py train_spam_filter
+    python manage.py train_spam_filter --check     # only report accuracy
+"""
+import random
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from portfolioapp import spam
+
+# Labelled submissions read per query
+CHUNK_SIZE = 2000
+
+
+def labelled_documents():
+    for model, fields in spam.TEXT_FIELDS.items():
+        rows = (
+            model.objects.exclude(spam_label='').order_by()
+            .values_list('spam_label', 'email', *fields).iterator(chunk_size=CHUNK_SIZE)
+        )
+        for label, email, *texts in rows:
+            values = dict(zip(fields, texts))
+            yield spam.tokens(spam.text_of(model, values), email), label == 'spam'
+
+
+class Command(BaseCommand):
+    help = 'Retrain the spam classifier from admin-labelled submissions'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--min-examples', type=int, default=20,
+                            help='Labelled spam and non-spam submissions needed for each (default: 20)')
+        parser.add_argument('--holdout', type=float, default=0.2,
+                            help='Share of the examples held back to measure accuracy (default: 0.2)')
+        parser.add_argument('--check', action='store_true', help='Report accuracy without writing the model')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        documents = list(labelled_documents())
+        spam_count = sum(1 for _, is_spam in documents if is_spam)
+        ham_count = len(documents) - spam_count
+        self.stdout.write(f"{spam_count} spam and {ham_count} non-spam submissions labelled")
+        if min(spam_count, ham_count) < options['min_examples']:
+            raise CommandError(f"Label at least {options['min_examples']} of each in the admin first")
+
+        # Accuracy on a held-out sample, then the model from everything
+        random.Random(0).shuffle(documents)
+        split = int(len(documents) * options['holdout'])
+        if split:
+            model = spam.train(documents[split:])
+            results = [
+                (spam.probability(model, features) >= settings.SPAM_THRESHOLD, is_spam)
+                for features, is_spam in documents[:split]
+            ]
+            caught = sum(1 for flagged, is_spam in results if flagged and is_spam)
+            false_positives = sum(1 for flagged, is_spam in results if flagged and not is_spam)
+            held_spam = sum(1 for _, is_spam in results if is_spam)
+            self.stdout.write(
+                f"held-out {split}: caught {caught}/{held_spam} spam, "
+                f"{false_positives}/{split - held_spam} false positives"
+            )
+
+        model = spam.train(documents)
+        if options['check']:
+            return
+        spam.save_model(model)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {len(model['weights'])} tokens to {settings.SPAM_MODEL_PATH} ({elapsed:.2f}s)"
+        ))
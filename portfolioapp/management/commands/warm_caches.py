@@ -0,0 +1,38 @@
+"""
+Pre-populate the response cache, read indexes and homepage bundle.
+
+Examples:
+    python manage.py warm_caches
+    python manage.py warm_caches --pages 3 --details 200 --snapshot
+"""
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from portfolioapp import warmup
+
+
+class Command(BaseCommand):
+    help = 'Render every public route into the caches so the first visitors hit warm data'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pages', type=int, default=settings.WARMUP_PAGES,
+                            help='Pages to render per list route (default: WARMUP_PAGES)')
+        parser.add_argument('--details', type=int, default=settings.WARMUP_DETAIL_LIMIT,
+                            help='Detail routes to render per group (default: WARMUP_DETAIL_LIMIT)')
+        parser.add_argument('--snapshot', action='store_true',
+                            help='Also re-export the static API snapshot')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        report = warmup.warm(
+            force=True, pages=options['pages'], details=options['details'], snapshot=options['snapshot'],
+        )
+        responses = ', '.join(f"{count} {state}" for state, count in sorted(report['responses'].items()))
+        self.stdout.write(f"Routes: {report['routes']} ({responses})")
+        self.stdout.write(f"Related project lists: {report['related']}")
+        self.stdout.write(f"Search index keys: {report['search_keys']}")
+        if 'snapshot' in report:
+            self.stdout.write(f"Snapshot routes: {report['snapshot']}")
+        self.stdout.write(self.style.SUCCESS(f"Caches warmed in {time.perf_counter() - started:.2f}s"))
@@ -0,0 +1,56 @@
+from django.http import HttpResponseNotModified
+
+from . import cache as response_cache, compression, hotcache
+
+
+class CompressionMiddleware:
+    """Compress API responses with brotli or gzip, per Accept-Encoding"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        return compression.compress_response(request, self.get_response(request))
+
+
+class ResponseCacheMiddleware:
+    """
+    Serve repeated public GET requests from the response cache.
+    Cache hits skip URL resolution, DRF, the ORM and serialization entirely.
+    X-Cache is HIT, MISS, STALE (served during a refresh) or COALESCED
+    (rendered once by a concurrent request).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not response_cache.is_cacheable(request):
+            return self.get_response(request)
+
+        response, state = response_cache.cached_response(request, lambda: self.get_response(request))
+        response['X-Cache'] = state.upper()
+
+        etag = response.get('ETag')
+        if etag and response.status_code == 200 and etag in request.headers.get('If-None-Match', ''):
+            not_modified = HttpResponseNotModified()
+            not_modified['ETag'] = etag
+            return not_modified
+        return response
+
+
+class HotCacheMiddleware:
+    """
+    Check the shared versions of the process-local hot objects once per
+    request (one cache round trip); lookups during the request are memory reads.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        hotcache.sync()
+        try:
+            return self.get_response(request)
+        finally:
+            hotcache.release()
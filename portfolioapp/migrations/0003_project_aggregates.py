@@ -0,0 +1,54 @@
+from django.db import migrations, models
+from django.db.models import Avg, Count
+
+
+def populate_aggregates(apps, schema_editor):
+    Project = apps.get_model('portfolioapp', 'Project')
+    ProjectSkill = apps.get_model('portfolioapp', 'ProjectSkill')
+    Testimonial = apps.get_model('portfolioapp', 'Testimonial')
+
+    names = {}
+    for project_id, name in ProjectSkill.objects.order_by('pk').values_list('project_id', 'skill__name'):
+        names.setdefault(project_id, []).append(name)
+    ratings = {
+        row['project_id']: row
+        for row in Testimonial.objects.filter(is_active=True, project__isnull=False)
+        .values('project_id').annotate(total=Count('pk'), average=Avg('rating')).order_by()
+    }
+
+    projects = []
+    for project in Project.objects.only('pk'):
+        row = ratings.get(project.pk)
+        project.skill_names = names.get(project.pk, [])
+        project.active_testimonial_count = row['total'] if row else 0
+        project.average_rating = round(row['average'], 2) if row else None
+        projects.append(project)
+    Project.objects.bulk_update(
+        projects, ['skill_names', 'active_testimonial_count', 'average_rating'], batch_size=500
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolioapp', '0002_aboutme_project_skill_sociallink_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='skill_names',
+            field=models.JSONField(blank=True, default=list, editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='active_testimonial_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='average_rating',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(populate_aggregates, migrations.RunPython.noop),
+    ]
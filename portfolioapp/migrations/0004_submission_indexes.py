@@ -0,0 +1,33 @@
+# Generated by Django 5.1.3 on 2026-10-19 04:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolioapp', '0003_project_aggregates'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='contactmessage',
+            index=models.Index(fields=['submitted_at', 'id'], name='contactmessage_submitted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contactmessage',
+            index=models.Index(fields=['status', 'submitted_at'], name='contactmessage_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='servicerequest',
+            index=models.Index(fields=['submitted_at', 'id'], name='servicerequest_submitted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='servicerequest',
+            index=models.Index(fields=['status', 'submitted_at'], name='servicerequest_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='servicerequest',
+            index=models.Index(fields=['service_type', 'submitted_at'], name='servicerequest_type_idx'),
+        ),
+    ]
@@ -0,0 +1,84 @@
+# Generated by Django 5.1.3 on 2026-10-19 04:37
+
+from collections import Counter
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+BREAKDOWNS = ('service_type', 'budget_range', 'preferred_timeline')
+
+
+def populate_rollups(apps, schema_editor):
+    tz = timezone.get_current_timezone()
+    ServiceRequest = apps.get_model('portfolioapp', 'ServiceRequest')
+    ContactMessage = apps.get_model('portfolioapp', 'ContactMessage')
+    ServiceRequestDailyRollup = apps.get_model('portfolioapp', 'ServiceRequestDailyRollup')
+    ContactMessageDailyRollup = apps.get_model('portfolioapp', 'ContactMessageDailyRollup')
+
+    counts = Counter()
+    rows = (
+        ServiceRequest.objects.annotate(day=TruncDate('submitted_at', tzinfo=tz))
+        .values('day', 'status', *BREAKDOWNS).annotate(total=Count('pk')).order_by()
+    )
+    for row in rows:
+        for dimension in BREAKDOWNS:
+            counts[(row['day'], dimension, row[dimension], row['status'])] += row['total']
+    ServiceRequestDailyRollup.objects.bulk_create(
+        (ServiceRequestDailyRollup(day=day, dimension=dimension, value=value, status=status, count=count)
+         for (day, dimension, value, status), count in counts.items()),
+        batch_size=1000,
+    )
+
+    rows = (
+        ContactMessage.objects.annotate(day=TruncDate('submitted_at', tzinfo=tz))
+        .values_list('day', 'status').annotate(total=Count('pk')).order_by()
+    )
+    ContactMessageDailyRollup.objects.bulk_create(
+        (ContactMessageDailyRollup(day=day, status=status, count=count) for day, status, count in rows),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolioapp', '0004_submission_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContactMessageDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('status', models.CharField(choices=[('new', 'New'), ('read', 'Read'), ('replied', 'Replied')], max_length=20)),
+                ('count', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Contact Message Daily Rollup',
+                'verbose_name_plural': 'Contact Message Daily Rollups',
+                'ordering': ['day'],
+                'constraints': [models.UniqueConstraint(fields=('day', 'status'), name='contactmessage_rollup_unique')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ServiceRequestDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('dimension', models.CharField(choices=[('service_type', 'Service type'), ('budget_range', 'Budget range'), ('preferred_timeline', 'Preferred timeline')], max_length=20)),
+                ('value', models.CharField(blank=True, max_length=50)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('reviewed', 'Reviewed'), ('in_progress', 'In Progress'), ('completed', 'Completed'), ('cancelled', 'Cancelled')], max_length=20)),
+                ('count', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Service Request Daily Rollup',
+                'verbose_name_plural': 'Service Request Daily Rollups',
+                'ordering': ['day'],
+                'constraints': [models.UniqueConstraint(fields=('day', 'dimension', 'value', 'status'), name='servicerequest_rollup_unique')],
+            },
+        ),
+        migrations.RunPython(populate_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.1.3 on 2026-10-19 04:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolioapp', '0005_daily_rollups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchiveBatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('servicerequest', 'Service Request'), ('contactmessage', 'Contact Message')], max_length=20)),
+                ('path', models.CharField(help_text='Relative to ARCHIVE_ROOT', max_length=255, unique=True)),
+                ('row_count', models.PositiveIntegerField()),
+                ('size', models.PositiveBigIntegerField(help_text='Compressed size in bytes')),
+                ('sha256', models.CharField(max_length=64)),
+                ('first_submitted_at', models.DateTimeField()),
+                ('last_submitted_at', models.DateTimeField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Archive Batch',
+                'verbose_name_plural': 'Archive Batches',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedSubmission',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('servicerequest', 'Service Request'), ('contactmessage', 'Contact Message')], max_length=20)),
+                ('original_id', models.BigIntegerField()),
+                ('submitted_at', models.DateTimeField()),
+                ('status', models.CharField(max_length=20)),
+                ('full_name', models.CharField(max_length=255)),
+                ('email', models.EmailField(max_length=254)),
+                ('summary', models.CharField(help_text='Subject or service type', max_length=255)),
+                ('service_type', models.CharField(blank=True, max_length=20)),
+                ('budget_range', models.CharField(blank=True, max_length=50)),
+                ('preferred_timeline', models.CharField(blank=True, max_length=20)),
+                ('batch', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='entries', to='portfolioapp.archivebatch')),
+            ],
+            options={
+                'verbose_name': 'Archived Submission',
+                'verbose_name_plural': 'Archived Submissions',
+                'ordering': ['-submitted_at'],
+                'indexes': [models.Index(fields=['kind', 'submitted_at'], name='archivedsubmission_kind_idx'), models.Index(fields=['email'], name='archivedsubmission_email_idx')],
+                'constraints': [models.UniqueConstraint(fields=('kind', 'original_id'), name='archivedsubmission_unique')],
+            },
+        ),
+    ]
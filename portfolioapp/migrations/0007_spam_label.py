@@ -0,0 +1,23 @@
+# Generated by Django 5.1.3 on 2026-10-19 04:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolioapp', '0006_submission_archive'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contactmessage',
+            name='spam_label',
+            field=models.CharField(blank=True, choices=[('', 'Unlabelled'), ('ham', 'Not spam'), ('spam', 'Spam')], max_length=10),
+        ),
+        migrations.AddField(
+            model_name='servicerequest',
+            name='spam_label',
+            field=models.CharField(blank=True, choices=[('', 'Unlabelled'), ('ham', 'Not spam'), ('spam', 'Spam')], max_length=10),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.1.3 on 2026-10-19 05:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolioapp', '0007_spam_label'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='image_meta',
+            field=models.JSONField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='thumbnail_meta',
+            field=models.JSONField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='testimonial',
+            name='client_image_meta',
+            field=models.JSONField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -2,6 +2,14 @@ from django.db import models
 from django.core.validators import URLValidator, MinValueValidator, MaxValueValidator
 
 
+# Admin labels the spam filter is trained on (manage.py train_spam_filter)
+SPAM_LABELS = [
+    ('', 'Unlabelled'),
+    ('ham', 'Not spam'),
+    ('spam', 'Spam'),
+]
+
+
 class ServiceRequest(models.Model):
     SERVICE_TYPES = [
         ('web', 'Web Development'),
@@ -46,6 +54,7 @@ class ServiceRequest(models.Model):
     budget_range = models.CharField(max_length=50, choices=BUDGET_CHOICES, blank=True)
     agree_to_terms = models.BooleanField(default=False)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    spam_label = models.CharField(max_length=10, choices=SPAM_LABELS, blank=True)
     submitted_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -53,6 +62,12 @@ class ServiceRequest(models.Model):
         ordering = ['-submitted_at']
         verbose_name = 'Service Request'
         verbose_name_plural = 'Service Requests'
+        indexes = [
+            # Admin keyset pages and date drilldowns, alone and per filter
+            models.Index(fields=['submitted_at', 'id'], name='servicerequest_submitted_idx'),
+            models.Index(fields=['status', 'submitted_at'], name='servicerequest_status_idx'),
+            models.Index(fields=['service_type', 'submitted_at'], name='servicerequest_type_idx'),
+        ]
 
     def __str__(self):
         return f"{self.full_name} - {self.get_service_type_display()}"
@@ -70,6 +85,7 @@ class ContactMessage(models.Model):
     subject = models.CharField(max_length=255)
     message = models.TextField()
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='new')
+    spam_label = models.CharField(max_length=10, choices=SPAM_LABELS, blank=True)
     submitted_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -77,6 +93,10 @@ class ContactMessage(models.Model):
         ordering = ['-submitted_at']
         verbose_name = 'Contact Message'
         verbose_name_plural = 'Contact Messages'
+        indexes = [
+            models.Index(fields=['submitted_at', 'id'], name='contactmessage_submitted_idx'),
+            models.Index(fields=['status', 'submitted_at'], name='contactmessage_status_idx'),
+        ]
 
     def __str__(self):
         return f"{self.full_name} - {self.subject}"
@@ -94,11 +114,18 @@ class Project(models.Model):
     detailed_description = models.TextField(blank=True, help_text="Detailed project description")
     image = models.ImageField(upload_to='projects/', blank=True, null=True)
     thumbnail = models.ImageField(upload_to='projects/thumbnails/', blank=True, null=True)
+    # Size, dominant colour and placeholder of the images, set on upload (see imagemeta.py)
+    image_meta = models.JSONField(null=True, blank=True, editable=False)
+    thumbnail_meta = models.JSONField(null=True, blank=True, editable=False)
     code_link = models.URLField(blank=True, validators=[URLValidator()])
     demo_link = models.URLField(blank=True, validators=[URLValidator()])
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='published')
     order = models.IntegerField(default=0, help_text="Order in which projects appear")
     is_featured = models.BooleanField(default=False)
+    # Denormalized aggregates, maintained by signals (see aggregates.py)
+    skill_names = models.JSONField(default=list, blank=True, editable=False)
+    active_testimonial_count = models.PositiveIntegerField(default=0, editable=False)
+    average_rating = models.FloatField(null=True, blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -161,6 +188,7 @@ class Testimonial(models.Model):
     client_position = models.CharField(max_length=255, blank=True)
     client_company = models.CharField(max_length=255, blank=True)
     client_image = models.ImageField(upload_to='testimonials/', blank=True, null=True)
+    client_image_meta = models.JSONField(null=True, blank=True, editable=False)
     testimonial = models.TextField()
     rating = models.IntegerField(
         default=5,
@@ -237,6 +265,115 @@ class AboutMe(models.Model):
 
     def save(self, *args, **kwargs):
         # Ensure only one instance exists (Singleton pattern)
-        if not self.pk and AboutMe.objects.exists():
+        from .hotcache import about_me_exists
+
+        if not self.pk and about_me_exists():
             raise ValueError("Only one AboutMe instance is allowed")
-        return super(AboutMe, self).save(*args, **kwargs)
\ No newline at end of file
+        return super(AboutMe, self).save(*args, **kwargs)
+
+
+class ServiceRequestDailyRollup(models.Model):
+    """
+    Service requests per submission day, status and value of one breakdown
+    dimension; each request is counted once per dimension.
+    """
+    DIMENSION_CHOICES = [
+        ('service_type', 'Service type'),
+        ('budget_range', 'Budget range'),
+        ('preferred_timeline', 'Preferred timeline'),
+    ]
+
+    day = models.DateField()
+    dimension = models.CharField(max_length=20, choices=DIMENSION_CHOICES)
+    value = models.CharField(max_length=50, blank=True)
+    status = models.CharField(max_length=20, choices=ServiceRequest.STATUS_CHOICES)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ['day']
+        verbose_name = 'Service Request Daily Rollup'
+        verbose_name_plural = 'Service Request Daily Rollups'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['day', 'dimension', 'value', 'status'],
+                name='servicerequest_rollup_unique',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.dimension}={self.value}/{self.status}: {self.count}"
+
+
+class ContactMessageDailyRollup(models.Model):
+    """Contact messages per submission day and status"""
+    day = models.DateField()
+    status = models.CharField(max_length=20, choices=ContactMessage.STATUS_CHOICES)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ['day']
+        verbose_name = 'Contact Message Daily Rollup'
+        verbose_name_plural = 'Contact Message Daily Rollups'
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'status'], name='contactmessage_rollup_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.status}: {self.count}"
+
+
+ARCHIVE_KINDS = [
+    ('servicerequest', 'Service Request'),
+    ('contactmessage', 'Contact Message'),
+]
+
+
+class ArchiveBatch(models.Model):
+    """A gzipped NDJSON file of closed submissions moved out of the live tables"""
+    kind = models.CharField(max_length=20, choices=ARCHIVE_KINDS)
+    path = models.CharField(max_length=255, unique=True, help_text="Relative to ARCHIVE_ROOT")
+    row_count = models.PositiveIntegerField()
+    size = models.PositiveBigIntegerField(help_text="Compressed size in bytes")
+    sha256 = models.CharField(max_length=64)
+    first_submitted_at = models.DateTimeField()
+    last_submitted_at = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'Archive Batch'
+        verbose_name_plural = 'Archive Batches'
+
+    def __str__(self):
+        return self.path
+
+
+class ArchivedSubmission(models.Model):
+    """Searchable index entry of an archived submission; the full row lives in its batch file"""
+    kind = models.CharField(max_length=20, choices=ARCHIVE_KINDS)
+    original_id = models.BigIntegerField()
+    batch = models.ForeignKey(ArchiveBatch, on_delete=models.CASCADE, related_name='entries')
+    submitted_at = models.DateTimeField()
+    status = models.CharField(max_length=20)
+    full_name = models.CharField(max_length=255)
+    email = models.EmailField()
+    summary = models.CharField(max_length=255, help_text="Subject or service type")
+    # Service request dimensions, so the daily rollups can be reconciled
+    service_type = models.CharField(max_length=20, blank=True)
+    budget_range = models.CharField(max_length=50, blank=True)
+    preferred_timeline = models.CharField(max_length=20, blank=True)
+
+    class Meta:
+        ordering = ['-submitted_at']
+        verbose_name = 'Archived Submission'
+        verbose_name_plural = 'Archived Submissions'
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'original_id'], name='archivedsubmission_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['kind', 'submitted_at'], name='archivedsubmission_kind_idx'),
+            models.Index(fields=['email'], name='archivedsubmission_email_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.full_name} - {self.summary}"
@@ -0,0 +1,61 @@
+"""
+Reordering projects, skills and social links in one step.
+
+The client sends the full ordered list of ids; every row gets ``order`` =
+its 1-based position. Rows are locked, the list is checked against the table,
+and only the rows whose position changed are written with a single
+``UPDATE ... SET order = CASE id WHEN ... END``. ``QuerySet.update`` sends no
+``post_save``, so the caches served from the model are invalidated here, once
+after commit, instead of once per row.
+"""
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, IntegerField, Value, When
+
+from . import signals
+from .models import Project, Skill, SocialLink
+
+# URL segment -> model, matching the public API groups
+REORDERABLE = {
+    'projects': Project,
+    'skills': Skill,
+    'social-links': SocialLink,
+}
+
+
+class ReorderError(ValueError):
+    pass
+
+
+def group_for_model(model):
+    return next(group for group, candidate in REORDERABLE.items() if candidate is model)
+
+
+def apply_order(model, ids):
+    """Give each row of ``model`` its position in ``ids``; return the number of rows changed"""
+    if not isinstance(ids, list) or not all(isinstance(pk, int) and not isinstance(pk, bool) for pk in ids):
+        raise ReorderError('"ids" must be a list of integers.')
+    if len(set(ids)) != len(ids):
+        raise ReorderError('"ids" contains duplicates.')
+
+    with transaction.atomic():
+        current = dict(model.objects.select_for_update().order_by().values_list('pk', 'order'))
+        if set(current) != set(ids):
+            missing, unknown = len(set(current) - set(ids)), len(set(ids) - set(current))
+            raise ReorderError(
+                f"\"ids\" must list every {model._meta.verbose_name} exactly once "
+                f"({missing} missing, {unknown} unknown)."
+            )
+        changed = {pk: position for position, pk in enumerate(ids, 1) if current[pk] != position}
+        if not changed:
+            return 0
+
+        model.objects.filter(pk__in=changed).update(order=Case(
+            *[When(pk=pk, then=Value(position)) for pk, position in changed.items()],
+            output_field=IntegerField(),
+        ))
+        signals.schedule_content_refresh(model)
+        if settings.API_SNAPSHOT_AUTO:
+            group = group_for_model(model)
+            signals.schedule_snapshot_routes({group}, {group: list(changed)})
+    return len(changed)
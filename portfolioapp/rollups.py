@@ -0,0 +1,286 @@
+"""
+Daily submission rollups behind the admin dashboard.
+
+``ServiceRequestDailyRollup`` counts service requests per submission day,
+status and value of one breakdown dimension (service type, budget range or
+preferred timeline), so every dashboard query -- per day by any dimension,
+the funnel by status, optionally filtered on one dimension -- reads at most
+about a hundred rows per day. ``ContactMessageDailyRollup`` counts contact
+messages per day and status.
+
+Signal receivers adjust the affected counts in the same transaction as every
+insert, edit, delete and bulk status change. ``manage.py reconcile_rollups``
+recomputes days from the raw tables and the archive index and fixes any
+drift (rows written with ``QuerySet.update``, ``bulk_create`` or raw SQL
+bypass the receivers).
+"""
+import datetime
+from collections import Counter, defaultdict
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from .models import (
+    ServiceRequest, ContactMessage, ServiceRequestDailyRollup, ContactMessageDailyRollup, ArchivedSubmission
+)
+
+# Service request fields with their own rollup rows (each crossed with status)
+BREAKDOWNS = ('service_type', 'budget_range', 'preferred_timeline')
+
+# Source model -> (rollup model, rollup key fields after the day, source fields)
+ROLLUPS = {
+    ServiceRequest: (ServiceRequestDailyRollup, ('dimension', 'value', 'status'), (*BREAKDOWNS, 'status')),
+    ContactMessage: (ContactMessageDailyRollup, ('status',), ('status',)),
+}
+
+# Conversion funnel: a request has reached a stage if its status is one of these
+FUNNEL = (
+    ('submitted', ('pending', 'reviewed', 'in_progress', 'completed', 'cancelled')),
+    ('reviewed', ('reviewed', 'in_progress', 'completed')),
+    ('in_progress', ('in_progress', 'completed')),
+    ('completed', ('completed',)),
+)
+
+# Dashboard range when none is given
+DEFAULT_DAYS = 30
+
+
+class RollupError(ValueError):
+    pass
+
+
+def dimensions(model):
+    """Source fields the dashboard can break down and filter by"""
+    return ROLLUPS[model][2]
+
+
+def keys_for_values(model, day, values):
+    """Rollup keys a submission with these source values counts towards"""
+    if model is ServiceRequest:
+        return [(day, dimension, values[dimension], values['status']) for dimension in BREAKDOWNS]
+    return [(day, values['status'])]
+
+
+def keys_for(model, instance):
+    values = {field: getattr(instance, field) for field in dimensions(model)}
+    return keys_for_values(model, timezone.localdate(instance.submitted_at), values)
+
+
+def stored_keys(model, pk):
+    """Rollup keys of the row as currently stored (empty if there is none)"""
+    fields = dimensions(model)
+    row = model.objects.filter(pk=pk).values_list('submitted_at', *fields).first()
+    if row is None:
+        return []
+    return keys_for_values(model, timezone.localdate(row[0]), dict(zip(fields, row[1:])))
+
+
+def apply_deltas(model, deltas):
+    """Add ``{key: delta}`` to the stored counts, creating missing rows"""
+    rollup, key_fields, _ = ROLLUPS[model]
+    for key, delta in deltas.items():
+        if not delta:
+            continue
+        lookup = dict(zip(('day', *key_fields), key))
+        if rollup.objects.filter(**lookup).update(count=F('count') + delta):
+            continue
+        try:
+            with transaction.atomic():
+                rollup.objects.create(count=delta, **lookup)
+        except IntegrityError:
+            # Created by a concurrent transaction in the meantime
+            rollup.objects.filter(**lookup).update(count=F('count') + delta)
+
+
+def record_change(model, old_keys, new_keys):
+    """Move one submission from ``old_keys`` to ``new_keys`` (empty for an insert or delete)"""
+    deltas = Counter(new_keys)
+    deltas.subtract(old_keys)
+    apply_deltas(model, deltas)
+
+
+def record_transitions(model, changes):
+    """
+    Move the rows of a bulk status change (``workflow.status_changed``, sent
+    after the UPDATE) from their previous status to the stored one.
+    """
+    previous = dict(changes)
+    fields = dimensions(model)
+    rows = model.objects.filter(pk__in=previous).values_list('pk', 'submitted_at', *fields)
+    deltas = Counter()
+    for pk, submitted_at, *values in rows:
+        day = timezone.localdate(submitted_at)
+        values = dict(zip(fields, values))
+        deltas.update(keys_for_values(model, day, values))
+        deltas.subtract(keys_for_values(model, day, {**values, 'status': previous[pk]}))
+    apply_deltas(model, deltas)
+
+
+def _midnight(day):
+    return timezone.make_aware(datetime.datetime.combine(day, datetime.time.min))
+
+
+def _day_bounds(start, end):
+    lower = _midnight(start) if start else None
+    upper = _midnight(end + datetime.timedelta(days=1)) if end else None
+    return lower, upper
+
+
+def compute(model, start=None, end=None):
+    """
+    ``{key: count}`` grouped from the raw table and the archive index (archived
+    submissions keep counting), for days in [start, end]
+    """
+    fields = dimensions(model)
+    lower, upper = _day_bounds(start, end)
+    counts = Counter()
+    for queryset in (model.objects.all(), ArchivedSubmission.objects.filter(kind=model._meta.model_name)):
+        if lower:
+            queryset = queryset.filter(submitted_at__gte=lower)
+        if upper:
+            queryset = queryset.filter(submitted_at__lt=upper)
+        rows = (
+            queryset.annotate(day=TruncDate('submitted_at', tzinfo=timezone.get_current_timezone()))
+            .values_list('day', *fields).annotate(total=Count('pk')).order_by()
+        )
+        for day, *values, total in rows:
+            for key in keys_for_values(model, day, dict(zip(fields, values))):
+                counts[key] += total
+    return counts
+
+
+def _stored(model, start, end, lock=False):
+    rollup, key_fields, _ = ROLLUPS[model]
+    rows = rollup.objects.order_by()
+    if lock:
+        rows = rows.select_for_update()
+    if start:
+        rows = rows.filter(day__gte=start)
+    if end:
+        rows = rows.filter(day__lte=end)
+    return {(day, *values): (pk, count) for pk, day, *values, count in
+            rows.values_list('pk', 'day', *key_fields, 'count')}
+
+
+def _count_drift(stored, expected):
+    # Rows left at zero by moves are harmless and don't count as drift
+    counts = {key: count for key, (_, count) in stored.items() if count}
+    return sum(1 for key in counts.keys() | expected.keys() if counts.get(key) != expected.get(key))
+
+
+def find_drift(model, start=None, end=None):
+    """Number of rollup counts for days in [start, end] that differ from the raw table"""
+    return _count_drift(_stored(model, start, end), compute(model, start, end))
+
+
+def reconcile(model, start=None, end=None):
+    """
+    Make the rollups for days in [start, end] match the raw table (dropping
+    rows left at zero). Return the number of counts that were wrong.
+    """
+    rollup, key_fields, _ = ROLLUPS[model]
+    with transaction.atomic():
+        stored = _stored(model, start, end, lock=True)
+        expected = compute(model, start, end)
+
+        stale = [pk for key, (pk, count) in stored.items() if expected.get(key) != count]
+        fresh = [key for key, count in expected.items() if stored.get(key, (None, None))[1] != count]
+        for offset in range(0, len(stale), 1000):
+            rollup.objects.filter(pk__in=stale[offset:offset + 1000]).delete()
+        rollup.objects.bulk_create(
+            (rollup(count=expected[key], **dict(zip(('day', *key_fields), key))) for key in fresh),
+            batch_size=1000,
+        )
+    return _count_drift(stored, expected)
+
+
+def date_range(params):
+    """(start, end) from ?since=YYYY-MM-DD&until=YYYY-MM-DD, the last DEFAULT_DAYS days by default"""
+    def parse(name, default):
+        value = params.get(name)
+        if not value:
+            return default
+        try:
+            day = parse_date(value)
+        except ValueError:
+            day = None
+        if day is None:
+            raise RollupError(f'"{name}" must be a date formatted as YYYY-MM-DD.')
+        return day
+
+    end = parse('until', timezone.localdate())
+    start = parse('since', end - datetime.timedelta(days=DEFAULT_DAYS - 1))
+    if start > end:
+        raise RollupError('"since" must not be after "until".')
+    return start, end
+
+
+def _grouped(model, by, start, end, filters):
+    """(day, value of ``by``, count) rows read from the rollups"""
+    fields = dimensions(model)
+    if by not in fields:
+        raise RollupError(f"\"by\" must be one of: {', '.join(fields)}")
+    unknown = set(filters) - set(fields)
+    if unknown:
+        raise RollupError(f"Unknown filter: {', '.join(sorted(unknown))}")
+
+    queryset = ROLLUPS[model][0].objects.filter(day__gte=start, day__lte=end)
+    if 'status' in filters:
+        queryset = queryset.filter(status=filters['status'])
+    column = 'status'
+    if model is ServiceRequest:
+        # Each row crosses one breakdown with status; pick the breakdown that answers the query
+        named = {by, *filters} - {'status'}
+        if len(named) > 1:
+            raise RollupError(
+                f"Break down or filter by only one of {', '.join(BREAKDOWNS)} at a time (plus status)."
+            )
+        dimension = named.pop() if named else BREAKDOWNS[0]
+        queryset = queryset.filter(dimension=dimension)
+        if dimension in filters:
+            queryset = queryset.filter(value=filters[dimension])
+        if by != 'status':
+            column = 'value'
+    return queryset.values_list('day', column).annotate(total=Sum('count')).order_by('day', column)
+
+
+def daily_counts(model, by, start, end, **filters):
+    """
+    Submissions per day in [start, end] broken down by one dimension:
+    ``{'days': [{'day', 'total', 'counts': {value: n}}, ...], 'totals': {value: n}}``.
+    Every day of the range is listed, including empty ones.
+    """
+    per_day = defaultdict(dict)
+    totals = Counter()
+    for day, value, count in _grouped(model, by, start, end, filters):
+        if count:
+            per_day[day][value] = count
+            totals[value] += count
+
+    days = []
+    day = start
+    while day <= end:
+        counts = per_day.get(day, {})
+        days.append({'day': day.isoformat(), 'total': sum(counts.values()), 'counts': counts})
+        day += datetime.timedelta(days=1)
+    return {'days': days, 'totals': dict(totals)}
+
+
+def funnel(start, end, **filters):
+    """Service requests submitted in [start, end] that reached each stage of the workflow"""
+    by_status = Counter()
+    for _, status, count in _grouped(ServiceRequest, 'status', start, end, filters):
+        by_status[status] += count
+    submitted = sum(by_status.values())
+    stages = []
+    for stage, statuses in FUNNEL:
+        count = sum(by_status[status] for status in statuses)
+        stages.append({
+            'stage': stage,
+            'count': count,
+            'rate': round(count / submitted, 4) if submitted else None,
+        })
+    return {'stages': stages, 'cancelled': by_status['cancelled']}
@@ -0,0 +1,120 @@
+"""
+In-process prefix index for typeahead search.
+
+Project names, skill names and testimonial client companies are normalised
+(case and accents folded) and stored in a sorted array of keys per type, one
+per word boundary, so a prefix lookup is a ``bisect`` plus a short scan of
+each requested type. Each worker builds the index lazily on first use and
+rebuilds it when the shared ``search`` version counter, bumped after commit
+by ``signals.py``, moves on, or once it is ``SEARCH_INDEX_MAX_AGE`` seconds
+old. Lookups read one cache key and never touch the database.
+"""
+import threading
+import time
+import unicodedata
+from bisect import bisect_left
+
+from django.conf import settings
+
+from .cache import get_version
+from .models import Project, Skill, Testimonial
+
+VERSION_NAME = 'search'
+
+# Models whose changes require an index rebuild
+INDEXED_MODELS = (Project, Skill, Testimonial)
+
+TYPES = ('project', 'skill', 'company')
+
+# Candidates looked at per type and query before ranking; keeps lookups bounded
+MAX_CANDIDATES = 200
+
+
+def normalize(text):
+    text = unicodedata.normalize('NFKD', text.casefold())
+    return ' '.join(''.join(c for c in text if not unicodedata.combining(c)).split())
+
+
+class PrefixIndex:
+    def __init__(self, entries):
+        """``entries`` is an iterable of (type, id, label, weight)"""
+        self.entries = list(entries)
+        keys = {kind: [] for kind in TYPES}
+        for position, (kind, _, label, _) in enumerate(self.entries):
+            words = normalize(label).split(' ')
+            # One key per word start: "React Native" matches "re" and "na"
+            for start in range(len(words)):
+                keys[kind].append((' '.join(words[start:]), start, position))
+        # Separate arrays per type, so a typed lookup never scans past other
+        # types' keys and the candidate cap only counts matches it can return
+        self.keys = {}
+        self.postings = {}
+        for kind, kind_keys in keys.items():
+            kind_keys.sort()
+            self.keys[kind] = [key for key, _, _ in kind_keys]
+            self.postings[kind] = [(start, position) for _, start, position in kind_keys]
+
+    def search(self, query, limit=10, types=TYPES):
+        query = normalize(query)
+        if not query:
+            return []
+        best = {}
+        for kind in types:
+            keys, postings = self.keys[kind], self.postings[kind]
+            index = bisect_left(keys, query)
+            end = min(len(keys), index + MAX_CANDIDATES)
+            while index < end and keys[index].startswith(query):
+                start, position = postings[index]
+                if position not in best or start < best[position]:
+                    best[position] = start
+                index += 1
+
+        ranked = []
+        for position, start in best.items():
+            kind, pk, label, weight = self.entries[position]
+            # Matches at the start of the label first, then by weight
+            ranked.append((start > 0, -weight, len(label), label, kind, pk))
+        ranked.sort()
+        return [
+            {'type': kind, 'id': pk, 'label': label}
+            for _, _, _, label, kind, pk in ranked[:limit]
+        ]
+
+
+def load_entries():
+    for pk, name, is_featured in (
+        Project.objects.filter(status='published').values_list('pk', 'name', 'is_featured')
+    ):
+        yield 'project', pk, name, 100 if is_featured else 0
+    for pk, name, proficiency in Skill.objects.filter(is_active=True).values_list('pk', 'name', 'proficiency'):
+        yield 'skill', pk, name, proficiency
+
+    companies = {}
+    for company in (
+        Testimonial.objects.filter(is_active=True).exclude(client_company='')
+        .values_list('client_company', flat=True)
+    ):
+        companies[company] = companies.get(company, 0) + 1
+    for company, count in companies.items():
+        yield 'company', None, company, count
+
+
+_lock = threading.Lock()
+_state = {'version': None, 'index': None, 'expires': 0.0}
+
+
+def _is_current(version):
+    return _state['version'] == version and time.monotonic() < _state['expires']
+
+
+def get_index():
+    """Return the worker's index, rebuilding it if the shared version moved or it expired"""
+    version = get_version(VERSION_NAME)
+    if _is_current(version):
+        return _state['index']
+    with _lock:
+        if not _is_current(version):
+            _state['index'] = PrefixIndex(load_entries())
+            _state['version'] = version
+            _state['expires'] = time.monotonic() + settings.SEARCH_INDEX_MAX_AGE
+    return _state['index']
@@ -1,3 +1,4 @@
+from django.db.models import Prefetch
 from rest_framework import serializers
 from .models import (
     ServiceRequest, ContactMessage, Project, Skill, ProjectSkill,
@@ -5,6 +6,70 @@ from .models import (
 )
 
 
+def _param_set(request, name):
+    value = request.query_params.get(name, '') if request is not None else ''
+    return {item.strip() for item in value.split(',') if item.strip()}
+
+
+class DynamicFieldsMixin:
+    """
+    Sparse fieldsets for read serializers.
+
+    Clients pick the payload with query parameters:
+    ?fields=id,name (only these), ?exclude=detailed_description (all but these)
+    and ?expand=skills (inline related objects listed in ``expandable_fields``).
+    ``optimize_queryset`` then loads only the columns, joins, prefetches and
+    annotations that the selected fields actually read.
+    """
+    expandable_fields = ()
+    # Model columns read by SerializerMethodFields: name -> column names
+    method_field_columns = {}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        self.expand = _param_set(request, 'expand') & set(self.expandable_fields)
+        only = _param_set(request, 'fields')
+        exclude = _param_set(request, 'exclude')
+        for name in list(self.fields):
+            if (only and name not in only) or name in exclude:
+                self.fields.pop(name)
+
+    @classmethod
+    def setup_queryset(cls, queryset, field_names, expand):
+        """Add the prefetches/annotations needed by method fields"""
+        return queryset
+
+    @classmethod
+    def optimize_queryset(cls, queryset, context):
+        serializer = cls(context=context)
+        model = queryset.model
+        concrete = {field.name: field for field in model._meta.concrete_fields}
+        columns = {model._meta.pk.name}
+        related = {}
+
+        for name, field in serializer.fields.items():
+            columns.update(cls.method_field_columns.get(name, ()))
+            if field.source == '*':
+                continue
+            attr, _, rest = field.source.partition('.')
+            if attr.startswith('get_') and attr.endswith('_display'):
+                attr = attr[len('get_'):-len('_display')]
+            if attr not in concrete:
+                continue
+            columns.add(attr)
+            if rest and concrete[attr].is_relation:
+                related.setdefault(attr, set()).add(rest.replace('.', '__'))
+
+        for relation, paths in related.items():
+            queryset = queryset.select_related(relation)
+            if relation not in serializer.expand:
+                columns.update(f"{relation}__{path}" for path in paths)
+
+        queryset = queryset.only(*columns)
+        return cls.setup_queryset(queryset, set(serializer.fields), serializer.expand)
+
+
 class ServiceRequestSerializer(serializers.ModelSerializer):
     service_type_display = serializers.CharField(source='get_service_type_display', read_only=True)
     status_display = serializers.CharField(source='get_status_display', read_only=True)
@@ -12,7 +77,7 @@ class ServiceRequestSerializer(serializers.ModelSerializer):
     class Meta:
         model = ServiceRequest
         fields = '__all__'
-        read_only_fields = ('status', 'submitted_at', 'updated_at')
+        read_only_fields = ('status', 'spam_label', 'submitted_at', 'updated_at')
 
 
 class ContactMessageSerializer(serializers.ModelSerializer):
@@ -21,10 +86,10 @@ class ContactMessageSerializer(serializers.ModelSerializer):
     class Meta:
         model = ContactMessage
         fields = '__all__'
-        read_only_fields = ('status', 'submitted_at', 'updated_at')
+        read_only_fields = ('status', 'spam_label', 'submitted_at', 'updated_at')
 
 
-class SkillSerializer(serializers.ModelSerializer):
+class SkillSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     category_display = serializers.CharField(source='get_category_display', read_only=True)
 
     class Meta:
@@ -42,59 +107,91 @@ class ProjectSkillSerializer(serializers.ModelSerializer):
         fields = ['id', 'skill', 'skill_name', 'skill_icon', 'skill_category']
 
 
-class ProjectSerializer(serializers.ModelSerializer):
+def _prefetch_project_skills(queryset):
+    return queryset.prefetch_related(
+        Prefetch('project_skills', queryset=ProjectSkill.objects.select_related('skill').order_by('pk'))
+    )
+
+
+class ProjectSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     skills = serializers.SerializerMethodField()
     status_display = serializers.CharField(source='get_status_display', read_only=True)
-    testimonial_count = serializers.SerializerMethodField()
+    testimonial_count = serializers.IntegerField(source='active_testimonial_count', read_only=True)
 
     class Meta:
         model = Project
         fields = [
-            'id', 'name', 'description', 'detailed_description', 'image', 'thumbnail',
-            'code_link', 'demo_link', 'status', 'status_display', 'order', 'is_featured',
-            'skills', 'testimonial_count', 'created_at', 'updated_at'
+            'id', 'name', 'description', 'detailed_description', 'image', 'image_meta',
+            'thumbnail', 'thumbnail_meta', 'code_link', 'demo_link', 'status', 'status_display', 'order',
+            'is_featured', 'skills', 'testimonial_count', 'average_rating', 'created_at', 'updated_at'
         ]
-        read_only_fields = ('created_at', 'updated_at')
+        read_only_fields = ('image_meta', 'thumbnail_meta', 'average_rating', 'created_at', 'updated_at')
+
+    @classmethod
+    def setup_queryset(cls, queryset, field_names, expand):
+        if 'skills' in field_names:
+            queryset = _prefetch_project_skills(queryset)
+        return queryset
 
     def get_skills(self, obj):
         project_skills = obj.project_skills.all()
         return ProjectSkillSerializer(project_skills, many=True).data
 
-    def get_testimonial_count(self, obj):
-        return obj.testimonials.filter(is_active=True).count()
 
-
-class ProjectListSerializer(serializers.ModelSerializer):
+class ProjectListSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Lighter serializer for list views"""
     skills = serializers.SerializerMethodField()
     status_display = serializers.CharField(source='get_status_display', read_only=True)
+    expandable_fields = ('skills',)
+    method_field_columns = {'skills': ('skill_names',)}
 
     class Meta:
         model = Project
         fields = [
-            'id', 'name', 'description', 'thumbnail', 'code_link', 'demo_link',
+            'id', 'name', 'description', 'thumbnail', 'thumbnail_meta', 'code_link', 'demo_link',
             'status', 'status_display', 'is_featured', 'skills', 'created_at'
         ]
 
+    @classmethod
+    def setup_queryset(cls, queryset, field_names, expand):
+        if 'skills' in field_names and 'skills' in expand:
+            queryset = _prefetch_project_skills(queryset)
+        return queryset
+
     def get_skills(self, obj):
-        # Return only skill names for list view
-        return [ps.skill.name for ps in obj.project_skills.all()]
+        if 'skills' in self.expand:
+            return ProjectSkillSerializer(obj.project_skills.all(), many=True).data
+        # Return only skill names for list view (denormalized on the project)
+        return obj.skill_names
 
 
-class TestimonialSerializer(serializers.ModelSerializer):
+class TestimonialSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     project_name = serializers.CharField(source='project.name', read_only=True, allow_null=True)
+    expandable_fields = ('project',)
 
     class Meta:
         model = Testimonial
         fields = [
             'id', 'client_name', 'client_position', 'client_company', 'client_image',
-            'testimonial', 'rating', 'project', 'project_name', 'is_featured',
+            'client_image_meta', 'testimonial', 'rating', 'project', 'project_name', 'is_featured',
             'is_active', 'created_at'
         ]
-        read_only_fields = ('created_at',)
+        read_only_fields = ('client_image_meta', 'created_at')
+
+    @classmethod
+    def setup_queryset(cls, queryset, field_names, expand):
+        # The expanded project is serialized from the same row, not one query each
+        if 'project' in field_names and 'project' in expand:
+            queryset = queryset.select_related('project')
+        return queryset
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if 'project' in self.expand and 'project' in self.fields:
+            self.fields['project'] = ProjectListSerializer(read_only=True)
 
 
-class SocialLinkSerializer(serializers.ModelSerializer):
+class SocialLinkSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     platform_display = serializers.CharField(source='get_platform_display', read_only=True)
 
     class Meta:
@@ -102,7 +199,7 @@ class SocialLinkSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 
-class AboutMeSerializer(serializers.ModelSerializer):
+class AboutMeSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = AboutMe
         fields = '__all__'
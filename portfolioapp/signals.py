@@ -0,0 +1,314 @@
+"""
+Signal receivers that keep derived data in sync with the portfolio content.
+
+Receivers are connected in ``PortfolioappConfig.ready``.
+"""
+import logging
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from . import aggregates, events, hotcache, imagemeta, indexes, rollups, search, similarity, spam, workflow
+from .models import (
+    Project, Skill, ProjectSkill, Testimonial, SocialLink, AboutMe, ServiceRequest, ContactMessage
+)
+
+logger = logging.getLogger(__name__)
+
+# Models whose rows are visible through the public read endpoints
+PUBLIC_MODELS = (Project, Skill, ProjectSkill, Testimonial, SocialLink, AboutMe)
+
+_pending = threading.local()
+
+
+def _flush_snapshot_refresh():
+    groups = getattr(_pending, 'groups', None)
+    if not groups and not getattr(_pending, 'details', None):
+        return
+    details = _pending.details
+    _pending.groups, _pending.details = set(), defaultdict(set)
+
+    from . import snapshots
+    try:
+        snapshots.export_affected(groups, details)
+    except Exception:
+        # A failed snapshot must never break the admin save that triggered it
+        logger.exception('Incremental API snapshot refresh failed')
+
+
+def schedule_snapshot_routes(groups, details):
+    if not hasattr(_pending, 'groups'):
+        _pending.groups, _pending.details = set(), defaultdict(set)
+    _pending.groups.update(groups)
+    for group, pks in details.items():
+        _pending.details[group].update(pks)
+    # Every change registers a callback; the first one to run drains the
+    # queue, so a transaction touching many rows renders each route once.
+    transaction.on_commit(_flush_snapshot_refresh)
+
+
+def schedule_snapshot_refresh(instance):
+    """Queue the routes affected by ``instance``; render once after commit"""
+    from . import snapshots
+
+    schedule_snapshot_routes(*snapshots.affected_routes(instance))
+
+
+def _flush_bundle_refresh():
+    names = getattr(_pending, 'bundle_sections', None)
+    if not names:
+        return
+    _pending.bundle_sections = set()
+
+    from . import bundle
+    try:
+        bundle.refresh_sections(names)
+    except Exception:
+        # Drop the stale sections so the next request rebuilds them
+        from django.core.cache import cache
+        cache.delete_many([bundle.section_key(name) for name in names])
+        logger.exception('Homepage bundle refresh failed')
+
+
+def schedule_bundle_refresh(model):
+    from . import bundle
+
+    if not hasattr(_pending, 'bundle_sections'):
+        _pending.bundle_sections = set()
+    _pending.bundle_sections.update(bundle.sections_for_model(model))
+    transaction.on_commit(_flush_bundle_refresh)
+
+
+def _flush_version_bumps():
+    names = getattr(_pending, 'versions', None)
+    if names:
+        _pending.versions = set()
+        from .cache import bump_version
+        for name in names:
+            bump_version(name)
+
+
+def schedule_version_bump(name):
+    # Bump after commit so no reader caches pre-commit data under the new version
+    if not hasattr(_pending, 'versions'):
+        _pending.versions = set()
+    _pending.versions.add(name)
+    transaction.on_commit(_flush_version_bumps)
+
+
+def _flush_hot_objects():
+    names = getattr(_pending, 'hot_objects', None)
+    if names:
+        _pending.hot_objects = set()
+        hotcache.invalidate(names)
+
+
+def schedule_hot_object_refresh(model):
+    names = hotcache.names_for_model(model)
+    if not names:
+        return
+    if not hasattr(_pending, 'hot_objects'):
+        _pending.hot_objects = set()
+    _pending.hot_objects.update(names)
+    transaction.on_commit(_flush_hot_objects)
+
+
+def _flush_cache_deletes():
+    keys = getattr(_pending, 'cache_deletes', None)
+    if keys:
+        _pending.cache_deletes = set()
+        from django.core.cache import cache
+        cache.delete_many(list(keys))
+
+
+def schedule_cache_delete(keys):
+    if not keys:
+        return
+    if not hasattr(_pending, 'cache_deletes'):
+        _pending.cache_deletes = set()
+    _pending.cache_deletes.update(keys)
+    transaction.on_commit(_flush_cache_deletes)
+
+
+def schedule_content_refresh(model):
+    """Invalidate everything served from ``model``'s rows, once after commit"""
+    schedule_version_bump('content')
+    if model in search.INDEXED_MODELS:
+        schedule_version_bump(search.VERSION_NAME)
+    for key in indexes.keys_for_model(model):
+        schedule_version_bump(key)
+    schedule_hot_object_refresh(model)
+    schedule_bundle_refresh(model)
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def public_content_changed(sender, instance, **kwargs):
+    if sender not in PUBLIC_MODELS or kwargs.get('raw'):
+        return
+    schedule_content_refresh(sender)
+    if settings.API_SNAPSHOT_AUTO:
+        schedule_snapshot_refresh(instance)
+
+
+# Image size, colour and placeholder are read from the upload before it is
+# stored, so API responses never open image files.
+
+@receiver(pre_save, sender=Project)
+@receiver(pre_save, sender=Testimonial)
+def describe_images(sender, instance, raw=False, update_fields=None, **kwargs):
+    # Partial saves could not store the metadata; backfill_image_meta catches up
+    if not raw and update_fields is None:
+        imagemeta.update_instance(instance)
+
+
+# Denormalized project aggregates are refreshed inside the same transaction,
+# so readers never see a committed change without its aggregates.
+
+@receiver(post_save, sender=ProjectSkill)
+@receiver(post_delete, sender=ProjectSkill)
+def project_skill_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        aggregates.refresh_projects([instance.project_id])
+
+
+@receiver(post_save, sender=Skill)
+def skill_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        aggregates.refresh_projects(
+            instance.project_skills.values_list('project_id', flat=True)
+        )
+
+
+@receiver(pre_save, sender=Testimonial)
+def remember_testimonial_project(sender, instance, raw=False, **kwargs):
+    # A testimonial moved to another project changes both projects
+    if instance.pk and not raw:
+        instance._previous_project_id = (
+            Testimonial.objects.filter(pk=instance.pk).values_list('project_id', flat=True).first()
+        )
+
+
+@receiver(post_save, sender=Testimonial)
+@receiver(post_delete, sender=Testimonial)
+def testimonial_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        aggregates.refresh_projects(
+            [instance.project_id, getattr(instance, '_previous_project_id', None)]
+        )
+
+
+# Related-project neighbour lists touched by a change are dropped after commit
+# and recomputed on the next read.
+
+@receiver(post_save, sender=ProjectSkill)
+@receiver(post_delete, sender=ProjectSkill)
+def project_skill_similarity_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        schedule_cache_delete(similarity.keys_for_skills([instance.skill_id], [instance.project_id]))
+
+
+@receiver(post_save, sender=Skill)
+def skill_similarity_changed(sender, instance, raw=False, **kwargs):
+    # Proficiency and is_active feed the similarity weights
+    if not raw:
+        schedule_cache_delete(similarity.keys_for_skills([instance.pk]))
+
+
+@receiver(post_save, sender=Project)
+def project_similarity_changed(sender, instance, raw=False, created=False, **kwargs):
+    # Publishing or unpublishing changes who may appear in related lists
+    if not raw and not created:
+        schedule_cache_delete(similarity.keys_for_project(instance.pk))
+
+
+# Daily submission rollups move with every insert, edit, delete and bulk
+# status change, inside the same transaction.
+
+@contextmanager
+def rollups_paused():
+    """Keep counting submissions deleted inside the block (archival) in the rollups"""
+    _pending.rollups_paused = True
+    try:
+        yield
+    finally:
+        _pending.rollups_paused = False
+
+
+@receiver(pre_save, sender=ServiceRequest)
+@receiver(pre_save, sender=ContactMessage)
+def remember_rollup_keys(sender, instance, raw=False, **kwargs):
+    if instance.pk and not raw:
+        instance._previous_rollup_keys = rollups.stored_keys(sender, instance.pk)
+
+
+@receiver(post_save, sender=ServiceRequest)
+@receiver(post_save, sender=ContactMessage)
+def submission_saved(sender, instance, raw=False, created=False, **kwargs):
+    if not raw:
+        previous = [] if created else getattr(instance, '_previous_rollup_keys', [])
+        rollups.record_change(sender, previous, rollups.keys_for(sender, instance))
+    if created:
+        spam.note_saved(sender, instance.pk)
+
+
+@receiver(post_delete, sender=ServiceRequest)
+@receiver(post_delete, sender=ContactMessage)
+def submission_deleted(sender, instance, **kwargs):
+    if not getattr(_pending, 'rollups_paused', False):
+        rollups.record_change(sender, rollups.keys_for(sender, instance), [])
+
+
+@receiver(workflow.status_changed)
+def submissions_transitioned(sender, changes, **kwargs):
+    rollups.record_transitions(sender, changes)
+
+
+# Live admin feed: new submissions and status changes, published once the
+# transaction commits
+
+def _publish_on_commit(kind, data):
+    transaction.on_commit(lambda: events.publish(kind, data))
+
+
+def _submission_summary(instance):
+    if isinstance(instance, ServiceRequest):
+        return instance.get_service_type_display()
+    return instance.subject
+
+
+@receiver(post_save, sender=ServiceRequest)
+@receiver(post_save, sender=ContactMessage)
+def publish_submission(sender, instance, raw=False, created=False, **kwargs):
+    if raw:
+        return
+    model = sender._meta.model_name
+    if created:
+        _publish_on_commit('submission', {
+            'model': model,
+            'id': instance.pk,
+            'full_name': instance.full_name,
+            'email': instance.email,
+            'summary': _submission_summary(instance),
+            'status': instance.status,
+            'submitted_at': instance.submitted_at,
+        })
+        return
+    # Status is the last part of every rollup key remembered before the save
+    previous = getattr(instance, '_previous_rollup_keys', None)
+    if previous and previous[0][-1] != instance.status:
+        _publish_on_commit('status', {'model': model, 'ids': [instance.pk], 'status': instance.status})
+
+
+@receiver(workflow.status_changed)
+def publish_transitions(sender, changes, status, **kwargs):
+    _publish_on_commit('status', {
+        'model': sender._meta.model_name,
+        'ids': [pk for pk, _ in changes],
+        'status': status,
+    })
@@ -0,0 +1,99 @@
+"""
+Related projects by shared skills.
+
+Two projects are similar in proportion to the skills they share, each shared
+skill weighted by its proficiency (0-1). A project's neighbours are computed
+from the inverted lists of its skills (skill -> projects), so the cost depends
+on how many projects share those skills rather than on the total number of
+projects. The top neighbours are cached per project and read in O(k);
+``signals.py`` drops the cached lists touched by a ProjectSkill, Skill or
+Project change, and ``build_index`` precomputes every list in one pass.
+"""
+import heapq
+from collections import defaultdict
+
+from django.conf import settings
+
+from . import coalesce
+from .models import ProjectSkill
+
+
+def related_key(project_id):
+    return f"related:{project_id}"
+
+
+def _top(scores, limit):
+    # Highest score first; ties go to the older (lower pk) project
+    best = heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], -item[0]))
+    return [(project_id, round(score, 4)) for project_id, score in best]
+
+
+def compute_related(project_id, limit=None):
+    """Return [(project_id, score), ...] for the most similar published projects"""
+    limit = limit or settings.RELATED_PROJECTS_LIMIT
+    weights = {
+        skill_id: proficiency / 100
+        for skill_id, proficiency in ProjectSkill.objects
+        .filter(project_id=project_id, skill__is_active=True)
+        .values_list('skill_id', 'skill__proficiency')
+    }
+    if not weights:
+        return []
+    postings = (
+        ProjectSkill.objects
+        .filter(skill_id__in=weights, project__status='published')
+        .exclude(project_id=project_id)
+        .values_list('skill_id', 'project_id')
+    )
+    scores = defaultdict(float)
+    for skill_id, other_id in postings:
+        scores[other_id] += weights[skill_id]
+    return _top(scores, limit)
+
+
+def get_related(project_id):
+    related, _ = coalesce.get_or_compute(
+        related_key(project_id), lambda: compute_related(project_id), settings.INDEX_CACHE_TIMEOUT
+    )
+    return related
+
+
+def build_index(limit=None):
+    """Precompute and cache the neighbour lists of every published project"""
+    limit = limit or settings.RELATED_PROJECTS_LIMIT
+    rows = (
+        ProjectSkill.objects
+        .filter(skill__is_active=True, project__status='published')
+        .values_list('project_id', 'skill_id', 'skill__proficiency')
+    )
+    project_skills = defaultdict(dict)
+    inverted = defaultdict(list)
+    for project_id, skill_id, proficiency in rows.iterator(chunk_size=5000):
+        project_skills[project_id][skill_id] = proficiency / 100
+        inverted[skill_id].append(project_id)
+
+    entries = {}
+    for project_id, weights in project_skills.items():
+        scores = defaultdict(float)
+        for skill_id, weight in weights.items():
+            for other_id in inverted[skill_id]:
+                if other_id != project_id:
+                    scores[other_id] += weight
+        entries[related_key(project_id)] = _top(scores, limit)
+    coalesce.store_many(entries, settings.INDEX_CACHE_TIMEOUT)
+    return len(entries)
+
+
+def keys_for_skills(skill_ids, extra_project_ids=()):
+    """Cache keys of every project holding one of ``skill_ids``"""
+    project_ids = set(extra_project_ids)
+    project_ids.update(
+        ProjectSkill.objects.filter(skill_id__in=list(skill_ids)).values_list('project_id', flat=True)
+    )
+    return [related_key(project_id) for project_id in project_ids]
+
+
+def keys_for_project(project_id):
+    """Cache keys of a project and of every project sharing a skill with it"""
+    skill_ids = ProjectSkill.objects.filter(project_id=project_id).values_list('skill_id', flat=True)
+    return keys_for_skills(skill_ids, [project_id])
@@ -0,0 +1,260 @@
+"""
+Static, precompressed JSON snapshots of the public API.
+
+Every public GET route is rendered in-process and written to
+``settings.API_SNAPSHOT_ROOT`` as ``<path>/index.json`` (or
+``<path>/index@<sorted query>.json`` for filtered and paginated variants),
+together with ``.gz`` and, when the ``brotli`` package is installed, ``.br``
+siblings. ``manifest.json`` maps each route to its file, size and ETag.
+
+Files are written to a temporary name and moved into place with
+``os.replace`` so nginx or a CDN never serves a partially written file.
+"""
+import fcntl
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from django.conf import settings
+from django.utils import timezone
+
+from .internal import internal_get
+from .models import Project, Skill, ProjectSkill, Testimonial, SocialLink, AboutMe
+
+try:
+    import brotli
+except ImportError:  # brotli is optional
+    brotli = None
+
+
+GROUPS = ('projects', 'skills', 'testimonials', 'social-links', 'about-me')
+
+
+def list_routes(group):
+    """Non-detail routes of a group, including the common filter combinations"""
+    base = f"/api/{group}/"
+    routes = [(base, {})]
+    if group == 'projects':
+        routes += [
+            (base, {'is_featured': 'true'}),
+            (base, {'is_featured': 'false'}),
+            (f"{base}featured/", {}),
+        ]
+    elif group == 'skills':
+        routes += [(base, {'category': value}) for value, _ in Skill.CATEGORY_CHOICES]
+        routes.append((f"{base}by_category/", {}))
+    elif group == 'testimonials':
+        routes += [(base, {'is_featured': 'true'})]
+        routes += [(base, {'rating': str(rating)}) for rating in range(1, 6)]
+        routes.append((f"{base}featured/", {}))
+    elif group == 'about-me':
+        routes.append((f"{base}info/", {}))
+    return routes
+
+
+def detail_pks(group):
+    from . import views
+
+    viewsets = {
+        'projects': views.ProjectViewSet,
+        'skills': views.SkillViewSet,
+        'testimonials': views.TestimonialViewSet,
+        'social-links': views.SocialLinkViewSet,
+        'about-me': views.AboutMeViewSet,
+    }
+    return viewsets[group].queryset.order_by('pk').values_list('pk', flat=True)
+
+
+def detail_route(group, pk):
+    return (f"/api/{group}/{pk}/", {})
+
+
+def affected_routes(instance):
+    """
+    Return (groups whose list routes must be re-rendered,
+    {group: detail pks to re-render}) for a changed instance.
+    """
+    if isinstance(instance, Project):
+        testimonial_ids = list(instance.testimonials.values_list('pk', flat=True)) if instance.pk else []
+        return {'projects', 'testimonials'}, {'projects': [instance.pk], 'testimonials': testimonial_ids}
+    if isinstance(instance, Skill):
+        project_ids = list(instance.project_skills.values_list('project_id', flat=True)) if instance.pk else []
+        return {'skills', 'projects'}, {'skills': [instance.pk], 'projects': project_ids}
+    if isinstance(instance, ProjectSkill):
+        return {'projects'}, {'projects': [instance.project_id]}
+    if isinstance(instance, Testimonial):
+        details = {'testimonials': [instance.pk]}
+        if instance.project_id:
+            # The project detail carries the active testimonial count
+            details['projects'] = [instance.project_id]
+        return {'testimonials'}, details
+    if isinstance(instance, SocialLink):
+        return {'social-links'}, {'social-links': [instance.pk]}
+    if isinstance(instance, AboutMe):
+        return {'about-me'}, {'about-me': [instance.pk]}
+    return set(), {}
+
+
+def snapshot_file(path, params):
+    query = urlencode(sorted(params.items()))
+    name = f"index@{query}.json" if query else 'index.json'
+    return Path(path.strip('/')) / name
+
+
+def route_key(path, params):
+    query = urlencode(sorted(params.items()))
+    return f"{path}?{query}" if query else path
+
+
+def _write_atomic(target, data):
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=target.parent, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as handle:
+            handle.write(data)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, target)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def _remove(target):
+    for suffix in ('', '.gz', '.br'):
+        try:
+            os.unlink(f"{target}{suffix}")
+        except FileNotFoundError:
+            pass
+
+
+class SnapshotWriter:
+    """Render routes to files and collect the matching manifest changes"""
+
+    def __init__(self, root=None):
+        self.root = Path(root or settings.API_SNAPSHOT_ROOT)
+        self.entries = {}
+        self.removed = set()
+        # Route keys (without page) of every list that was walked page by page
+        self.paginated = set()
+        self.written = 0
+        self.unchanged = 0
+
+    def render(self, path, params=None, follow_pages=True):
+        params = dict(params or {})
+        if follow_pages:
+            self.paginated.add(route_key(path, params))
+        while True:
+            response = internal_get(path, params)
+            target = self.root / snapshot_file(path, params)
+            key = route_key(path, params)
+            if response.status_code != 200:
+                # Deleted or unpublished objects disappear from the snapshot
+                _remove(target)
+                self.removed.add(key)
+                return
+            self._store(key, target, response.content)
+
+            next_url = None
+            if follow_pages and response.get('Content-Type', '').startswith('application/json'):
+                data = json.loads(response.content)
+                if isinstance(data, dict):
+                    next_url = data.get('next')
+            if not next_url:
+                return
+            params = dict(parse_qsl(urlsplit(next_url).query))
+
+    def _store(self, key, target, body):
+        etag = hashlib.sha256(body).hexdigest()[:32]
+        encodings = ['gzip'] + (['br'] if brotli else [])
+        self.entries[key] = {
+            'file': str(target.relative_to(self.root)),
+            'size': len(body),
+            'etag': f'"{etag}"',
+            'encodings': encodings,
+        }
+        try:
+            if target.read_bytes() == body:
+                self.unchanged += 1
+                return
+        except FileNotFoundError:
+            pass
+        # Compressed siblings first so index.json never points at stale .gz
+        _write_atomic(Path(f"{target}.gz"), gzip.compress(body, compresslevel=9, mtime=0))
+        if brotli:
+            _write_atomic(Path(f"{target}.br"), brotli.compress(body))
+        _write_atomic(target, body)
+        self.written += 1
+
+    def render_group(self, group, details=True):
+        for path, params in list_routes(group):
+            self.render(path, params)
+        if details:
+            for pk in detail_pks(group).iterator():
+                self.render(*detail_route(group, pk), follow_pages=False)
+
+    def _is_stale_page(self, key):
+        # A page that was not re-rendered while its list was walked no
+        # longer exists (the list got shorter)
+        path, _, query = key.partition('?')
+        params = dict(parse_qsl(query))
+        if 'page' not in params:
+            return False
+        params.pop('page')
+        return route_key(path, params) in self.paginated
+
+    @contextmanager
+    def _manifest_lock(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.root / '.manifest.lock', 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def save_manifest(self, replace=False):
+        manifest_path = self.root / 'manifest.json'
+        with self._manifest_lock():
+            routes = {}
+            if manifest_path.exists():
+                routes = json.loads(manifest_path.read_bytes()).get('routes', {})
+            for key in list(routes):
+                if key in self.entries:
+                    continue
+                if replace or key in self.removed or self._is_stale_page(key):
+                    _remove(self.root / routes.pop(key)['file'])
+            routes.update(self.entries)
+            manifest = {
+                'generated_at': timezone.now().isoformat(),
+                'base_url': settings.PUBLIC_API_URL,
+                'routes': dict(sorted(routes.items())),
+            }
+            _write_atomic(manifest_path, json.dumps(manifest, indent=2).encode())
+
+
+def export_all(root=None):
+    """Render every public route and replace the manifest"""
+    writer = SnapshotWriter(root)
+    writer.render('/api/', follow_pages=False)
+    for group in GROUPS:
+        writer.render_group(group)
+    writer.save_manifest(replace=True)
+    return writer
+
+
+def export_affected(groups, details, root=None):
+    """Re-render only the list routes of ``groups`` and the given detail pks"""
+    writer = SnapshotWriter(root)
+    for group in groups:
+        writer.render_group(group, details=False)
+    for group, pks in details.items():
+        for pk in sorted(set(pks)):
+            writer.render(*detail_route(group, pk), follow_pages=False)
+    writer.save_manifest()
+    return writer
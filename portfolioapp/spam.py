@@ -0,0 +1,292 @@
+"""
+Spam filtering for the contact and service request forms.
+
+``check`` runs before a submission is saved and answers from memory only, so
+a rejected submission costs no database write and no email. Layers, cheapest
+first:
+
+1. honeypot: a hidden form field (``SPAM_HONEYPOT_FIELD``) that people leave
+   empty and bots fill in;
+2. timing: a signed token from ``GET /api/forms/token/`` fetched when the form
+   is shown; forms sent back within ``SPAM_MIN_FILL_SECONDS`` are bots;
+3. duplicates: the same sender and text seen within
+   ``SPAM_DUPLICATE_WINDOW`` seconds (per process LRU of content
+   fingerprints);
+4. links: more than ``SPAM_MAX_LINKS`` URLs in the text;
+5. a naive Bayes token classifier trained from the messages labelled in the
+   admin (``manage.py train_spam_filter``), loaded from ``SPAM_MODEL_PATH``.
+
+Rejected submissions get the normal success response.
+"""
+import functools
+import hashlib
+import json
+import math
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import Counter, OrderedDict
+
+from django.conf import settings
+from django.core import signing
+
+from .models import ServiceRequest, ContactMessage
+
+# Text the classifier and the duplicate check read, per form
+TEXT_FIELDS = {
+    ServiceRequest: ('full_name', 'project_requirements'),
+    ContactMessage: ('full_name', 'subject', 'message'),
+}
+
+MODEL_VERSION = 1
+# Only the start of very long messages is classified
+MAX_TEXT_LENGTH = 5000
+# Seconds between checks of SPAM_MODEL_PATH for a retrained model
+MODEL_RELOAD_INTERVAL = 60
+# Tokens kept in a trained model (strongest evidence first)
+MAX_FEATURES = 20000
+
+TOKEN_SALT = 'portfolioapp.spam.form-token'
+
+# Matched against lowercased text, and only when it contains one of LINK_MARKERS
+LINK_RE = re.compile(r'(?:https?://|www\.)([\w.-]+)|\[url[=\]]|<a\s')
+LINK_MARKERS = ('http', 'www.', '[url', '<a')
+# Punctuation that separates words (str.translate and str.split run in C,
+# several times faster than a word regex)
+SEPARATORS = str.maketrans({char: ' ' for char in '!"#%&()*+,-./:;<=>?@[\\]^_`{|}~'})
+
+
+def text_of(model, values):
+    """The submission's text, lowercased"""
+    return '\n'.join(str(values.get(field) or '') for field in TEXT_FIELDS[model])[:MAX_TEXT_LENGTH].lower()
+
+
+def links(text):
+    """Hosts (or '' for markup links) of the links in lowercased text"""
+    if not any(marker in text for marker in LINK_MARKERS):
+        return []
+    return LINK_RE.findall(text)
+
+
+def tokens(text, email=''):
+    """Distinct classifier features of a submission's lowercased text"""
+    features = {word for word in text.translate(SEPARATORS).split() if 1 < len(word) <= 24}
+    features.update(f"host:{host}" for host in links(text) if host)
+    if '@' in email:
+        features.add(f"from:{email.rsplit('@', 1)[1].lower()}")
+    return features
+
+
+# Form timing tokens
+
+@functools.lru_cache(maxsize=None)
+def _signer():
+    return signing.Signer(salt=TOKEN_SALT)
+
+
+def issue_form_token():
+    return _signer().sign(str(int(time.time())))
+
+
+def _form_age(token):
+    """Seconds since the token was issued; None if it is forged"""
+    try:
+        issued = int(_signer().unsign(token))
+    except (signing.BadSignature, ValueError):
+        return None
+    return time.time() - issued
+
+
+# Duplicate detection
+
+class FingerprintCache:
+    """Thread-safe LRU of content fingerprints -> last time seen"""
+
+    def __init__(self, size):
+        self.size = size
+        self._seen = OrderedDict()
+        self._lock = threading.Lock()
+
+    def seen(self, fingerprint, window):
+        """Record the fingerprint; True if it was already seen within ``window`` seconds"""
+        now = time.monotonic()
+        with self._lock:
+            last = self._seen.pop(fingerprint, None)
+            self._seen[fingerprint] = now
+            if len(self._seen) > self.size:
+                self._seen.popitem(last=False)
+        return last is not None and now - last < window
+
+    def clear(self):
+        with self._lock:
+            self._seen.clear()
+
+
+fingerprints = FingerprintCache(settings.SPAM_FINGERPRINT_CACHE_SIZE)
+
+
+def fingerprint(model, email, text):
+    """Sender and lowercased text, whitespace collapsed"""
+    normalized = ' '.join(text.split())
+    return hashlib.blake2b(f"{model._meta.model_name}:{email.lower()}:{normalized}".encode(), digest_size=12).digest()
+
+
+# Responses to rejected submissions
+
+_decoy_ids = {}
+_decoy_lock = threading.Lock()
+
+
+def decoy_id(model):
+    """
+    An id for a rejected submission's response that looks like the next real
+    one: past the latest id this process knows of and never repeated by it.
+    The database is read once per process; after that, real saves advance the
+    counter (``note_saved``).
+    """
+    if model not in _decoy_ids:
+        latest = model.objects.order_by('-pk').values_list('pk', flat=True).first() or 0
+        note_saved(model, latest)
+    with _decoy_lock:
+        _decoy_ids[model] += 1
+        return _decoy_ids[model]
+
+
+def note_saved(model, pk):
+    """Keep decoy ids ahead of a submission stored by this process"""
+    with _decoy_lock:
+        _decoy_ids[model] = max(_decoy_ids.get(model, 0), pk)
+
+
+# Classifier
+
+def train(documents):
+    """
+    Naive Bayes model from ``(features, is_spam)`` pairs: the log prior odds
+    plus one log likelihood ratio per token (Laplace smoothed, each token
+    counted once per document).
+    """
+    counts = {True: Counter(), False: Counter()}
+    docs = Counter()
+    for features, is_spam in documents:
+        counts[is_spam].update(features)
+        docs[is_spam] += 1
+    if not docs[True] or not docs[False]:
+        raise ValueError('Training needs both spam and non-spam examples')
+
+    vocabulary = [token for token in counts[True].keys() | counts[False].keys()
+                  if counts[True][token] + counts[False][token] > 1]
+    spam_total = sum(counts[True].values()) + len(vocabulary)
+    ham_total = sum(counts[False].values()) + len(vocabulary)
+    weights = {
+        token: math.log((counts[True][token] + 1) / spam_total) - math.log((counts[False][token] + 1) / ham_total)
+        for token in vocabulary
+    }
+    strongest = sorted(weights, key=lambda token: abs(weights[token]), reverse=True)[:MAX_FEATURES]
+    return {
+        'version': MODEL_VERSION,
+        'trained_at': int(time.time()),
+        'documents': {'spam': docs[True], 'ham': docs[False]},
+        'bias': math.log(docs[True] / docs[False]),
+        'weights': {token: round(weights[token], 4) for token in strongest},
+    }
+
+
+def probability(model, features):
+    """Probability that a submission with these features is spam"""
+    weights = model['weights']
+    score = model['bias'] + sum(weights.get(token, 0.0) for token in features)
+    if score < -30:
+        return 0.0
+    return 1 / (1 + math.exp(-score))
+
+
+def save_model(model, path=None):
+    """Write the model file atomically; running processes pick it up within a minute"""
+    path = path or settings.SPAM_MODEL_PATH
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as handle:
+            json.dump(model, handle, separators=(',', ':'))
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+class _Loaded:
+    model = None
+    mtime = None
+    checked_at = 0.0
+
+
+_loaded = _Loaded()
+_load_lock = threading.Lock()
+
+
+def current_model():
+    """The trained model (None until one exists), re-read when the file changes"""
+    now = time.monotonic()
+    if now - _loaded.checked_at < MODEL_RELOAD_INTERVAL:
+        return _loaded.model
+    with _load_lock:
+        if now - _loaded.checked_at < MODEL_RELOAD_INTERVAL:
+            return _loaded.model
+        try:
+            mtime = os.stat(settings.SPAM_MODEL_PATH).st_mtime
+        except OSError:
+            _loaded.model = _loaded.mtime = None
+        else:
+            if mtime != _loaded.mtime:
+                with open(settings.SPAM_MODEL_PATH, encoding='utf-8') as handle:
+                    model = json.load(handle)
+                _loaded.model = model if model.get('version') == MODEL_VERSION else None
+                _loaded.mtime = mtime
+        _loaded.checked_at = now
+    return _loaded.model
+
+
+def reset():
+    """Forget loaded model and fingerprints (after retraining in-process, in benchmarks)"""
+    _loaded.model = _loaded.mtime = None
+    _loaded.checked_at = 0.0
+    fingerprints.clear()
+
+
+def check(model, data, values):
+    """
+    Why the submission looks like spam, or None. ``data`` is the raw request
+    data (for the honeypot and form token), ``values`` the validated fields.
+    """
+    if not settings.SPAM_FILTER_ENABLED:
+        return None
+
+    if data.get(settings.SPAM_HONEYPOT_FIELD):
+        return 'honeypot'
+
+    token = data.get(settings.SPAM_FORM_TOKEN_FIELD)
+    if token:
+        age = _form_age(str(token))
+        if age is None:
+            return 'forged token'
+        if age < settings.SPAM_MIN_FILL_SECONDS:
+            return 'too fast'
+    elif settings.SPAM_REQUIRE_FORM_TOKEN:
+        return 'missing token'
+
+    email = values.get('email', '')
+    text = text_of(model, values)
+    if fingerprints.seen(fingerprint(model, email, text), settings.SPAM_DUPLICATE_WINDOW):
+        return 'duplicate'
+
+    if len(links(text)) > settings.SPAM_MAX_LINKS:
+        return 'links'
+
+    classifier = current_model()
+    if classifier and probability(classifier, tokens(text, email)) >= settings.SPAM_THRESHOLD:
+        return 'classifier'
+    return None
@@ -1,3 +1,151 @@
-from django.test import TestCase
+import io
+import shutil
+import tempfile
+from pathlib import Path
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from . import archive, rollups
+from .models import (
+    ArchiveBatch, ArchivedSubmission, ContactMessage, ContactMessageDailyRollup, Project, ProjectSkill,
+    ServiceRequest, ServiceRequestDailyRollup, Skill, SocialLink, Testimonial
+)
+
+
+class TestimonialExpandTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        for index in range(5):
+            project = Project.objects.create(name=f"Project {index}", description='d')
+            Testimonial.objects.create(client_name=f"Client {index}", testimonial='t', project=project)
+
+    def test_expanded_project_loaded_with_the_testimonials(self):
+        # One COUNT for the page plus one SELECT joining the projects
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/testimonials/?fields=id,project&expand=project')
+        self.assertEqual(response.status_code, 200)
+        rows = response.json()['results']
+        self.assertEqual(len(rows), 5)
+        self.assertTrue(all(row['project']['name'].startswith('Project ') for row in rows))
+
+
+class ArchiveTests(TestCase):
+    def setUp(self):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        settings = override_settings(ARCHIVE_ROOT=root)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.root = Path(root)
+        for index in range(4):
+            ContactMessage.objects.create(
+                full_name=f"Sender {index}", email=f"sender{index}@example.com", subject='Hi',
+                message='Hello', status='replied' if index < 3 else 'new',
+            )
+        self.rows = {row['id']: row for row in ContactMessage.objects.values()}
+
+    def archive_all(self):
+        return sum(archive.archive(ContactMessage, timezone.now()))
+
+    def restore(self, entries):
+        with self.captureOnCommitCallbacks(execute=True):
+            return archive.restore(entries)
+
+    def test_archive_and_restore_round_trip(self):
+        self.assertEqual(self.archive_all(), 3)
+        self.assertEqual(list(ContactMessage.objects.values_list('status', flat=True)), ['new'])
+        batch = ArchiveBatch.objects.get()
+        self.assertEqual(batch.row_count, 3)
+        self.assertTrue((self.root / batch.path).exists())
+        # Archived submissions keep counting in the rollups
+        self.assertEqual(rollups.find_drift(ContactMessage), 0)
+
+        self.assertEqual(self.restore(ArchivedSubmission.objects.all()), 3)
+        self.assertEqual({row['id']: row for row in ContactMessage.objects.values()}, self.rows)
+        self.assertFalse(ArchiveBatch.objects.exists())
+        self.assertFalse((self.root / batch.path).exists())
+        self.assertEqual(rollups.find_drift(ContactMessage), 0)
+
+    def test_rearchiving_a_restored_range_keeps_the_remaining_file(self):
+        self.archive_all()
+        first = ArchiveBatch.objects.get()
+        ids = sorted(ArchivedSubmission.objects.values_list('original_id', flat=True))
+        # Same first and last id as the batch still holding the middle row
+        self.restore(ArchivedSubmission.objects.filter(original_id__in=[ids[0], ids[-1]]))
+        self.assertEqual(self.archive_all(), 2)
+
+        self.assertEqual(ArchiveBatch.objects.count(), 2)
+        self.assertTrue((self.root / first.path).exists())
+        self.assertEqual(self.restore(ArchivedSubmission.objects.all()), 3)
+        self.assertEqual({row['id']: row for row in ContactMessage.objects.values()}, self.rows)
+
+
+class ReconcileRollupsTests(TestCase):
+    def setUp(self):
+        for status in ('pending', 'pending', 'completed'):
+            ServiceRequest.objects.create(
+                service_type='web', full_name='Client', email='client@example.com',
+                project_requirements='A site', budget_range='$10,000+', status=status,
+            )
+        ContactMessage.objects.create(full_name='Sender', email='sender@example.com', subject='Hi', message='Hello')
+
+    def test_check_reports_and_reconcile_fixes_drift(self):
+        call_command('reconcile_rollups', '--all', '--check', stdout=io.StringIO())
+        ServiceRequestDailyRollup.objects.filter(status='pending').update(count=5)
+        ContactMessageDailyRollup.objects.all().delete()
+
+        with self.assertRaises(CommandError):
+            call_command('reconcile_rollups', '--all', '--check', stdout=io.StringIO())
+        call_command('reconcile_rollups', '--all', stdout=io.StringIO())
+        call_command('reconcile_rollups', '--all', '--check', stdout=io.StringIO())
+        pending = ServiceRequestDailyRollup.objects.filter(dimension='service_type', status='pending')
+        self.assertEqual(pending.get().count, 2)
+        self.assertEqual(ContactMessageDailyRollup.objects.get().count, 1)
+
+
+class ContentTransferTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.archive = str(Path(directory) / 'content.zip')
+        django = Skill.objects.create(name='Django', category='backend', proficiency=90)
+        react = Skill.objects.create(name='React', category='frontend', proficiency=80)
+        shop = Project.objects.create(name='Shop', description='An online shop', is_featured=True)
+        blog = Project.objects.create(name='Blog', description='A blog')
+        for project, skill in ((shop, django), (shop, react), (blog, django)):
+            ProjectSkill.objects.create(project=project, skill=skill)
+        Testimonial.objects.create(client_name='Ann', testimonial='Great work', rating=5, project=shop)
+        SocialLink.objects.create(platform='github', url='https://github.com/example')
+
+    def content(self):
+        return {
+            'skills': list(Skill.objects.order_by('name').values('name', 'category', 'proficiency')),
+            'projects': list(
+                Project.objects.order_by('name')
+                .values('name', 'is_featured', 'skill_names', 'active_testimonial_count', 'created_at')
+            ),
+            'project_skills': sorted(ProjectSkill.objects.values_list('project__name', 'skill__name')),
+            'testimonials': list(Testimonial.objects.values('client_name', 'project__name', 'created_at')),
+            'social_links': list(SocialLink.objects.values('platform', 'url')),
+        }
+
+    def run_import(self):
+        out = io.StringIO()
+        call_command('import_content', self.archive, '--no-media', stdout=out, stderr=io.StringIO())
+        return out.getvalue()
+
+    def test_import_recreates_exported_content(self):
+        call_command('export_content', self.archive, '--no-media', stdout=io.StringIO())
+        expected = self.content()
+        for model in (Testimonial, ProjectSkill, Project, Skill, SocialLink):
+            model.objects.all().delete()
+
+        self.run_import()
+        self.assertEqual(self.content(), expected)
+        # A second run finds everything unchanged
+        self.assertNotRegex(self.run_import(), r'[1-9]\d* (created|updated)')
+        self.assertEqual(self.content(), expected)
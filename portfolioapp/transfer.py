@@ -0,0 +1,408 @@
+"""
+Bulk export / import of the portfolio content between environments.
+
+An export is one zip archive:
+
+- ``manifest.json``: format name and version, export time, row counts and the
+  media files included;
+- ``data/<group>.ndjson``: one JSON object per row, relations written as
+  natural keys (``Skill.name``, ``Project.name``) instead of ids;
+- ``media/<path>``: the uploaded files the rows point to.
+
+Rows are streamed in and out with ``iterator()`` and line by line, so memory
+stays flat. An import matches rows on their natural key and applies each
+batch of ``batch_size`` rows with ``bulk_create`` / ``bulk_update`` in its own
+transaction: no per-row ``save()`` and no per-row signals. The derived data
+the signals would have maintained (project aggregates, related projects,
+response caches, the API snapshot) is rebuilt once at the end.
+"""
+import io
+import json
+import shutil
+import zipfile
+from collections import Counter
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Count, FileField
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from . import aggregates, signals, similarity
+from .models import Project, Skill, ProjectSkill, Testimonial, SocialLink, AboutMe
+
+FORMAT = 'portfolio-content'
+FORMAT_VERSION = 1
+MANIFEST = 'manifest.json'
+
+# Rows read per query on export
+EXPORT_CHUNK_SIZE = 2000
+
+
+class TransferError(ValueError):
+    pass
+
+
+@contextmanager
+def explicit_timestamps(*models):
+    """Let bulk_create keep the given auto_now/auto_now_add values"""
+    saved = []
+    for model in models:
+        for field in model._meta.concrete_fields:
+            if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False):
+                saved.append((field, field.auto_now, field.auto_now_add))
+                field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now = auto_now
+            field.auto_now_add = auto_now_add
+
+
+class Group:
+    """
+    One model in the archive. ``key`` names the fields that identify a row
+    across databases; ``relations`` maps foreign keys to the model whose
+    ``name`` stands in for the id.
+    """
+
+    def __init__(self, name, model, key, fields, relations=None):
+        self.name = name
+        self.model = model
+        self.key = key
+        self.fields = fields
+        self.relations = relations or {}
+
+    @property
+    def path(self):
+        return f"data/{self.name}.ndjson"
+
+    @property
+    def file_fields(self):
+        return [field for field in self.fields if isinstance(self.model._meta.get_field(field), FileField)]
+
+    @property
+    def datetime_fields(self):
+        return [field for field in self.fields if self.model._meta.get_field(field).get_internal_type() == 'DateTimeField']
+
+    def columns(self):
+        """values_list() columns: relations read through to the related name"""
+        return [f"{field}__name" if field in self.relations else field for field in self.fields]
+
+    def has_updated_at(self):
+        return any(field.name == 'updated_at' for field in self.model._meta.concrete_fields)
+
+    @property
+    def timestamp_fields(self):
+        """auto_now / auto_now_add fields, filled with the import time when a row has no value"""
+        return [
+            field.attname for field in self.model._meta.concrete_fields
+            if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+        ]
+
+    def row_key(self, values):
+        """Natural key of a row whose relations are already resolved to ids"""
+        return tuple(values.get(f"{field}_id" if field in self.relations else field) for field in self.key)
+
+
+# Import order: every relation points at a group loaded before it
+GROUPS = (
+    Group('skills', Skill, ('name',), ('name', 'category', 'proficiency', 'icon', 'order', 'is_active')),
+    Group('projects', Project, ('name',), (
+        'name', 'description', 'detailed_description', 'image', 'image_meta', 'thumbnail', 'thumbnail_meta',
+        'code_link', 'demo_link', 'status', 'order', 'is_featured', 'created_at',
+    )),
+    Group('project-skills', ProjectSkill, ('project', 'skill'), ('project', 'skill'),
+          relations={'project': Project, 'skill': Skill}),
+    # created_at travels with the row, so it tells apart a client's testimonials
+    Group('testimonials', Testimonial, ('client_name', 'created_at'), (
+        'client_name', 'client_position', 'client_company', 'client_image', 'client_image_meta',
+        'testimonial', 'rating',
+        'project', 'is_featured', 'is_active', 'created_at',
+    ), relations={'project': Project}),
+    Group('social-links', SocialLink, ('platform', 'url'), ('platform', 'url', 'icon', 'order', 'is_active')),
+    # Singleton: the imported row replaces whatever is there
+    Group('about-me', AboutMe, (), (
+        'title', 'bio', 'detailed_bio', 'profile_image', 'resume_file', 'years_of_experience',
+        'email', 'phone', 'location',
+    )),
+)
+
+GROUP_NAMES = tuple(group.name for group in GROUPS)
+
+
+def duplicate_keys(group):
+    """Natural keys held by more than one row (they cannot be matched on import)"""
+    if not group.key:
+        return []
+    columns = [f"{field}__name" if field in group.relations else field for field in group.key]
+    rows = (
+        group.model.objects.values_list(*columns).annotate(rows=Count('pk'))
+        .filter(rows__gt=1).order_by()
+    )
+    return [row[:-1] for row in rows[:10]]
+
+
+def _check_unique(groups):
+    for group in groups:
+        duplicates = duplicate_keys(group)
+        if duplicates:
+            listed = '; '.join(', '.join(str(value) for value in key) for key in duplicates)
+            raise TransferError(
+                f"{group.name}: several rows share the same {', '.join(group.key)} ({listed}). "
+                "Make them unique before transferring."
+            )
+
+
+# Export
+
+def _member(name, compress_type):
+    info = zipfile.ZipInfo(name, date_time=timezone.localtime().timetuple()[:6])
+    info.compress_type = compress_type
+    return info
+
+
+def export(target, names=None, media=True):
+    """
+    Write the archive to ``target`` (a path or binary file object). Return the
+    manifest.
+    """
+    groups = [group for group in GROUPS if names is None or group.name in names]
+    _check_unique(groups)
+    counts = {}
+    media_files = set()
+    with zipfile.ZipFile(target, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for group in groups:
+            counts[group.name] = _export_group(archive, group, media_files if media else None)
+
+        included = []
+        for name in sorted(media_files):
+            if not default_storage.exists(name):
+                continue
+            with default_storage.open(name, 'rb') as source, \
+                    archive.open(_member(f"media/{name}", zipfile.ZIP_STORED), 'w') as destination:
+                # Uploads are mostly images: already compressed
+                shutil.copyfileobj(source, destination, 1024 * 1024)
+            included.append(name)
+
+        manifest = {
+            'format': FORMAT,
+            'version': FORMAT_VERSION,
+            'exported_at': timezone.now(),
+            'counts': counts,
+            'media': included,
+            'missing_media': sorted(media_files - set(included)),
+        }
+        archive.writestr(MANIFEST, json.dumps(manifest, cls=DjangoJSONEncoder, indent=2))
+    return manifest
+
+
+def _export_group(archive, group, media_files):
+    file_fields = group.file_fields
+    datetime_fields = group.datetime_fields
+    rows = group.model.objects.order_by('pk').values_list(*group.columns()).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    count = 0
+    with archive.open(_member(group.path, zipfile.ZIP_DEFLATED), 'w') as handle:
+        buffer = []
+        for values in rows:
+            row = dict(zip(group.fields, values))
+            for field in datetime_fields:
+                # Full precision, so re-importing unchanged rows changes nothing
+                if row[field]:
+                    row[field] = row[field].isoformat()
+            if media_files is not None:
+                media_files.update(row[field] for field in file_fields if row[field])
+            buffer.append(json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False))
+            count += 1
+            if len(buffer) == 500:
+                handle.write(('\n'.join(buffer) + '\n').encode())
+                buffer = []
+        if buffer:
+            handle.write(('\n'.join(buffer) + '\n').encode())
+    return count
+
+
+# Import
+
+def read_manifest(archive):
+    try:
+        manifest = json.loads(archive.read(MANIFEST))
+    except KeyError:
+        raise TransferError(f"Not a content archive: {MANIFEST} is missing")
+    if manifest.get('format') != FORMAT:
+        raise TransferError(f"Not a content archive: format is {manifest.get('format')!r}")
+    if not isinstance(manifest.get('version'), int) or manifest['version'] > FORMAT_VERSION:
+        raise TransferError(
+            f"Archive format version {manifest.get('version')} is newer than this code "
+            f"understands ({FORMAT_VERSION}); upgrade before importing"
+        )
+    return manifest
+
+
+class Importer:
+    """Apply an archive; ``stats`` counts created / updated / unchanged rows per group"""
+
+    def __init__(self, source, batch_size=1000, media=True):
+        self.source = source
+        self.batch_size = batch_size
+        self.media = media
+        self.stats = {}
+        self.media_written = 0
+        self.touched_projects = set()
+        self._names = {}
+
+    def run(self, names=None):
+        with zipfile.ZipFile(self.source) as archive:
+            manifest = read_manifest(archive)
+            present = set(archive.namelist())
+            groups = [
+                group for group in GROUPS
+                if (names is None or group.name in names) and group.path in present
+            ]
+            # Natural keys matched against, including those of related rows
+            related = {model for group in groups for model in group.relations.values()}
+            _check_unique([group for group in GROUPS if group in groups or group.model in related])
+            for group in groups:
+                self.stats[group.name] = self._import_group(archive, group)
+            if self.media:
+                self._import_media(archive, manifest.get('media', []), present)
+        self._rebuild({group.model for group in groups})
+        return self.stats
+
+    def _ids_by_name(self, model):
+        # Related names resolved once per group, after the related group was loaded
+        if model not in self._names:
+            self._names[model] = dict(model.objects.values_list('name', 'pk'))
+        return self._names[model]
+
+    def _rows(self, archive, group):
+        datetime_fields = group.datetime_fields
+        with archive.open(group.path) as handle:
+            for number, line in enumerate(io.TextIOWrapper(handle, encoding='utf-8'), 1):
+                if not line.strip():
+                    continue
+                data = json.loads(line)
+                row = {}
+                for field in group.fields:
+                    if field not in data:
+                        continue
+                    value = data[field]
+                    if field in group.relations:
+                        ids = self._ids_by_name(group.relations[field])
+                        if value is not None and value not in ids:
+                            raise TransferError(
+                                f"{group.path} line {number}: unknown {field} {value!r}"
+                            )
+                        row[f"{field}_id"] = ids.get(value) if value is not None else None
+                    elif field in datetime_fields and value:
+                        row[field] = parse_datetime(value)
+                    else:
+                        row[field] = '' if value is None and field in group.file_fields else value
+                yield row
+
+    def _import_group(self, archive, group):
+        stats = Counter()
+        batch = []
+        for row in self._rows(archive, group):
+            batch.append(row)
+            if len(batch) == self.batch_size:
+                stats.update(self._apply(group, batch))
+                batch = []
+        if batch:
+            stats.update(self._apply(group, batch))
+        # Later groups resolve names against the rows just written
+        self._names.pop(group.model, None)
+        return {'created': stats['created'], 'updated': stats['updated'], 'unchanged': stats['unchanged']}
+
+    def _existing(self, group, batch):
+        """{natural key: row} of the stored rows matching the batch"""
+        model = group.model
+        if not group.key:
+            obj = model.objects.order_by('pk').first()
+            return {(): obj} if obj else {}
+        first = group.key[0]
+        column = f"{first}_id" if first in group.relations else first
+        values = {row.get(column) for row in batch}
+        objects = model.objects.filter(**{f"{column}__in": values})
+        return {group.row_key(obj.__dict__): obj for obj in objects}
+
+    def _apply(self, group, batch):
+        model = group.model
+        now = timezone.now()
+        stats = Counter()
+        timestamp_fields = group.timestamp_fields
+        with transaction.atomic():
+            existing = self._existing(group, batch)
+            creates, updates, changed_fields, updated_ids = [], [], set(), set()
+            for row in batch:
+                key = group.row_key(row) if group.key else ()
+                obj = existing.get(key)
+                if obj is None:
+                    obj = model(**row)
+                    for field in timestamp_fields:
+                        if field == 'updated_at' or getattr(obj, field) is None:
+                            setattr(obj, field, now)
+                    creates.append(obj)
+                    # A later row with the same key updates this one
+                    existing[key] = obj
+                    continue
+                changed = {field for field, value in row.items() if getattr(obj, field) != value}
+                if not changed:
+                    stats['unchanged'] += 1
+                    continue
+                for field in changed:
+                    setattr(obj, field, row[field])
+                changed_fields |= changed
+                if obj.pk is not None and obj.pk not in updated_ids:
+                    updated_ids.add(obj.pk)
+                    updates.append(obj)
+
+            if creates:
+                with explicit_timestamps(model):
+                    model.objects.bulk_create(creates, batch_size=self.batch_size)
+            if updates:
+                if group.has_updated_at():
+                    for obj in updates:
+                        obj.updated_at = now
+                    changed_fields.add('updated_at')
+                model.objects.bulk_update(updates, sorted(changed_fields), batch_size=self.batch_size)
+        stats['created'] += len(creates)
+        stats['updated'] += len(updates)
+
+        if model is Project:
+            self.touched_projects.update(obj.pk for obj in creates + updates)
+        elif model in (ProjectSkill, Testimonial):
+            self.touched_projects.update(obj.project_id for obj in creates + updates)
+        return stats
+
+    def _import_media(self, archive, names, present):
+        for name in names:
+            member = f"media/{name}"
+            if member not in present or default_storage.exists(name):
+                continue
+            with archive.open(member) as handle:
+                default_storage.save(name, File(handle, name=name))
+            self.media_written += 1
+
+    def _rebuild(self, models):
+        """
+        What the skipped signals would have done, once for the whole import.
+        Running servers see the invalidations through the shared cache.
+        """
+        project_ids = sorted(pk for pk in self.touched_projects if pk is not None)
+        for offset in range(0, len(project_ids), self.batch_size):
+            with transaction.atomic():
+                aggregates.refresh_projects(project_ids[offset:offset + self.batch_size])
+
+        with transaction.atomic():
+            for model in models:
+                signals.schedule_content_refresh(model)
+        similarity.build_index()
+        if settings.API_SNAPSHOT_AUTO:
+            from . import snapshots
+            snapshots.export_all()
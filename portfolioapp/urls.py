@@ -14,7 +14,30 @@ urlpatterns = [
     # API router (REST endpoints for CRUD operations)
     path('api/', include(router.urls)),
 
+    # Aggregated homepage payload
+    path('api/bundle/', views.homepage_bundle, name='bundle'),
+    path('api/batch/', views.batch_requests, name='batch'),
+    path('api/autocomplete/', views.autocomplete, name='autocomplete'),
+
+    # Load balancer probes
+    path('healthz', views.healthz, name='healthz'),
+    path('readyz', views.readyz, name='readyz'),
+
+    # Staff-only bulk updates
+    path('api/workflow/service-requests/', views.service_request_workflow, name='service-request-workflow'),
+    path('api/workflow/contact-messages/', views.contact_message_workflow, name='contact-message-workflow'),
+    path('api/reorder/<str:group>/', views.reorder_items, name='reorder'),
+
+    # Staff dashboard, read from the daily rollups
+    path('api/dashboard/service-requests/', views.service_request_dashboard, name='dashboard-service-requests'),
+    path('api/dashboard/funnel/', views.service_request_funnel, name='dashboard-funnel'),
+    path('api/dashboard/contact-messages/', views.contact_message_dashboard, name='dashboard-contact-messages'),
+
+    # Staff live feed of new submissions (server-sent events)
+    path('api/live/', views.live_feed, name='live-feed'),
+
     # Form submission endpoints
+    path('api/forms/token/', views.form_token, name='form-token'),
     path('api/service-request/', views.submit_service_request, name='service-request'),
     path('api/contact-message/', views.submit_contact_message, name='contact-message'),
 ]
\ No newline at end of file
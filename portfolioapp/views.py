@@ -1,11 +1,14 @@
-from django.shortcuts import render
-from django.core.mail import send_mail
 from django.conf import settings
+from django.db import connection
+from django.http import Http404, HttpResponse, HttpResponseNotModified, JsonResponse, StreamingHttpResponse
+from django.utils import timezone
 from rest_framework import status, viewsets, filters
-from rest_framework.decorators import api_view, action
+from rest_framework.decorators import api_view, action, permission_classes
+from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 
+from . import batch, bundle, events, hotcache, indexes, reorder, rollups, search, similarity, spam, warmup, workflow
 from .models import (
     ServiceRequest, ContactMessage, Project, Skill,
     Testimonial, SocialLink, AboutMe
@@ -17,8 +20,23 @@ from .serializers import (
 )
 
 
+class SparseFieldsetMixin:
+    """
+    Let the serializer prune the queryset to the fields the client asked for
+    (see DynamicFieldsMixin): deferred columns, skipped prefetches and
+    annotations for fields that are not rendered.
+    """
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        serializer_class = self.get_serializer_class()
+        if hasattr(serializer_class, 'optimize_queryset'):
+            queryset = serializer_class.optimize_queryset(queryset, self.get_serializer_context())
+        return queryset
+
+
 # ViewSets for comprehensive CRUD operations
-class ProjectViewSet(viewsets.ReadOnlyModelViewSet):
+class ProjectViewSet(SparseFieldsetMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet for viewing projects.
     List view returns published projects only.
@@ -32,7 +50,7 @@ class ProjectViewSet(viewsets.ReadOnlyModelViewSet):
     ordering = ['order', '-created_at']
 
     def get_serializer_class(self):
-        if self.action == 'list':
+        if self.action in ('list', 'related'):
             return ProjectListSerializer
         return ProjectSerializer
 
@@ -43,8 +61,27 @@ class ProjectViewSet(viewsets.ReadOnlyModelViewSet):
         serializer = self.get_serializer(featured, many=True)
         return Response(serializer.data)
 
+    @action(detail=True, methods=['get'])
+    def related(self, request, pk=None):
+        """Get the projects sharing the most (proficiency-weighted) skills"""
+        project = self.get_object()
+        related = similarity.get_related(project.pk)
+        try:
+            limit = int(request.query_params.get('limit', len(related)))
+        except ValueError:
+            limit = len(related)
+        related = related[:max(limit, 0)]
+
+        scores = dict(related)
+        projects = self.get_queryset().in_bulk(list(scores))
+        ordered = [projects[pk] for pk, _ in related if pk in projects]
+        data = self.get_serializer(ordered, many=True).data
+        for item, obj in zip(data, ordered):
+            item['similarity'] = scores[obj.pk]
+        return Response(data)
 
-class SkillViewSet(viewsets.ReadOnlyModelViewSet):
+
+class SkillViewSet(SparseFieldsetMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet for viewing skills.
     Supports filtering by category.
@@ -58,18 +95,16 @@ class SkillViewSet(viewsets.ReadOnlyModelViewSet):
 
     @action(detail=False, methods=['get'])
     def by_category(self, request):
-        """Get skills grouped by category"""
-        skills = self.get_queryset()
-        categories = {}
-        for skill in skills:
-            category = skill.get_category_display()
-            if category not in categories:
-                categories[category] = []
-            categories[category].append(SkillSerializer(skill).data)
-        return Response(categories)
-
-
-class TestimonialViewSet(viewsets.ReadOnlyModelViewSet):
+        """
+        Get skills grouped by category (served from a precomputed index).
+        Use ?project_counts=true to also get the number of published
+        projects per category.
+        """
+        with_counts = request.query_params.get('project_counts', '').lower() in ('1', 'true', 'yes')
+        return Response(indexes.skills_by_category(with_counts))
+
+
+class TestimonialViewSet(SparseFieldsetMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet for viewing testimonials.
     List view returns active testimonials only.
@@ -89,15 +124,31 @@ class TestimonialViewSet(viewsets.ReadOnlyModelViewSet):
         return Response(serializer.data)
 
 
-class SocialLinkViewSet(viewsets.ReadOnlyModelViewSet):
+class SocialLinkViewSet(SparseFieldsetMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for viewing social links"""
     queryset = SocialLink.objects.filter(is_active=True)
     serializer_class = SocialLinkSerializer
     filter_backends = [filters.OrderingFilter]
     ordering = ['order']
 
+    def list(self, request, *args, **kwargs):
+        # Custom orderings go to the database; the default one is kept in memory
+        if 'ordering' in request.query_params:
+            return super().list(request, *args, **kwargs)
+        links = hotcache.get('social_links')
+        page = self.paginate_queryset(links)
+        if page is not None:
+            return self.get_paginated_response(self.get_serializer(page, many=True).data)
+        return Response(self.get_serializer(links, many=True).data)
+
+    def retrieve(self, request, *args, **kwargs):
+        for link in hotcache.get('social_links'):
+            if str(link.pk) == str(kwargs['pk']):
+                return Response(self.get_serializer(link).data)
+        raise Http404
 
-class AboutMeViewSet(viewsets.ReadOnlyModelViewSet):
+
+class AboutMeViewSet(SparseFieldsetMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for viewing About Me information"""
     queryset = AboutMe.objects.all()
     serializer_class = AboutMeSerializer
@@ -106,7 +157,7 @@ class AboutMeViewSet(viewsets.ReadOnlyModelViewSet):
     def info(self, request):
         """Get the About Me information (singleton)"""
         try:
-            about_me = AboutMe.objects.first()
+            about_me = hotcache.get('about_me')
             if about_me:
                 serializer = self.get_serializer(about_me)
                 return Response(serializer.data)
@@ -121,12 +172,251 @@ class AboutMeViewSet(viewsets.ReadOnlyModelViewSet):
             )
 
 
+@api_view(['GET'])
+def homepage_bundle(request):
+    """
+    Return every homepage section in one response.
+    Use ?sections=projects,skills to pick sections (default: all).
+    """
+    requested = request.query_params.get('sections')
+    if requested:
+        names = list(dict.fromkeys(name.strip() for name in requested.split(',') if name.strip()))
+        unknown = [name for name in names if name not in bundle.SECTIONS]
+        if unknown or not names:
+            return Response({
+                'detail': f"Unknown sections: {', '.join(unknown)}" if unknown else 'No sections requested',
+                'available': list(bundle.SECTIONS),
+            }, status=status.HTTP_400_BAD_REQUEST)
+    else:
+        names = list(bundle.SECTIONS)
+
+    body, etag = bundle.get_bundle(names)
+    if etag in request.headers.get('If-None-Match', ''):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(body, content_type='application/json')
+    response['ETag'] = etag
+    return response
+
+
+@api_view(['GET'])
+def autocomplete(request):
+    """
+    Typeahead suggestions for project names, skill names and client companies.
+    Use ?q=<prefix>, optionally &types=project,skill and &limit=10 (max 20).
+    """
+    query = request.query_params.get('q', '')
+    try:
+        limit = min(max(int(request.query_params.get('limit', 10)), 1), 20)
+    except ValueError:
+        limit = 10
+    types = tuple(
+        kind for kind in request.query_params.get('types', ','.join(search.TYPES)).split(',')
+        if kind in search.TYPES
+    )
+    results = search.get_index().search(query, limit=limit, types=types) if query.strip() else []
+    return Response({'query': query, 'results': results})
+
+
+@api_view(['POST'])
+def batch_requests(request):
+    """
+    Run several public GET requests in one round trip.
+    Body: {"requests": ["/api/projects/3/", {"path": "/api/skills/", "params": {"category": "backend"}}]}
+    """
+    items = request.data.get('requests') if isinstance(request.data, dict) else request.data
+    try:
+        body = batch.run_batch(items)
+    except batch.BatchError as e:
+        return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    return HttpResponse(body, content_type='application/json')
+
+
+def healthz(request):
+    """Liveness: the worker answers requests"""
+    return JsonResponse({'status': 'ok'})
+
+
+def readyz(request):
+    """Readiness: cache warm-up has finished and the database is reachable"""
+    state = warmup.status()
+    database = 'ok'
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+    except Exception:
+        database = 'unreachable'
+    ready = warmup.is_ready() and database == 'ok'
+    return JsonResponse(
+        {'ready': ready, 'warmup': state['status'], 'database': database},
+        status=200 if ready else 503,
+    )
+
+
+@api_view(['POST'])
+@permission_classes([IsAdminUser])
+def service_request_workflow(request):
+    """
+    Move service requests to a new status in bulk (staff only).
+    Body: {"ids": [1, 2, 3], "status": "reviewed"}
+    """
+    return _bulk_transition(request, ServiceRequest)
+
+
+@api_view(['POST'])
+@permission_classes([IsAdminUser])
+def contact_message_workflow(request):
+    """
+    Move contact messages to a new status in bulk (staff only).
+    Body: {"ids": [1, 2, 3], "status": "read"}
+    """
+    return _bulk_transition(request, ContactMessage)
+
+
+def _bulk_transition(request, model):
+    data = request.data if isinstance(request.data, dict) else {}
+    ids, target = data.get('ids'), str(data.get('status', ''))
+    if not isinstance(ids, list) or not all(isinstance(pk, int) and not isinstance(pk, bool) for pk in ids):
+        return Response({'detail': '"ids" must be a list of integers.'}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        updated = workflow.transition(model.objects.filter(pk__in=ids), target)
+    except workflow.WorkflowError as e:
+        return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    return Response({'status': target, 'updated': updated, 'skipped': len(set(ids)) - updated})
+
+
+@api_view(['POST'])
+@permission_classes([IsAdminUser])
+def reorder_items(request, group):
+    """
+    Save a new display order for projects, skills or social links (staff only).
+    Body: {"ids": [5, 2, 9, ...]} listing every row, first to last.
+    """
+    model = reorder.REORDERABLE.get(group)
+    if model is None:
+        raise Http404
+    ids = request.data.get('ids') if isinstance(request.data, dict) else request.data
+    try:
+        changed = reorder.apply_order(model, ids)
+    except reorder.ReorderError as e:
+        return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    return Response({'changed': changed})
+
+
+async def live_feed(request):
+    """
+    Server-sent events for the admin: ``submission`` for every new service
+    request or contact message, ``status`` for status changes. Staff only.
+    """
+    # No auth middleware in the API-only pool (config.settings_api)
+    user = await request.auser() if hasattr(request, 'auser') else None
+    if not (user and user.is_active and user.is_staff):
+        return JsonResponse({'detail': 'You do not have permission to perform this action.'}, status=403)
+
+    last_event_id = request.headers.get('Last-Event-ID', '')
+    options = {
+        'last_event_id': int(last_event_id) if last_event_id.isdigit() else None,
+        'heartbeat': settings.LIVE_FEED_HEARTBEAT,
+        'poll_interval': settings.LIVE_FEED_POLL_INTERVAL,
+    }
+    if hasattr(request, 'scope'):
+        body = events.astream(**options)
+    else:
+        body = events.stream(
+            max_age=settings.LIVE_FEED_MAX_AGE, max_streams=settings.LIVE_FEED_MAX_STREAMS, **options
+        )
+    response = StreamingHttpResponse(body, content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Stop nginx from buffering the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+def _dashboard_params(request):
+    """(start, end, dimension filters) from the query string"""
+    start, end = rollups.date_range(request.query_params)
+    filters = {
+        key: value for key, value in request.query_params.items()
+        if key not in ('since', 'until', 'by', 'format')
+    }
+    return start, end, filters
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def service_request_dashboard(request):
+    """
+    Service requests per day from the daily rollups (staff only).
+    Use ?by=service_type|budget_range|preferred_timeline|status (default status),
+    ?since=YYYY-MM-DD&until=YYYY-MM-DD (default: the last 30 days) and
+    filters such as ?service_type=web.
+    """
+    by = request.query_params.get('by', 'status')
+    try:
+        start, end, filters = _dashboard_params(request)
+        data = rollups.daily_counts(ServiceRequest, by, start, end, **filters)
+    except rollups.RollupError as e:
+        return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    return Response({'since': start, 'until': end, 'by': by, **data})
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def service_request_funnel(request):
+    """Share of the service requests submitted in the range that reached each status (staff only)"""
+    try:
+        start, end, filters = _dashboard_params(request)
+        data = rollups.funnel(start, end, **filters)
+    except rollups.RollupError as e:
+        return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    return Response({'since': start, 'until': end, **data})
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def contact_message_dashboard(request):
+    """Contact messages per day and status from the daily rollups (staff only)"""
+    try:
+        start, end, filters = _dashboard_params(request)
+        data = rollups.daily_counts(ContactMessage, 'status', start, end, **filters)
+    except rollups.RollupError as e:
+        return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    return Response({'since': start, 'until': end, 'by': 'status', **data})
+
+
 # Function-based views for form submissions
+@api_view(['GET'])
+def form_token(request):
+    """Signed timestamp for the spam filter; fetch it when a form is shown and send it back"""
+    response = Response({'field': settings.SPAM_FORM_TOKEN_FIELD, 'token': spam.issue_form_token()})
+    response['Cache-Control'] = 'no-store'
+    return response
+
+
+def _discard_spam(serializer, message):
+    """
+    The normal success response for a rejected submission, built without
+    saving or emailing anything. The fields the database would have filled
+    get plausible values so the response cannot be told apart.
+    """
+    model = serializer.Meta.model
+    instance = model(**serializer.validated_data, id=spam.decoy_id(model), submitted_at=timezone.now())
+    instance.updated_at = timezone.now()
+    return Response({
+        'success': True,
+        'message': message,
+        'email_sent': True,
+        'data': type(serializer)(instance).data
+    }, status=status.HTTP_201_CREATED)
+
+
 @api_view(['POST'])
 def submit_service_request(request):
     """Handle service request form submission"""
     serializer = ServiceRequestSerializer(data=request.data)
     if serializer.is_valid():
+        if spam.check(ServiceRequest, request.data, serializer.validated_data):
+            return _discard_spam(serializer, 'Service request submitted successfully!')
         try:
             service_request = serializer.save()
 
@@ -221,6 +511,8 @@ zubedanrdn@gmail.com
 This is an automated confirmation email. Your request has been logged and will be reviewed shortly.
                 """
 
+                from django.core.mail import send_mail
+
                 send_mail(
                     user_subject,
                     user_message,
@@ -262,6 +554,8 @@ def submit_contact_message(request):
     """Handle contact form submission"""
     serializer = ContactMessageSerializer(data=request.data)
     if serializer.is_valid():
+        if spam.check(ContactMessage, request.data, serializer.validated_data):
+            return _discard_spam(serializer, 'Your message has been sent successfully!')
         try:
             contact_message = serializer.save()
 
@@ -337,6 +631,8 @@ zubedanrdn@gmail.com
 This is an automated confirmation email. Your message has been successfully logged.
                 """
 
+                from django.core.mail import send_mail
+
                 send_mail(
                     user_subject,
                     user_message,
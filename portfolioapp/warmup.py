@@ -0,0 +1,139 @@
+"""
+Cache warming after a deploy or a worker boot.
+
+``warm`` renders the public routes through the response cache, rebuilds the
+read indexes (by_category, related projects, homepage bundle) and, on request,
+the static snapshot. Those live in the shared cache, so after a deploy only one
+worker does it: the others see the ``warmup:<content version>`` marker taken
+with ``cache.add`` and only fill their process-local caches (hot objects,
+search index). Rendering every view on the way also performs the lazy imports
+and pulls the hot tables into the database's page cache.
+
+``start_background`` runs the warm-up in a thread from the gunicorn
+``post_worker_init`` hook; ``/readyz`` reports the worker ready once it is done.
+"""
+import json
+import logging
+import threading
+import time
+from collections import Counter
+from urllib.parse import parse_qsl, urlsplit
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+
+from . import bundle, hotcache, indexes, search, similarity, snapshots
+from .cache import cached_response, get_content_version
+from .internal import build_get_request, dispatch
+
+logger = logging.getLogger(__name__)
+
+IDLE, WARMING, READY, FAILED = 'idle', 'warming', 'ready', 'failed'
+
+_state = {'status': IDLE, 'started_at': None, 'finished_at': None, 'report': None}
+
+
+def marker_key(version):
+    return f"warmup:{version}"
+
+
+def public_routes(details=None):
+    """(path, params, follow_pages) for the API root, list routes and up to ``details`` objects per group"""
+    details = settings.WARMUP_DETAIL_LIMIT if details is None else details
+    yield '/api/', {}, False
+    for group in snapshots.GROUPS:
+        for path, params in snapshots.list_routes(group):
+            yield path, params, True
+        for pk in snapshots.detail_pks(group)[:details]:
+            path, params = snapshots.detail_route(group, pk)
+            yield path, params, False
+
+
+def warm_route(path, params, pages=1):
+    """Render ``path`` (and up to ``pages`` pages of it) into the response cache"""
+    states = Counter()
+    for _ in range(pages):
+        request = build_get_request(path, params)
+        response, state = cached_response(request, lambda: dispatch(request))
+        states[state] += 1
+        if response.status_code != 200 or not response.get('Content-Type', '').startswith('application/json'):
+            break
+        data = json.loads(response.content)
+        next_url = data.get('next') if isinstance(data, dict) else None
+        if not next_url:
+            break
+        params = dict(parse_qsl(urlsplit(next_url).query))
+    return states
+
+
+def warm_shared(pages=None, details=None, snapshot=False):
+    """Fill the shared cache: responses, indexes, bundle sections and optionally the snapshot"""
+    pages = settings.WARMUP_PAGES if pages is None else pages
+    report = {'routes': 0, 'responses': Counter()}
+    for path, params, follow_pages in public_routes(details):
+        report['routes'] += 1
+        report['responses'].update(warm_route(path, params, pages if follow_pages else 1))
+
+    indexes.skills_by_category()
+    indexes.skills_by_category(with_counts=True)
+    report['related'] = similarity.build_index()
+    bundle.refresh_sections(bundle.SECTIONS)
+    if snapshot:
+        report['snapshot'] = len(snapshots.export_all().entries)
+    return report
+
+
+def warm_local():
+    """Fill this worker's process-local caches"""
+    for name in hotcache.LOADERS:
+        hotcache.get(name)
+    return {'search_keys': sum(len(keys) for keys in search.get_index().keys.values())}
+
+
+def warm(force=False, **options):
+    """
+    Warm the shared cache unless another worker already did it for the
+    current content version (``force`` skips that check), then the local one.
+    """
+    report = {'shared': False}
+    version = get_content_version()
+    if force or cache.add(marker_key(version), True, settings.RESPONSE_CACHE_TIMEOUT or None):
+        report.update(warm_shared(**options))
+        report['shared'] = True
+    report.update(warm_local())
+    return report
+
+
+def run():
+    _state.update(status=WARMING, started_at=time.time(), finished_at=None)
+    try:
+        _state['report'] = warm()
+        _state['status'] = READY
+        logger.info('Cache warm-up finished in %.2fs', time.time() - _state['started_at'])
+    except Exception:
+        # The caches still fill lazily; never keep a worker out of rotation
+        _state['status'] = FAILED
+        logger.exception('Cache warm-up failed')
+    finally:
+        _state['finished_at'] = time.time()
+        connection.close()
+
+
+def start_background():
+    """Warm in a daemon thread so the worker can answer /healthz meanwhile"""
+    if not settings.WARMUP_ON_BOOT:
+        return None
+    _state['status'] = WARMING
+    thread = threading.Thread(target=run, name='cache-warmup', daemon=True)
+    thread.start()
+    return thread
+
+
+def status():
+    return dict(_state)
+
+
+def is_ready():
+    # Workers without a warm-up hook (runserver, management commands) are ready
+    return _state['status'] != WARMING
@@ -0,0 +1,78 @@
+"""
+Bulk status transitions for form submissions.
+
+Service requests move pending -> reviewed -> in_progress -> completed, and can
+be cancelled while still open; contact messages move new -> read -> replied.
+A transition is applied in batches of ``WORKFLOW_BATCH_SIZE`` rows: one
+``SELECT ... FOR UPDATE`` for the candidate keys and their current status,
+then a single ``UPDATE ... SET status, updated_at WHERE pk IN (...) AND
+status IN (<allowed sources>)``, so the database itself rejects invalid
+transitions.
+
+``QuerySet.update`` does not send ``pre_save``/``post_save``; receivers that
+track status changes listen to ``status_changed`` instead, which is sent
+inside the transaction after every batch.
+"""
+from django.conf import settings
+from django.db import transaction
+from django.dispatch import Signal
+from django.utils import timezone
+
+from .models import ServiceRequest, ContactMessage
+
+# Target status -> statuses it may be reached from
+TRANSITIONS = {
+    ServiceRequest: {
+        'reviewed': ('pending',),
+        'in_progress': ('reviewed',),
+        'completed': ('in_progress',),
+        'cancelled': ('pending', 'reviewed', 'in_progress'),
+    },
+    ContactMessage: {
+        'read': ('new',),
+        'replied': ('new', 'read'),
+    },
+}
+
+# Sent after each batch with changes=[(pk, previous status), ...], status and updated_at
+status_changed = Signal()
+
+
+class WorkflowError(ValueError):
+    pass
+
+
+def allowed_sources(model, target):
+    try:
+        return TRANSITIONS[model][target]
+    except KeyError:
+        choices = ', '.join(TRANSITIONS.get(model, ()))
+        raise WorkflowError(f"Cannot move a {model._meta.verbose_name} to '{target}' (allowed: {choices})")
+
+
+def transition(queryset, target, batch_size=None):
+    """
+    Move every row of ``queryset`` whose status allows it to ``target``.
+    Return the number of rows updated; the others are left untouched.
+    """
+    model = queryset.model
+    sources = allowed_sources(model, target)
+    batch_size = batch_size or settings.WORKFLOW_BATCH_SIZE
+    candidates = queryset.filter(status__in=sources).order_by('pk').values_list('pk', 'status')
+
+    updated = 0
+    last_pk = 0
+    while True:
+        with transaction.atomic():
+            rows = list(candidates.filter(pk__gt=last_pk).select_for_update()[:batch_size])
+            if not rows:
+                return updated
+            last_pk = rows[-1][0]
+            now = timezone.now()
+            count = (
+                model.objects
+                .filter(pk__in=[pk for pk, _ in rows], status__in=sources)
+                .update(status=target, updated_at=now)
+            )
+            updated += count
+            status_changed.send(sender=model, changes=rows, status=target, updated_at=now)